@@ -0,0 +1,138 @@
+"""
+Analíticas batch de muchos perfiles en varios procesos.
+
+Todo functions.py corre en un solo proceso y el único paralelismo son hilos
+para la red, así que el trabajo de CPU (etiquetado de PRs, estadísticas por
+intento, agregados de vecinos) queda limitado por el GIL. Aquí cada perfil se
+calcula en un proceso del pool y las tablas vuelven al proceso principal como
+buffers Arrow IPC comprimidos (columnares, sin pickles de DataFrames).
+
+Los procesos comparten la caché HTTP de disco, así que una competición que ya
+descargó un proceso no la vuelve a pedir otro. Sin pyarrow las tablas viajan
+como pickle (pandas serializa sus bloques NumPy directamente).
+
+Uso:
+    for wca_id, tables, error in run_batch(ids, processes=8):
+        ...
+"""
+
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+import functions as fn
+
+try:
+    import pyarrow as pa
+except ImportError:  # dependencia opcional
+    pa = None
+
+
+def build_tables(wca_id, neighbours=False, solve_stats=False):
+    """Calcula las tablas de un perfil. Devuelve {nombre_tabla: DataFrame} o None."""
+    profile = fn.load_profile(wca_id)
+    if profile is None:
+        return None
+
+    results = profile["results"]
+
+    prs = pd.DataFrame(
+        [(key, *values) for key, values in profile["prs_dict"].items()],
+        columns=["Key", "Competition", "CompName", "CompDate", "Result", "Event", "Type"],
+    )
+    stats_prs = dict(profile["stats_prs"])
+    total = stats_prs.pop("total", 0)
+    pr_counts = pd.DataFrame(list(stats_prs.items()), columns=["Event", "PRs"])
+    pr_counts.loc[len(pr_counts)] = ["total", total]
+
+    yearly_bests = profile["yearly_bests"].reset_index()
+    yearly_bests.columns = yearly_bests.columns.astype(str)
+
+    tables = {
+        "results": results,
+        "prs": prs,
+        "pr_counts": pr_counts,
+        "heatmap": fn.get_heatmap_data(results),
+        "map": pd.DataFrame(profile["map_data"]),
+        "yearly_bests": yearly_bests,
+    }
+    if neighbours:
+        tables["neighbours"] = fn.get_wca_neighbours(wca_id, results_df=results)
+    if solve_stats:
+        tables["solve_stats"] = solve_stats_table(results)
+
+    return tables
+
+
+def solve_stats_table(results):
+    """Resumen por evento de solve_stats (mejor aoN, tasa de DNF...), una fila por evento."""
+    from solve_stats import compute_solve_stats
+
+    events = compute_solve_stats(results)["events"]
+    return pd.DataFrame(
+        [{"Event": event, **stats["summary"]} for event, stats in events.items()]
+    )
+
+
+# --- Serialización entre procesos ---
+
+def encode_table(df):
+    """DataFrame -> (buffer, orden de columnas). También lo usa snapshot.py."""
+    columns = list(df.columns)
+    # La columna Solves de los resultados son vistas de NumPy (objetos): se reconstruye al
+    # llegar desde time1..time5 (otras tablas tienen una columna Solves normal, un recuento)
+    if "Solves" in df.columns and set(fn.SOLVE_COLUMNS) <= set(df.columns):
+        df = df.drop(columns=["Solves"])
+    if pa is None:
+        return pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL), columns
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression="zstd")
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue(), columns
+
+
+def decode_table(encoded):
+    buffer, columns = encoded
+    if pa is None:
+        df = pickle.loads(buffer)
+    else:
+        df = pa.ipc.open_stream(buffer).read_all().to_pandas()
+    if "Solves" in columns and "Solves" not in df.columns:
+        block = np.ascontiguousarray(df[fn.SOLVE_COLUMNS].to_numpy(dtype=np.int32))
+        df["Solves"] = list(block)
+    return df[columns]
+
+
+def _profile_job(wca_id, neighbours, solve_stats):
+    """Lo que corre en cada proceso: calcula las tablas y las devuelve como buffers."""
+    tables = build_tables(wca_id, neighbours=neighbours, solve_stats=solve_stats)
+    if tables is None:
+        return None
+    return {name: encode_table(df) for name, df in tables.items()}
+
+
+def run_batch(wca_ids, processes=None, neighbours=False, solve_stats=False):
+    """
+    Calcula las tablas de cada perfil en un pool de `processes` procesos (por defecto
+    uno por núcleo). Genera (wca_id, tablas o None, error o None) según van terminando.
+    """
+    processes = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {
+            executor.submit(_profile_job, wca_id, neighbours, solve_stats): wca_id
+            for wca_id in wca_ids
+        }
+        for future in as_completed(futures):
+            wca_id = futures[future]
+            try:
+                buffers = future.result()
+            except Exception as e:
+                yield wca_id, None, e
+                continue
+            tables = None if buffers is None else {name: decode_table(encoded) for name, encoded in buffers.items()}
+            yield wca_id, tables, None
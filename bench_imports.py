@@ -0,0 +1,64 @@
+"""
+Benchmark del arranque en frío (tiempo de imports).
+
+Compara, en procesos nuevos, lo que pagaba antes cada arranque de la app
+(todos los imports pesados al principio de wca_app.py y functions.py) con lo
+que paga ahora: Streamlit + el núcleo de datos + la pestaña Summary.
+
+Uso:
+    python bench_imports.py            # 5 repeticiones por escenario
+    python bench_imports.py -n 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+SCENARIOS = {
+    # Imports que hacía el arranque antes de separar las pestañas en views/
+    "before (all top-level imports)": (
+        "import streamlit, pandas, numpy, requests, pycountry, subprocess, urllib.parse\n"
+        "import plotly.express, plotly.graph_objects, pydeck\n"
+        "import streamlit.components.v1\n"
+        "from sympy import rem\n"
+    ),
+    # Arranque actual hasta pintar la pestaña Summary
+    "after (streamlit + functions + summary)": (
+        "import streamlit\n"
+        "import functions\n"
+        "import views.summary\n"
+    ),
+    # Solo el núcleo de datos (lo que usan scripts y jobs sin UI)
+    "data core only (functions)": "import functions\n",
+}
+
+
+def time_import(code, repeat):
+    """Ejecuta `code` en `repeat` intérpretes nuevos y devuelve los tiempos (s)."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = None
+    for label, code in SCENARIOS.items():
+        timings = time_import(code, args.repeat)
+        median = statistics.median(timings)
+        if baseline is None:
+            baseline = median
+        print(f"{label:<42} median {median * 1000:8.1f} ms  "
+              f"(min {min(timings) * 1000:.1f} ms, {median / baseline:.0%} of before)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Precalentado de cachés para perfiles populares y competiciones recientes.
+
+Descarga resultados, fichas de competición, scrambles y listas de competidores
+a un ritmo controlado y los deja en la caché de disco (disk_cache), de modo
+que en hora punta el primer visitante ya se encuentra todo caliente.
+
+Se puede lanzar desde el CLI (`python wca_cli.py warm ...`, p. ej. en un cron)
+o en segundo plano dentro de un proceso con `warm_in_background`.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import functions as fn
+import http_cache
+
+WCA_API = "https://www.worldcubeassociation.org/api/v0"
+GITHUB_API = "https://raw.githubusercontent.com/robiningelbrecht/wca-rest-api/master/api"
+
+
+class RateLimiter:
+    """Limita a `rate` peticiones por segundo entre todos los hilos que lo comparten."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _warm_url(url, limiter):
+    """Descarga `url` a la caché de disco si no está ya caliente. True si se descargó."""
+    if http_cache.cached_is_fresh(url):
+        return False
+    limiter.wait()
+    fn.fetch_json(url)
+    return True
+
+
+def warm_competition(comp_id, limiter, scrambles=True, competitors=True):
+    """Precalienta la ficha, los scrambles y la lista de competidores de una competición."""
+    urls = [f"{GITHUB_API}/competitions/{comp_id}.json"]
+    if scrambles:
+        urls.append(f"{WCA_API}/competitions/{comp_id}/scrambles")
+    if competitors:
+        urls.append(f"{WCA_API}/competitions/{comp_id}/competitors")
+    return sum(_warm_url(url, limiter) for url in urls)
+
+
+def warm_profile(wca_id, limiter, scrambles=True):
+    """Precalienta la ficha y los resultados de una persona y todas sus competiciones."""
+    results_url = f"{WCA_API}/persons/{wca_id}/results"
+    # La ficha (/persons/{id}) es lo primero que pide load_profile después de los resultados
+    fetched = _warm_url(f"{WCA_API}/persons/{wca_id}", limiter) + _warm_url(results_url, limiter)
+
+    data = fn.fetch_json(results_url) or []
+    comp_ids = list(dict.fromkeys(r["competition_id"] for r in data))
+    for comp_id in comp_ids:
+        fetched += warm_competition(comp_id, limiter, scrambles=scrambles, competitors=False)
+    return fetched
+
+
+def competitions_in_region(countries, days_back=30, days_ahead=30, limiter=None):
+    """
+    Competiciones de los países dados (ISO2) entre hoy-days_back y hoy+days_ahead.
+    Los campeonatos van primero y después el resto, de la más reciente a la más antigua.
+    Con `limiter`, las páginas del listado se descargan antes a su ritmo (get_all_competitions
+    las pide todas en paralelo) y el listado ya se lee de la caché.
+    """
+    countries = {c.upper() for c in countries}
+    today = date.today()
+    start = (today - timedelta(days=days_back)).isoformat()
+    end = (today + timedelta(days=days_ahead)).isoformat()
+
+    if limiter is not None:
+        for page in fn.COMPETITION_PAGES:
+            _warm_url(fn.COMPETITION_PAGE_URL.format(page=page), limiter)
+
+    selected = []
+    for comp in fn.get_all_competitions():
+        comp_date = (comp.get("date") or {}).get("from") or ""
+        if comp.get("country") in countries and start <= comp_date <= end:
+            selected.append(comp)
+
+    selected.sort(key=lambda c: c["date"]["from"], reverse=True)
+    selected.sort(key=lambda c: "championship" not in c.get("name", "").lower())
+    return selected
+
+
+def warm(wca_ids=(), countries=(), rate=2.0, workers=4, scrambles=True,
+         days_back=30, days_ahead=30, progress=None):
+    """
+    Precalienta perfiles y competiciones de una región.
+
+    `rate` es el máximo de peticiones por segundo hacia las APIs (entre todos los
+    hilos). `progress(done, total, label)` se llama tras cada tarea, si se pasa.
+    Devuelve un resumen: {"tasks": nº de tareas, "fetched": URLs descargadas (las que ya
+    estaban calientes no cuentan), "errors": [(tarea, error), ...]}.
+    """
+    limiter = RateLimiter(rate)
+    today = date.today().isoformat()
+
+    tasks = [(f"profile {wca_id}", warm_profile, (wca_id, limiter, scrambles)) for wca_id in wca_ids]
+    if countries:
+        for comp in competitions_in_region(countries, days_back, days_ahead, limiter=limiter):
+            # Las competiciones futuras aún no tienen scrambles publicados
+            has_scrambles = scrambles and comp["date"]["from"] <= today
+            tasks.append((f"competition {comp['id']}", warm_competition, (comp["id"], limiter, has_scrambles)))
+
+    total = len(tasks)
+    done = 0
+    fetched = 0
+    errors = []
+    lock = threading.Lock()
+
+    def run(task):
+        nonlocal done, fetched
+        label, func, args = task
+        error = None
+        try:
+            n = func(*args)
+        except Exception as e:
+            error = e
+            n = 0
+        with lock:
+            if error is not None:
+                errors.append((label, str(error)))
+            done += 1
+            fetched += n
+            if progress:
+                progress(done, total, label)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(run, tasks))
+
+    return {"tasks": total, "fetched": fetched, "errors": errors}
+
+
+def warm_in_background(**kwargs):
+    """Lanza `warm(**kwargs)` en un hilo daemon y devuelve el hilo."""
+    thread = threading.Thread(target=warm, kwargs=kwargs, name="cache-warmer", daemon=True)
+    thread.start()
+    return thread
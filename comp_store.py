@@ -0,0 +1,389 @@
+"""
+Almacén local de todas las competiciones con índice geográfico.
+
+Se construye a partir de las páginas competitions-page-{i}.json (las mismas que
+usa get_organized_competitions) y se guarda como fichero Arrow en la carpeta de
+la caché (STORE_PATH). Cada proceso lo mapea en memoria en solo lectura: con
+varias réplicas en el mismo host hay una sola copia en la caché de páginas del
+sistema, en vez de una tabla (y una COMP_CACHE llena) por proceso.
+
+Las coordenadas se indexan en una rejilla de celdas de CELL_DEG grados, de modo
+que una consulta por radio o por caja solo mira las celdas que toca en lugar de
+recorrer las ~15.000 competiciones. Los IDs van ordenados: lookup(comp_id) es una
+bisección y get_comp_data lo usa antes de descargar la ficha de una competición.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+import disk_cache
+import functions as fn
+from models import CompetitionSummary
+
+try:
+    import pyarrow as pa
+except ImportError:  # dependencia opcional: sin ella el almacén vive en la memoria del proceso
+    pa = None
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.195
+CELL_DEG = 1.0  # ~111 km de lado: un radio típico (50-300 km) toca pocas celdas
+
+STORE_PATH = os.path.join(disk_cache.CACHE_DIR, "competitions.arrow")
+# Las páginas de competiciones se dan por buenas un día (ver DISK_CACHE_TTL): el fichero también
+STORE_MAX_AGE = 24 * 3600
+STAT_INTERVAL = 5      # segundos entre comprobaciones del mtime del fichero mapeado
+REOPEN_INTERVAL = 60   # tras no poder abrir el fichero, segundos antes de volver a intentarlo
+NAT = np.iinfo(np.int64).min  # NaT como entero (días)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Distancia en km (vectorizada: acepta arrays de NumPy)."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def build_columns(competitions):
+    """
+    Columnas del almacén (arrays de NumPy) a partir de los items de las páginas, ordenadas
+    por ID para poder buscar por bisección. Las canceladas se descartan; las que no tienen
+    coordenadas se quedan (sirven para buscar por ID) con lat/lon NaN.
+    """
+    rows = []
+    for comp in competitions:
+        if comp.get("isCanceled") or not comp.get("id"):
+            continue
+        coords = (comp.get("venue") or {}).get("coordinates") or {}
+        lat, lon = coords.get("latitude"), coords.get("longitude")
+        date = comp.get("date") or {}
+        rows.append((
+            comp["id"], comp.get("name") or comp["id"], comp.get("city"), comp.get("country"),
+            date.get("from"), date.get("till"), date.get("numberOfDays") or 1,
+            float(lat) if lat is not None else np.nan, float(lon) if lon is not None else np.nan,
+            [o.get("name") for o in comp.get("organisers") or [] if o.get("name")],
+        ))
+    rows.sort(key=lambda r: r[0])
+
+    ids, names, cities, countries, starts, ends, days, lats, lons, organisers = zip(*rows) if rows else ([],) * 10
+
+    organiser_lists = np.empty(len(rows), dtype=object)
+    for i, names_list in enumerate(organisers):
+        organiser_lists[i] = names_list
+
+    def as_days(values):
+        dates = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce").to_numpy()
+        return dates.astype("datetime64[D]").view(np.int64)
+
+    return {
+        "id": np.array(ids, dtype=object),
+        "name": np.array(names, dtype=object),
+        "city": np.array(cities, dtype=object),
+        "country": np.array(countries, dtype=object),
+        "date_start": as_days(starts),
+        "date_end": as_days(ends),
+        "days": np.array(days, dtype=np.int32),
+        "lat": np.array(lats, dtype=np.float64),
+        "lon": np.array(lons, dtype=np.float64),
+        "organisers": organiser_lists,
+    }
+
+
+def write_store(columns, path=None):
+    """
+    Guarda las columnas como fichero Arrow IPC sin comprimir (así se puede mapear sin
+    copiar) en `path` (por defecto STORE_PATH). Escritura atómica: los procesos que
+    tienen mapeado el anterior lo siguen leyendo.
+    """
+    path = path or STORE_PATH
+    table = pa.table({name: pa.array(list(values) if values.dtype == object else values)
+                      for name, values in columns.items()})
+    table = table.replace_schema_metadata({"built_at": str(time.time())})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+
+
+def _take(column, idx):
+    """Filas `idx` de una columna de texto (Arrow mapeado o array de NumPy) como array de NumPy."""
+    if isinstance(column, np.ndarray):
+        return column[idx]
+    return column.take(pa.array(idx, type=pa.int64())).to_numpy(zero_copy_only=False)
+
+
+def _at(column, i):
+    value = column[i]
+    return value if isinstance(column, np.ndarray) else value.as_py()
+
+
+class CompetitionStore:
+    """
+    Tabla de competiciones + rejilla lat/lon para consultas espaciales.
+
+    Con pyarrow las columnas son vistas de un fichero mapeado en memoria (STORE_PATH):
+    todos los procesos del host comparten las mismas páginas. Sin pyarrow son arrays
+    de NumPy propios del proceso.
+    """
+
+    def __init__(self, columns, cell_deg=CELL_DEG, path=None, built_at=None):
+        self.cell_deg = cell_deg
+        self.n_lon_cells = int(round(360 / cell_deg))
+        self.path = path
+        self.built_at = built_at if built_at is not None else time.time()
+        self.mtime = os.path.getmtime(path) if path else None
+        self._checked_at = time.time()
+        self._replaced = False
+
+        # Texto: columnas Arrow (mapeadas) o de NumPy; números: arrays de NumPy (vistas sin copia)
+        self.ids = columns["id"]
+        self.names = columns["name"]
+        self.cities = columns["city"]
+        self.countries = columns["country"]
+        self.organisers = columns["organisers"]
+        self.days = columns["days"]
+        self.date_start = columns["date_start"].view("datetime64[D]")
+        self.date_end = columns["date_end"].view("datetime64[D]")
+        self.lat = columns["lat"]
+        self.lon = columns["lon"]
+
+        # Rejilla: (celda_lat, celda_lon) -> array de posiciones (solo las que tienen coordenadas)
+        located = np.flatnonzero(np.isfinite(self.lat) & np.isfinite(self.lon))
+        cells = defaultdict(list)
+        lat_cells = self._lat_cell(self.lat[located])
+        lon_cells = self._lon_cell(self.lon[located])
+        for i, key in zip(located.tolist(), zip(lat_cells.tolist(), lon_cells.tolist())):
+            cells[key].append(i)
+        self.cells = {key: np.array(idx, dtype=np.int64) for key, idx in cells.items()}
+
+    @classmethod
+    def from_competitions(cls, competitions, cell_deg=CELL_DEG):
+        """Almacén en memoria del proceso a partir de los items de las páginas."""
+        return cls(build_columns(competitions), cell_deg=cell_deg)
+
+    @classmethod
+    def open(cls, path=None, cell_deg=CELL_DEG):
+        """Mapea el fichero del almacén (por defecto STORE_PATH, solo lectura). Los números se ven como NumPy sin copiar."""
+        path = path or STORE_PATH
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        columns = {}
+        for name in table.column_names:
+            column = table.column(name)
+            column = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+            if pa.types.is_integer(column.type) or pa.types.is_floating(column.type):
+                column = column.to_numpy(zero_copy_only=False)
+            columns[name] = column
+        metadata = table.schema.metadata or {}
+        return cls(columns, cell_deg=cell_deg, path=path, built_at=float(metadata.get(b"built_at", 0)))
+
+    def stale(self):
+        """
+        Viejo (más de STORE_MAX_AGE) o, si está mapeado, el fichero ha cambiado desde que se
+        abrió. Se llama en cada lookup: el mtime se mira como mucho cada STAT_INTERVAL segundos.
+        """
+        now = time.time()
+        if now - self.built_at > STORE_MAX_AGE:
+            return True
+        if self.path is None:
+            return False
+        if not self._replaced and now - self._checked_at >= STAT_INTERVAL:
+            self._checked_at = now
+            try:
+                self._replaced = os.path.getmtime(self.path) != self.mtime
+            except OSError:
+                pass
+        return self._replaced
+
+    def __len__(self):
+        return len(self.ids)
+
+    def position(self, comp_id):
+        """Fila de la competición (bisección sobre los IDs ordenados) o None."""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _at(self.ids, mid) < comp_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < len(self) and _at(self.ids, lo) == comp_id else None
+
+    def summary(self, comp_id):
+        """CompetitionSummary de la competición (construido al vuelo desde las columnas) o None."""
+        i = self.position(comp_id)
+        if i is None:
+            return None
+        start, end = self.date_start[i], self.date_end[i]
+        lat, lon = float(self.lat[i]), float(self.lon[i])
+        return CompetitionSummary(
+            id=comp_id,
+            name=_at(self.names, i),
+            country=_at(self.countries, i),
+            city=_at(self.cities, i),
+            date_from=None if np.isnat(start) else str(start),
+            date_till=None if np.isnat(end) else str(end),
+            days=int(self.days[i]),
+            lat=None if math.isnan(lat) else lat,
+            lon=None if math.isnan(lon) else lon,
+            organisers=tuple(_at(self.organisers, i) or ()),
+        )
+
+    def _lat_cell(self, lat):
+        return np.floor(np.asarray(lat) / self.cell_deg).astype(np.int64)
+
+    def _lon_cell(self, lon):
+        return np.floor(np.asarray(lon) / self.cell_deg).astype(np.int64) % self.n_lon_cells
+
+    def _candidates(self, lat_min, lat_max, lon_min, lon_max):
+        """Posiciones de las competiciones en las celdas que cubren la caja (lon puede dar la vuelta)."""
+        lat_lo = int(self._lat_cell(max(lat_min, -90.0)))
+        lat_hi = int(self._lat_cell(min(lat_max, 90.0)))
+        if lon_max - lon_min >= 360:
+            lon_cells = range(self.n_lon_cells)
+        else:
+            first = int(np.floor(lon_min / self.cell_deg))
+            last = int(np.floor(lon_max / self.cell_deg))
+            lon_cells = {c % self.n_lon_cells for c in range(first, last + 1)}
+
+        found = [self.cells[(la, lo)] for la in range(lat_lo, lat_hi + 1) for lo in lon_cells
+                 if (la, lo) in self.cells]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def _filter_dates(self, idx, start=None, end=None):
+        if start is not None:
+            idx = idx[self.date_end[idx] >= np.datetime64(pd.Timestamp(start))]
+        if end is not None:
+            idx = idx[self.date_start[idx] <= np.datetime64(pd.Timestamp(end))]
+        return idx
+
+    def _frame(self, idx, distances=None):
+        df = pd.DataFrame({
+            "id": _take(self.ids, idx),
+            "name": _take(self.names, idx),
+            "city": _take(self.cities, idx),
+            "country": _take(self.countries, idx),
+            "date_start": self.date_start[idx],
+            "date_end": self.date_end[idx],
+            "lat": self.lat[idx],
+            "lon": self.lon[idx],
+        })
+        if distances is not None:
+            df["distance_km"] = distances
+            df = df.sort_values("distance_km", kind="stable")
+        return df.reset_index(drop=True)
+
+    def within_radius(self, lat, lon, radius_km, start=None, end=None, exclude=None, limit=None):
+        """
+        Competiciones a menos de `radius_km` de (lat, lon), ordenadas por distancia.
+        `start`/`end` filtran por fechas y `exclude` es un conjunto de IDs a descartar
+        (p. ej. las competiciones a las que ya has ido).
+        """
+        dlat = radius_km / KM_PER_DEG_LAT
+        cos_lat = math.cos(math.radians(min(abs(lat) + dlat, 89.9)))
+        dlon = min(radius_km / (KM_PER_DEG_LAT * cos_lat), 180.0)
+
+        idx = self._candidates(lat - dlat, lat + dlat, lon - dlon, lon + dlon)
+        idx = self._filter_dates(idx, start, end)
+        if exclude:
+            excluded = [p for p in map(self.position, exclude) if p is not None]
+            idx = idx[~np.isin(idx, excluded)]
+
+        dist = haversine_km(lat, lon, self.lat[idx], self.lon[idx])
+        keep = dist <= radius_km
+        df = self._frame(idx[keep], dist[keep])
+        return df.head(limit) if limit else df
+
+    def within_bbox(self, lat_min, lon_min, lat_max, lon_max, start=None, end=None):
+        """Competiciones dentro de la caja. Si lon_min > lon_max la caja cruza el antimeridiano."""
+        lon_span_max = lon_max if lon_max >= lon_min else lon_max + 360
+        idx = self._candidates(lat_min, lat_max, lon_min, lon_span_max)
+        idx = self._filter_dates(idx, start, end)
+
+        lat_ok = (self.lat[idx] >= lat_min) & (self.lat[idx] <= lat_max)
+        if lon_max >= lon_min:
+            lon_ok = (self.lon[idx] >= lon_min) & (self.lon[idx] <= lon_max)
+        else:
+            lon_ok = (self.lon[idx] >= lon_min) | (self.lon[idx] <= lon_max)
+        return self._frame(idx[lat_ok & lon_ok])
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+_last_failed_open = 0.0  # último intento fallido de lookup de abrir el fichero (ver REOPEN_INTERVAL)
+
+
+def _open_mapped():
+    """El almacén mapeado de STORE_PATH si existe y está al día; si no, None."""
+    if pa is None or not os.path.exists(STORE_PATH):
+        return None
+    try:
+        store = CompetitionStore.open(STORE_PATH)
+    except (OSError, pa.ArrowException, ValueError):
+        return None
+    return None if store.stale() else store
+
+
+def build_store():
+    """Descarga las páginas de competiciones y (con pyarrow) escribe y mapea el fichero del almacén."""
+    competitions = fn.get_all_competitions()
+    if pa is not None:
+        try:
+            write_store(build_columns(competitions))
+            return CompetitionStore.open(STORE_PATH)
+        except OSError:
+            pass
+    return CompetitionStore.from_competitions(competitions)
+
+
+def get_store():
+    """
+    Devuelve el almacén de competiciones del proceso. Usa el fichero compartido si otro
+    proceso (u otra réplica, o `wca_cli.py store`) ya lo generó; si no, lo construye.
+    """
+    global _STORE, _last_failed_open
+    with _STORE_LOCK:
+        if _STORE is None or _STORE.stale():
+            _STORE = _open_mapped() or build_store()
+            _last_failed_open = 0.0
+    return _STORE
+
+
+def lookup(comp_id):
+    """
+    CompetitionSummary desde el almacén, sin tocar la red (None si no está). Lo usa
+    get_comp_data antes de descargar la ficha.
+
+    Si el almacén ha caducado se reabre el fichero; si no hay uno al día se sigue usando
+    el anterior (los datos de una ficha apenas cambian) y no se reintenta hasta pasados
+    REOPEN_INTERVAL segundos, en vez de volver a leer el disco en cada fallo de caché.
+    """
+    global _STORE, _last_failed_open
+    store = _STORE
+    if store is None or store.stale():
+        with _STORE_LOCK:
+            store = _STORE
+            if (store is None or store.stale()) and time.time() - _last_failed_open >= REOPEN_INTERVAL:
+                mapped = _open_mapped()
+                if mapped is None:
+                    _last_failed_open = time.time()
+                else:
+                    _STORE = store = mapped
+    return store.summary(comp_id) if store is not None else None
+
+
+def nearby_competitions(lat, lon, radius_km=150, start=None, end=None, limit=None):
+    """Competiciones cerca de (lat, lon)."""
+    return get_store().within_radius(lat, lon, radius_km, start=start, end=end, limit=limit)
+
+
+def unvisited_nearby_competitions(lat, lon, visited_ids, radius_km=150, start=None, end=None, limit=None):
+    """Competiciones cerca de (lat, lon) a las que la persona todavía no ha ido."""
+    return get_store().within_radius(lat, lon, radius_km, start=start, end=end,
+                                     exclude=set(visited_ids), limit=limit)
@@ -0,0 +1,221 @@
+"""
+Almacén en disco de respuestas HTTP, con límite de tamaño y expulsión LRU.
+
+Cada URL se guarda en su propio fichero (nombre = hash de la URL) dentro de
+CACHE_DIR, así varias réplicas/procesos del mismo host y los jobs del CLI
+comparten lo que ya se ha descargado. Formato de cada fichero:
+
+    línea 1: metadatos en JSON (url, fetched_at, etag, last_modified, max_age)
+    resto:   el cuerpo de la respuesta tal cual llegó (bytes del JSON)
+
+Guardar el cuerpo sin re-serializar lo hace barato, y tener los metadatos en la
+primera línea permite consultar validadores/frescura sin parsear el cuerpo.
+La política HTTP (frescura, peticiones condicionales) vive en http_cache.py.
+
+Variables de entorno:
+    MYCUBING_CACHE_DIR     carpeta de la caché (por defecto ~/.cache/mycubing)
+    MYCUBING_DISK_CACHE    pon "0" para desactivarla
+    MYCUBING_CACHE_MAX_MB  tamaño máximo antes de expulsar lo menos usado (500)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+CACHE_DIR = os.environ.get(
+    "MYCUBING_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "mycubing")
+)
+ENABLED = os.environ.get("MYCUBING_DISK_CACHE", "1") != "0"
+MAX_BYTES = int(float(os.environ.get("MYCUBING_CACHE_MAX_MB", "500")) * 1024 * 1024)
+# Tras expulsar, dejamos la caché en este porcentaje del máximo para no expulsar en cada escritura
+EVICT_TARGET = 0.9
+SUFFIX = ".cache"
+
+_size_lock = threading.Lock()
+_total_bytes = None  # se calcula la primera vez que se escribe
+
+
+def _path(url):
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    # Dos niveles de carpeta para no tener decenas de miles de ficheros juntos
+    return os.path.join(CACHE_DIR, key[:2], key[2:] + SUFFIX)
+
+
+def _touch(path):
+    # La "última vez usado" del LRU es el atime (lo fijamos a mano: muchos discos van con noatime)
+    try:
+        os.utime(path, (time.time(), os.path.getmtime(path)))
+    except OSError:
+        pass
+
+
+def get_meta(url):
+    """Metadatos guardados para `url` (sin leer el cuerpo) o None."""
+    if not ENABLED:
+        return None
+    try:
+        with open(_path(url), "rb") as f:
+            return json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+
+
+def get(url):
+    """(metadatos, datos JSON ya parseados) para `url`, o None. Cuenta como uso para el LRU."""
+    if not ENABLED:
+        return None
+    path = _path(url)
+    try:
+        with open(path, "rb") as f:
+            meta = json.loads(f.readline())
+            data = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    _touch(path)
+    return meta, data
+
+
+def open_body(url):
+    """
+    Devuelve (metadatos, fichero binario posicionado al inicio del cuerpo) o None.
+    Para parsear el cuerpo en streaming sin cargarlo entero. El llamador cierra el fichero.
+    """
+    if not ENABLED:
+        return None
+    path = _path(url)
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return None
+    try:
+        meta = json.loads(f.readline())
+    except ValueError:
+        f.close()
+        return None
+    _touch(path)
+    return meta, f
+
+
+def put(url, meta, body):
+    """Guarda metadatos + cuerpo (bytes) para `url`. Escritura atómica (tmp + rename)."""
+    put_stream(url, meta, (body,))
+
+
+def put_stream(url, meta, chunks):
+    """
+    Como put, pero el cuerpo llega por trozos (p. ej. response.iter_content) y se
+    escribe según llega, sin tenerlo entero en memoria. True si quedó guardado.
+    """
+    if not ENABLED:
+        return False
+    path = _path(url)
+    header = json.dumps(dict(meta, url=url), separators=(",", ":")).encode("utf-8") + b"\n"
+    tmp = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        size = len(header)
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+        os.replace(tmp, path)
+    except OSError:
+        # Sin disco (o sin permisos) la app sigue funcionando, solo sin caché
+        _discard(tmp)
+        return False
+    except BaseException:
+        # Fallo del que nos da los trozos (p. ej. se corta la descarga): no dejamos basura
+        _discard(tmp)
+        raise
+    _account(size - old_size)
+    return True
+
+
+def _discard(tmp):
+    if tmp is not None:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def update_meta(url, **changes):
+    """Actualiza los metadatos de una entrada (p. ej. tras un 304) reescribiendo el fichero."""
+    entry = open_body(url)
+    if entry is None:
+        return
+    meta, f = entry
+    with f:
+        body = f.read()
+    meta.update(changes)
+    put(url, meta, body)
+
+
+def _scan():
+    """Lista (atime, tamaño, ruta) de todos los ficheros de la caché."""
+    files = []
+    for root, _, names in os.walk(CACHE_DIR):
+        for name in names:
+            if not name.endswith(SUFFIX):
+                continue
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_atime, st.st_size, path))
+    return files
+
+
+def urls(containing=None):
+    """URLs guardadas en la caché (solo las que contienen `containing`, si se da). Lee solo la primera línea."""
+    for _, _, path in _scan():
+        try:
+            with open(path, "rb") as f:
+                url = json.loads(f.readline()).get("url")
+        except (OSError, ValueError):
+            continue
+        if url and (containing is None or containing in url):
+            yield url
+
+
+def _account(delta):
+    global _total_bytes
+    with _size_lock:
+        if _total_bytes is None:
+            _total_bytes = sum(size for _, size, _ in _scan())
+        else:
+            _total_bytes += delta
+        if _total_bytes > MAX_BYTES:
+            _total_bytes = _evict()
+
+
+def _evict():
+    """Borra los ficheros menos usados hasta bajar de EVICT_TARGET * MAX_BYTES. Devuelve el tamaño final."""
+    files = sorted(_scan())
+    total = sum(size for _, size, _ in files)
+    target = MAX_BYTES * EVICT_TARGET
+    for _, size, path in files:
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+    return total
+
+
+def stats():
+    """Nº de entradas y bytes ocupados en disco."""
+    files = _scan()
+    return {"entries": len(files), "bytes": sum(size for _, size, _ in files), "max_bytes": MAX_BYTES}
@@ -1,67 +1,147 @@
-import requests
+# Núcleo de datos de la app: sin Streamlit ni librerías de gráficos, para que
+# se pueda importar rápido (y desde scripts) sin arrastrar la UI.
 import pandas as pd
-from datetime import datetime
+import numpy as np
 from concurrent.futures import ThreadPoolExecutor
+import os
 import threading
-from concurrent.futures import ThreadPoolExecutor
-import pycountry
-import streamlit as st
-from collections import defaultdict
-import time
+import comp_store
+import http_cache
+import scramble_index
+from memory_cache import LRUCache
+from models import CompetitionSummary, CompetitionWcif, Profile
 
 
 
 # --- CACHÉ GLOBAL ---
-COMP_CACHE = {}
-session = requests.Session()
-# Adapter para reintentos automáticos si la red falla brevemente
-adapter = requests.adapters.HTTPAdapter(pool_connections=100, pool_maxsize=100)
-session.mount('https://', adapter)
-
-def fetch_json(url):
-    """Helper to fetch JSON with error handling and User-Agent."""
-    try:
-        # IMPORTANTE: La WCA bloquea peticiones sin User-Agent
-        headers = {
-            'User-Agent': 'MyCubingApp/1.0 (streamlit_app_viewer)'
-        }
-        # Timeout un poco más generoso para la API oficial
-        response = session.get(url, headers=headers, timeout=20) 
-        
-        if response.status_code == 404:
-            return None
-        # Si nos limitan (429), lanzamos error para saberlo (o podrías esperar y reintentar)
-        response.raise_for_status()
-        return response.json()
-    
-    except Exception as e:
-        # Descomenta esto para depurar si sigue fallando
-        # print(f"Error fetching {url}: {e}")
-        return None
+# Fichas de competición ya proyectadas (CompetitionSummary), acotada y con expulsión LRU:
+# si se expulsa una, volver a pedirla sale de la caché de disco. Ver COMP_CACHE.stats().
+COMP_CACHE = LRUCache(
+    max_entries=int(os.environ.get("MYCUBING_COMP_CACHE_ENTRIES", "20000")),
+    max_bytes=int(float(os.environ.get("MYCUBING_COMP_CACHE_MB", "32")) * 1024 * 1024),
+)
+# Sesión compartida (pool, User-Agent y reintentos): ver http_cache.py
+session = http_cache.session
+
+# Cuánto tiempo (segundos) damos por buena una respuesta guardada en disco.
+# Se mira el primer patrón que aparezca en la URL.
+DISK_CACHE_TTL = [
+    ("/scrambles", 30 * 24 * 3600),              # no cambian una vez publicados
+    ("/api/competitions/", 7 * 24 * 3600),       # ficha de competición (GitHub)
+    ("competitions-page-", 24 * 3600),           # listado completo de competiciones
+    ("/competitors", 24 * 3600),
+    ("/wcif/public", 24 * 3600),
+    ("/results", 3600),                          # resultados de una persona
+]
+DEFAULT_DISK_CACHE_TTL = 3600
+
+def cache_ttl(url):
+    for pattern, ttl in DISK_CACHE_TTL:
+        if pattern in url:
+            return ttl
+    return DEFAULT_DISK_CACHE_TTL
+
+def fetch_json(url, use_disk_cache=True):
+    """
+    Helper to fetch JSON with error handling and User-Agent.
+    Pasa por la caché HTTP en disco (compartida entre procesos y con el CLI):
+    ETag/Last-Modified, Cache-Control y, si no hay, el TTL de cache_ttl.
+    use_disk_cache=False para ficheros enormes que el llamador guarda a su manera.
+    Devuelve None si la URL no existe (404) o falla sin copia guardada.
+    """
+    return http_cache.get_json(url, cache_ttl(url), use_cache=use_disk_cache)
+
+def iter_json_items(url, prefix):
+    """
+    Como fetch_json, pero para respuestas con una lista grande: genera sus elementos
+    uno a uno (parseo en streaming) para poder filtrar según se leen.
+    `prefix` es la ruta de la lista: 'item' si el JSON es una lista, 'items.item' si es {"items": [...]}.
+    """
+    return http_cache.iter_json_items(url, cache_ttl(url), prefix)
+
+# Orden de los tipos de ronda de la WCA (round_type_id): clasificatoria < primera
+# ronda < B final < segunda ronda < semifinal < final. La B final (formato antiguo)
+# se disputaba entre la primera y la segunda ronda. Las rondas "combined" (con
+# cutoff) ocupan el mismo puesto que su equivalente normal.
+ROUND_ORDER = {
+    "0": 0, "h": 0,   # clasificatoria
+    "1": 1, "d": 1,   # primera ronda
+    "b": 2,           # B final (formato antiguo)
+    "2": 3, "e": 3,   # segunda ronda
+    "3": 4, "g": 4,   # semifinal
+    "f": 5, "c": 5,   # final
+}
+ROUND_NAMES = {
+    "0": "Qualification", "h": "Combined Qualification",
+    "1": "First Round", "d": "Combined First Round",
+    "2": "Second Round", "e": "Combined Second Round",
+    "3": "Semi-final", "g": "Combined Third Round",
+    "b": "B Final", "f": "Final", "c": "Combined Final",
+}
+SOLVE_COLUMNS = ["time1", "time2", "time3", "time4", "time5"]
+
+def _download_comp_data(comp_id):
+    url = f'https://raw.githubusercontent.com/robiningelbrecht/wca-rest-api/master/api/competitions/{comp_id}.json'
+    record = CompetitionSummary.from_json(comp_id, fetch_json(url))
+    if record is not None:
+        COMP_CACHE.put(comp_id, record)
+    return record
 
 def get_comp_data(comp_id):
     """
-    Fetches competition data. 
+    Fetches competition data (CompetitionSummary: name, country, dates, coordinates, organisers).
     Checks cache first to avoid network calls.
     """
-    if comp_id not in COMP_CACHE:
-        url = f'https://raw.githubusercontent.com/robiningelbrecht/wca-rest-api/master/api/competitions/{comp_id}.json'
-        data = fetch_json(url)
-        if data:
-            COMP_CACHE[comp_id] = data
-    return COMP_CACHE.get(comp_id)
+    # El almacén mapeado (comp_store.py) se comparte entre procesos: lo que hay ahí no ocupa COMP_CACHE
+    return COMP_CACHE.get(comp_id) or comp_store.lookup(comp_id) or _download_comp_data(comp_id)
 
 def prefetch_competitions(comp_ids):
     """
     Parallel fetching of competition data.
     OPTIMIZATION: Increased workers to 50 for faster I/O bound operations.
+    Devuelve {comp_id: CompetitionSummary} (sin las que no se pudieron descargar), para que
+    el llamador no dependa de que sigan en COMP_CACHE (puede expulsarlas).
     """
-    to_fetch = [cid for cid in comp_ids if cid not in COMP_CACHE]
+    found = {}
+    to_fetch = []
+    for cid in comp_ids:
+        record = COMP_CACHE.get(cid) or comp_store.lookup(cid)
+        if record is None:
+            to_fetch.append(cid)
+        else:
+            found[cid] = record
     
     if to_fetch:
         # Aumentamos workers a 50 para aprovechar ancho de banda en I/O
         with ThreadPoolExecutor(max_workers=50) as executor:
-            executor.map(get_comp_data, to_fetch)
+            for cid, record in zip(to_fetch, executor.map(_download_comp_data, to_fetch)):
+                if record is not None:
+                    found[cid] = record
+    return found
+
+def decode_mbld(values):
+    """
+    Decodifica resultados de Multi-Blind (escalar o array) -> (puntos, resueltos, intentados, segundos).
+
+    Formato actual 0DDTTTTTMM: puntos = 99 - DD, TTTTT segundos, MM cubos fallados.
+    Formato antiguo 1SSAATTTTT (hasta 2009): resueltos = 99 - SS, AA intentados.
+    Los valores <= 0 (DNF, DNS, sin intento) dan todo 0. Vectorizado: sirve para columnas enteras.
+    """
+    v = np.asarray(values, dtype=np.int64)
+    valid = v > 0
+    old = v >= 1_000_000_000
+
+    missed = v % 100
+    points = 99 - (v // 10_000_000) % 100
+    solved = np.where(old, 99 - (v // 10_000_000) % 100, points + missed)
+    attempted = np.where(old, (v // 100_000) % 100, points + 2 * missed)
+    seconds = np.where(old, v % 100_000, (v // 100) % 100_000)
+    points = np.where(old, 2 * solved - attempted, points)
+
+    return tuple(np.where(valid, x, 0) for x in (points, solved, attempted, seconds))
+
+# Las medias de FMC se publican multiplicadas por 100 (punto fijo con 2 decimales)
+FMC_AVERAGE_SCALE = 100
 
 def format_wca_time(cs, event_code=""):
     if cs == -1: return "DNF"
@@ -70,15 +150,11 @@ def format_wca_time(cs, event_code=""):
     
     # Si es FMC, la media se guarda multiplicada por 100
     if event_code == "333fm":
-        return f"{cs} moves" if cs < 1000 else f"{cs/100:.2f} moves" 
+        return f"{cs} moves" if cs < 1000 else f"{cs / FMC_AVERAGE_SCALE:.2f} moves"
     
     if event_code == "333mbf":
         # cs es el entero codificado (ej. 790321301)
-        missed = cs % 100                              # cubos fallados
-        time_seconds = (cs // 100) % 100000            # tiempo total en segundos
-        points = 99 - (cs // 10_000_000)               # puntos = solved - missed
-        solved = points + missed
-        attempted = solved + missed
+        _, solved, attempted, time_seconds = (int(x) for x in decode_mbld(cs))
 
         minutes = time_seconds // 60
         seconds = time_seconds % 60
@@ -103,19 +179,83 @@ def get_comp_wcif_public(comp_id):
     url = f"https://www.worldcubeassociation.org/api/v0/competitions/{comp_id}/wcif/public"
     return fetch_json(url)
 
-def fetch_names_from_wcif(comp_id):
-    """Plan B: Extrae nombres desde el WCIF público."""
+# WCIF ya parseado por competición: una sola descarga sirve a vecinos, scrambles
+# y a la ficha de competición. Solo guardamos los que se pudieron descargar.
+WCIF_CACHE = {}
+
+def get_competition_wcif(comp_id):
+    """CompetitionWcif de la competición (personas, rondas, grupos y horario) o None."""
+    wcif = WCIF_CACHE.get(comp_id)
+    if wcif is None:
+        wcif = CompetitionWcif.from_json(get_comp_wcif_public(comp_id))
+        if wcif is not None:
+            WCIF_CACHE[comp_id] = wcif
+    return wcif
+
+WCIF_FORMAT_NAMES = {"1": "Bo1", "2": "Bo2", "3": "Bo3", "5": "Bo5", "a": "Ao5", "m": "Mo3"}
+
+def get_wcif_rounds_table(wcif):
+    """Una fila por ronda: formato, límite de tiempo, cutoff, clasificación y nº de grupos."""
+    rows = []
+    for event_id, rounds in wcif.rounds.items():
+        for r in rounds:
+            if r.advancement_type == "ranking":
+                advancement = f"Top {r.advancement_level}"
+            elif r.advancement_type == "percent":
+                advancement = f"Top {r.advancement_level}%"
+            elif r.advancement_type == "attemptResult":
+                advancement = f"< {format_wca_time(r.advancement_level, event_id)}"
+            else:
+                advancement = ""
+            # El límite de tiempo siempre va en centésimas (también en FMC/MBLD)
+            time_limit = format_wca_time(r.time_limit_cs) if r.time_limit_cs else ""
+            rows.append({
+                "Event": event_id,
+                "Round": r.number,
+                "Format": WCIF_FORMAT_NAMES.get(r.format, r.format),
+                "Time limit": time_limit + (" (cumulative)" if time_limit and r.cumulative_limit else ""),
+                "Cutoff": (f"{r.cutoff_attempts} @ {format_wca_time(r.cutoff_cs, event_id)}"
+                           if r.cutoff_attempts else ""),
+                "Advancement": advancement,
+                "Groups": len(wcif.groups_for(event_id, r.number)) or r.scramble_set_count,
+            })
+    return pd.DataFrame(rows)
+
+def get_wcif_schedule(wcif, groups=False):
+    """Horario en hora local de la sede: una fila por actividad (con groups=True incluye los grupos)."""
+    activities = wcif.activities if groups else wcif.round_activities()
+    if not activities:
+        return pd.DataFrame()
+    df = pd.DataFrame({
+        "Start": pd.to_datetime([a.start for a in activities], utc=True),
+        "End": pd.to_datetime([a.end for a in activities], utc=True),
+        "Activity": [a.name for a in activities],
+        "Code": [a.code for a in activities],
+        "Room": [a.room for a in activities],
+    })
+    if wcif.timezone:
+        df["Start"] = df["Start"].dt.tz_convert(wcif.timezone)
+        df["End"] = df["End"].dt.tz_convert(wcif.timezone)
+    df["Day"] = df["Start"].dt.date
+    return df
+
+def fetch_people_from_wcif(comp_id):
+    """(clave, nombre) de los competidores según el WCIF público (ver person_key)."""
+    wcif = WCIF_CACHE.get(comp_id)
+    if wcif is not None:
+        return [(person_key(comp_id, p.wca_id, p.registrant_id), p.name) for p in wcif.competitors()]
+    # Solo hacen falta las personas: leemos 'persons' en streaming sin construir el WCIF entero
     url = f"https://www.worldcubeassociation.org/api/v0/competitions/{comp_id}/wcif/public"
-    try:
-        response = session.get(url, timeout=30)
-        if response.status_code == 200:
-            data = response.json()
-            # En WCIF los competidores están en la lista 'persons'
-            if 'persons' in data:
-                return [p['name'] for p in data['persons']]
-    except Exception as e:
-        print(f"Error fatal en WCIF para {comp_id}: {e}")
-    return []
+    people = []
+    for person in iter_json_items(url, 'persons.item'):
+        # Igual que CompetitionWcif.competitors(): sin registro aceptado no compite
+        registration = person.get('registration')
+        if registration and registration.get('status', 'accepted') == 'accepted' and registration.get('isCompeting', True):
+            people.append((person_key(comp_id, person.get('wcaId'), person.get('registrantId')), person['name']))
+    return people
+
+def fetch_names_from_wcif(comp_id):
+    return [name for _, name in fetch_people_from_wcif(comp_id)]
 
 def get_wca_results(wca_id):
     """
@@ -151,17 +291,18 @@ def get_wca_results(wca_id):
     all_comp_ids = list(results_by_comp.keys())
 
     # Parallel prefetch (your optimization)
-    prefetch_competitions(all_comp_ids)
+    comps_info = prefetch_competitions(all_comp_ids)
 
     rows = []
     comp_ids_ordered = all_comp_ids[::-1]
 
     for comp_id in comp_ids_ordered:
-        comp_info = COMP_CACHE.get(comp_id)
+        comp_info = comps_info.get(comp_id)
 
-        comp_name = comp_info.get("name", comp_id) if comp_info else comp_id
-        country_iso2 = comp_info.get("country") if comp_info else "Unknown"
-        raw_date = comp_info.get("date", {}).get("from") if comp_info else None
+        comp_name = comp_info.name if comp_info else comp_id
+        country_iso2 = comp_info.country if comp_info else "Unknown"
+        raw_date = comp_info.date_from if comp_info else None
+        comp_days = comp_info.days if comp_info else 1
 
         events = results_by_comp[comp_id]
 
@@ -173,16 +314,19 @@ def get_wca_results(wca_id):
                     "Competition": comp_id,
                     "CompName": comp_name,
                     "CompDate": raw_date,
+                    "CompDays": comp_days,
                     "Country": country_iso2,
                     "Event": event_id,
                     "Round": r.get("round"),
                     "best_cs": r.get("best"),
                     "avg_cs": r.get("average"),
-                    "time1": solves[0] if len(solves) > 0 else None,
-                    "time2": solves[1] if len(solves) > 1 else None,
-                    "time3": solves[2] if len(solves) > 2 else None,
-                    "time4": solves[3] if len(solves) > 3 else None,
-                    "time5": solves[4] if len(solves) > 4 else None,
+                    "RoundRank": ROUND_ORDER.get(r.get("round"), -1),
+                    # 0 = intento no realizado (convención de la WCA)
+                    "time1": solves[0] if len(solves) > 0 else 0,
+                    "time2": solves[1] if len(solves) > 1 else 0,
+                    "time3": solves[2] if len(solves) > 2 else 0,
+                    "time4": solves[3] if len(solves) > 3 else 0,
+                    "time5": solves[4] if len(solves) > 4 else 0,
                 })
 
     df = pd.DataFrame(rows)
@@ -200,7 +344,8 @@ def get_wca_results(wca_id):
     running_best_avg = {}
     pr_labels = []
 
-    df = df.sort_values(by=["CompDate", "Round"], ascending=True)
+    # Orden real de rondas (1 < 2 < 3 < final), no el alfabético de round_type_id
+    df = df.sort_values(by=["CompDate", "RoundRank"], ascending=True)
 
     for idx, row in df.iterrows():
         e, s, a = row["Event"], clean_for_min(row["best_cs"]), clean_for_min(row["avg_cs"])
@@ -225,29 +370,97 @@ def get_wca_results(wca_id):
 
     df["pr"] = pr_labels
 
-    return df.sort_values(by="CompDate", ascending=False).reset_index(drop=True)
-def flatten(obj, parent_key="", sep="."):
-    flat = {}
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            new_key = f"{parent_key}{sep}{k}" if parent_key else k
-            flat.update(flatten(v, new_key, sep))
-    elif isinstance(obj, list):
-        for i, v in enumerate(obj):
-            new_key = f"{parent_key}{sep}{i}"
-            flat.update(flatten(v, new_key, sep))
-    else:
-        flat[parent_key] = obj
-    return flat
+    df = df.sort_values(by=["CompDate", "RoundRank"], ascending=False).reset_index(drop=True)
+    return add_event_columns(add_solve_stats(df))
+
+def add_solve_stats(df):
+    """
+    Añade al DataFrame de resultados los intentos como bloque contiguo y sus estadísticas.
+
+    - Solves: por fila, una vista (int32, longitud 5) de un único array (n, 5) en el
+      orden final del DataFrame. 0 = sin intento, -1 = DNF, -2 = DNS.
+    - n_attempts / n_dnf: intentos realizados y fallados (DNF o DNS).
+    - worst_cs: peor intento (-1 si hubo algún DNF/DNS). El mejor ya es best_cs.
+    - counting_avg_cs: media de los intentos que cuentan (ao5 sin mejor y peor, o mo3),
+      -1 si la media es DNF y NaN si la ronda no tiene 3 o 5 intentos.
+    - counting_std_cs: desviación típica de esos intentos (más baja = más consistente).
+
+    Todo se calcula vectorizado sobre el bloque. Multi-Blind se deja en NaN porque sus
+    valores son enteros empaquetados y no tiempos.
+    """
+    block = np.ascontiguousarray(df[SOLVE_COLUMNS].to_numpy(dtype=np.int32))
+    df[SOLVE_COLUMNS] = block
+    df["Solves"] = list(block)
+
+    attempted = block != 0
+    failed = block < 0
+    df["n_attempts"] = attempted.sum(axis=1).astype(np.int8)
+    df["n_dnf"] = failed.sum(axis=1).astype(np.int8)
+
+    # Los DNF/DNS valen infinito (cuentan como el peor) y los no realizados NaN (van al final)
+    values = block.astype(np.float64)
+    values[failed] = np.inf
+    values[~attempted] = np.nan
+    ordered = np.sort(values, axis=1)
+
+    df["worst_cs"] = np.where(failed.any(axis=1), -1, np.where(attempted, block, 0).max(axis=1)).astype(np.int32)
+
+    n_att = df["n_attempts"].to_numpy()
+    counting = np.full((len(df), 3), np.nan)
+    counting[n_att == 5] = ordered[n_att == 5, 1:4]
+    counting[n_att == 3] = ordered[n_att == 3, 0:3]
+    has_counting = (n_att == 5) | (n_att == 3)
+    is_dnf = has_counting & np.isinf(counting).any(axis=1)
+    finite = has_counting & ~is_dnf
+
+    counting_avg = np.full(len(df), np.nan)
+    counting_std = np.full(len(df), np.nan)
+    counting_avg[finite] = counting[finite].mean(axis=1)
+    counting_std[finite] = counting[finite].std(axis=1)
+    counting_avg[is_dnf] = -1
+
+    not_mbf = (df["Event"] != "333mbf").to_numpy()
+    df["counting_avg_cs"] = np.where(not_mbf, counting_avg, np.nan)
+    df["counting_std_cs"] = np.where(not_mbf, counting_std, np.nan)
+    return df
+
+def add_event_columns(df):
+    """
+    Columnas tipadas de los eventos con resultados codificados, decodificadas una vez al cargar:
+
+    - Multi-Blind (del mejor intento de la ronda): mbf_points, mbf_solved, mbf_attempted
+      (Int16) y mbf_seconds (Int32).
+    - FMC: fmc_moves (single, Int16) y fmc_mean (media en movimientos, Float32).
+
+    Son nulas (<NA>) en el resto de eventos y cuando no hay resultado válido.
+    """
+    best = pd.to_numeric(df["best_cs"], errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+    avg = pd.to_numeric(df["avg_cs"], errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+    events = df["Event"].to_numpy()
+
+    def typed(values, valid, dtype):
+        # Entero/float nullable: <NA> donde no aplica
+        return pd.Series(values, index=df.index).astype(dtype.lower()).astype(dtype).mask(~valid)
+
+    is_mbf = (events == "333mbf") & (best > 0)
+    points, solved, attempted, seconds = decode_mbld(np.where(is_mbf, best, 0))
+    df["mbf_points"] = typed(points, is_mbf, "Int16")
+    df["mbf_solved"] = typed(solved, is_mbf, "Int16")
+    df["mbf_attempted"] = typed(attempted, is_mbf, "Int16")
+    df["mbf_seconds"] = typed(seconds, is_mbf, "Int32")
+
+    is_fmc = events == "333fm"
+    df["fmc_moves"] = typed(np.where(is_fmc, best, 0), is_fmc & (best > 0), "Int16")
+    df["fmc_mean"] = typed(np.where(is_fmc, avg, 0) / FMC_AVERAGE_SCALE, is_fmc & (avg > 0), "Float32")
+    return df
 
 def get_wcaid_info(wca_id):
+    """
+    Perfil tipado (models.Profile) de una persona. Usa la sesión compartida y la
+    caché de disco. Si la API falla devuelve un perfil vacío (solo con el WCA ID).
+    """
     url = f"https://www.worldcubeassociation.org/api/v0/persons/{wca_id}"
-    try:
-        r = requests.get(url, timeout=10)
-        r.raise_for_status()
-        return flatten(r.json())
-    except Exception:
-        return {}
+    return Profile.from_json(wca_id, fetch_json(url))
 
 def prs_info(wca_id, results_df=None):
     if results_df is None:
@@ -298,31 +511,21 @@ def generate_map_data(wca_id, results_df=None):
     if results_df.empty: return
 
     competitions = results_df['Competition'].unique()
+    comps_info = prefetch_competitions(competitions)
     
     for competition in competitions:
-        comp_data = COMP_CACHE.get(competition)
+        comp_data = comps_info.get(competition)
         
         # Chequeo robusto por si falta data en el JSON
-        if not comp_data or 'venue' not in comp_data or comp_data['venue'] is None:
-            continue
-            
-        coords = comp_data['venue'].get('coordinates')
-        if not coords:
+        if comp_data is None or comp_data.lat is None or comp_data.lon is None:
             continue
 
-        name = comp_data.get('name', competition)
-        date_start = comp_data.get('date', {}).get('from', "")
-        
-        lat = coords.get('latitude')
-        lon = coords.get('longitude')
-        
-        if lat is not None and lon is not None:
-            yield {
-                'lat': float(lat),
-                'lon': float(lon),
-                'nombre': name,
-                'fecha': f"{date_start}"
-            }
+        yield {
+            'lat': comp_data.lat,
+            'lon': comp_data.lon,
+            'nombre': comp_data.name,
+            'fecha': f"{comp_data.date_from or ''}"
+        }
 
 def get_flag_emoji(country_code):
     if not country_code or country_code == 'N/A':
@@ -350,28 +553,154 @@ def get_country_name(code):
     # -----------------------
 
     try:
+        # pycountry tarda en cargar su base de datos: solo lo importamos al usarlo
+        import pycountry
         # Busca el país en la base de datos de pycountry
         country = pycountry.countries.get(alpha_2=code)
         return country.name if country else code
     except:
         return code
     
+def get_activity_index(results_df):
+    """
+    Índice de actividad de un perfil, calculado una vez y reutilizado por todas las vistas.
+
+    Devuelve un dict con:
+    - "comps": una fila por competición (Competition, CompName, start, days, rounds, solves).
+    - "daily": índice = cada día de competición (los multi-día ocupan todos sus días según
+      date.numberOfDays), columnas competitions, rounds, solves (rondas e intentos de cada
+      competición repartidos a partes iguales entre sus días) y names.
+    - "monthly" / "yearly": nº de competiciones (por fecha de inicio), rondas e intentos.
+    """
+    if results_df.empty:
+        empty = pd.DataFrame()
+        return {"comps": empty, "daily": empty, "monthly": empty, "yearly": empty}
+
+    comps = results_df.groupby("Competition", sort=False).agg(
+        CompName=("CompName", "first"),
+        start=("CompDate", "first"),
+        days=("CompDays", "first"),
+        rounds=("Event", "size"),
+        solves=("n_attempts", "sum"),
+    ).reset_index()
+    comps = comps[comps["start"].notna()]
+    comps["days"] = comps["days"].fillna(1).clip(lower=1).astype(int)
+
+    # Expandimos cada competición a sus días (vectorizado: repeat + desplazamiento)
+    days = comps["days"].to_numpy()
+    pos = np.repeat(np.arange(len(comps)), days)
+    offsets = np.arange(len(pos)) - np.repeat(np.cumsum(days) - days, days)
+    dates = comps["start"].to_numpy()[pos] + offsets.astype("timedelta64[D]")
+    per_day = pd.DataFrame({
+        "date": dates,
+        "competitions": 1,
+        "rounds": comps["rounds"].to_numpy()[pos] / days[pos],
+        "solves": comps["solves"].to_numpy()[pos] / days[pos],
+        "names": comps["CompName"].to_numpy()[pos],
+    })
+    daily = per_day.groupby("date").agg(
+        competitions=("competitions", "sum"),
+        rounds=("rounds", "sum"),
+        solves=("solves", "sum"),
+        names=("names", " · ".join),
+    )
+
+    comps["Year"] = comps["start"].dt.year
+    comps["Month"] = comps["start"].dt.month
+    monthly = comps.groupby(["Year", "Month"]).agg(
+        Count=("Competition", "size"), Rounds=("rounds", "sum"), Solves=("solves", "sum")
+    ).reset_index()
+    yearly = monthly.groupby("Year")[["Count", "Rounds", "Solves"]].sum().reset_index()
+
+    return {"comps": comps, "daily": daily, "monthly": monthly, "yearly": yearly}
+
 def get_heatmap_data(results_df):
     """Prepara los datos para el heatmap de actividad anual/mensual."""
+    monthly = get_activity_index(results_df)["monthly"]
+    if monthly.empty:
+        return pd.DataFrame()
+    return monthly[["Year", "Month", "Count"]]
+
+
+def _long_results(results_df):
+    """Single y average en formato largo: Event, CompDate, RoundRank, value, Kind (solo valores > 0)."""
+    parts = []
+    for kind, col in (("single", "best_cs"), ("average", "avg_cs")):
+        part = results_df.loc[results_df[col] > 0, ["Event", "CompDate", "RoundRank", col]]
+        parts.append(part.rename(columns={col: "value"}).assign(Kind=kind))
+    return pd.concat(parts, ignore_index=True)
+
+def to_plot_units(values, event_code, kind):
+    """
+    Convierte valores WCA (array o escalar) a unidades de gráfica: segundos,
+    movimientos (FMC) o puntos (Multi-Blind).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if event_code == "333mbf":
+        return decode_mbld(values)[0].astype(np.float64)
+    if event_code == "333fm" and kind == "single":
+        return values
+    return values / 100
+
+# Puntos máximos que se mandan a Plotly por serie de progresión
+PROGRESSION_MAX_POINTS = 200
+
+def get_pb_progression(results_df, max_points=PROGRESSION_MAX_POINTS):
+    """
+    Serie escalonada de PBs para cada (evento, 'single'/'average'), en una sola pasada.
+
+    Devuelve {(event, kind): {"dates": datetime64[], "values": float32[]}} con solo
+    las filas en las que el PB mejora. "values" ya está en unidades de la gráfica:
+    segundos, movimientos (FMC) o puntos (Multi-Blind, donde más es mejor).
+    Las series con más de `max_points` puntos se reducen manteniendo el primero y el último.
+    """
+    if results_df.empty:
+        return {}
+
+    long_df = _long_results(results_df)
+    long_df = long_df.sort_values(by=["Event", "Kind", "CompDate", "RoundRank"], kind="stable")
+
+    value = long_df["value"].to_numpy(dtype=np.int64)
+    is_mbf = (long_df["Event"] == "333mbf").to_numpy()
+    is_fmc_single = ((long_df["Event"] == "333fm") & (long_df["Kind"] == "single")).to_numpy()
+
+    mbf_points = decode_mbld(np.where(is_mbf, value, 0))[0]
+    # "score": menor es mejor en todos los eventos (en MBLD, puntos en negativo)
+    long_df["score"] = np.where(is_mbf, -mbf_points, value)
+    long_df["plot_value"] = np.where(
+        is_mbf, mbf_points, np.where(is_fmc_single, value, value / 100)
+    ).astype(np.float32)
+
+    groups = long_df.groupby(["Event", "Kind"], sort=False)["score"]
+    best_before = groups.cummin().groupby([long_df["Event"], long_df["Kind"]]).shift(1)
+    improves = best_before.isna() | (long_df["score"] < best_before)
+    steps = long_df[improves.to_numpy()]
+
+    series = {}
+    for (event, kind), group in steps.groupby(["Event", "Kind"], sort=False):
+        dates = group["CompDate"].to_numpy()
+        values = group["plot_value"].to_numpy()
+        if len(dates) > max_points:
+            keep = np.unique(np.linspace(0, len(dates) - 1, max_points).round().astype(int))
+            dates, values = dates[keep], values[keep]
+        series[(event, kind)] = {"dates": dates, "values": values}
+    return series
+
+def get_yearly_bests(results_df):
+    """
+    Matriz de mejores resultados: filas (Event, Kind) con Kind 'single'/'average',
+    columnas = años, valores = mejor resultado WCA de ese año (NaN si no hubo).
+    Se construye con un solo groupby; cualquier par de años o tendencia es un lookup.
+    En Multi-Blind el entero más bajo también es el mejor resultado.
+    """
     if results_df.empty:
         return pd.DataFrame()
-    
-    # Agrupar por competición única para no contar rondas individuales
-    df_unique_comps = results_df.drop_duplicates(subset=['Competition']).copy()
-    
-    # Extraer año y mes
-    df_unique_comps['Year'] = df_unique_comps['CompDate'].dt.year
-    df_unique_comps['Month'] = df_unique_comps['CompDate'].dt.month
-    
-    # Contar competiciones por mes/año
-    heatmap_df = df_unique_comps.groupby(['Year', 'Month']).size().reset_index(name='Count')
-    return heatmap_df
 
+    long_df = _long_results(results_df)
+    long_df["Year"] = long_df["CompDate"].dt.year
+    matrix = long_df.groupby(["Event", "Kind", "Year"])["value"].min().unstack("Year")
+    matrix.columns = matrix.columns.astype(int)
+    return matrix.sort_index(axis=1)
 
 def get_names_from_competition(comp_id):
     """Descarga y cachea los nombres de una sola competición."""
@@ -382,125 +711,166 @@ def get_names_from_competition(comp_id):
         return [person['name'] for person in data]
     return []
 
-@st.cache_data(show_spinner=False)
+# --- Identidad de las personas para contar vecinos ---
+# Contamos por WCA ID, no por nombre (los nombres cambian y hay homónimos). Cada clave
+# se interna como un entero compacto, así cada competición es un array int32 y el
+# recuento de vecinos es un np.bincount en vez de diccionarios de strings.
+PERSON_IDS = {}     # clave -> entero
+PERSON_KEYS = []    # entero -> clave
+PERSON_NAMES = []   # entero -> último nombre visto
+_person_lock = threading.Lock()
+
+def person_key(comp_id, wca_id=None, registrant_id=None):
+    """
+    Clave estable de una persona: su WCA ID; si no tiene (primera competición), el
+    registrante dentro de esa competición, que no se confunde con nadie más.
+    """
+    if wca_id:
+        return wca_id
+    return f"{comp_id}#{registrant_id}"
+
+def is_wca_id(key):
+    return '#' not in key
+
+def intern_people(people):
+    """[(clave, nombre), ...] -> array int32 de ids compactos (sin repetidos)."""
+    ids = np.empty(len(people), dtype=np.int32)
+    with _person_lock:
+        for i, (key, name) in enumerate(people):
+            pid = PERSON_IDS.get(key)
+            if pid is None:
+                pid = PERSON_IDS[key] = len(PERSON_KEYS)
+                PERSON_KEYS.append(key)
+                PERSON_NAMES.append(name)
+            elif name:
+                PERSON_NAMES[pid] = name
+            ids[i] = pid
+    return np.unique(ids)
+
+# Caché de competidores por competición: array int32 de ids de persona (ver intern_people)
+COMP_PEOPLE_CACHE = {}
+
+def fetch_people_from_comp(comp_id):
+    """Ids compactos (int32) de los competidores de una competición."""
+    if comp_id in COMP_PEOPLE_CACHE:
+        return COMP_PEOPLE_CACHE[comp_id]
+    ids = intern_people(_fetch_people_from_comp(comp_id))
+    # Solo guardamos listas con gente: un 0 suele ser un fallo temporal de la API
+    if len(ids):
+        COMP_PEOPLE_CACHE[comp_id] = ids
+    return ids
+
 def fetch_names_from_comp(comp_id):
+    return [PERSON_NAMES[pid] for pid in fetch_people_from_comp(comp_id)]
+
+def _fetch_people_from_comp(comp_id):
+    # El WCIF compartido (si ya se abrió la ficha o los scrambles, no hay descarga)
+    people = fetch_people_from_wcif(comp_id)
+    if people:
+        return people
+    # Sin WCIF, el endpoint de competidores. Las claves salen igual que del WCIF:
+    # WCA ID o, si no tiene, el registrante; quien no trae ninguno de los dos no se
+    # puede identificar y no se cuenta (un recién llegado no repite como vecino)
     url = f"https://www.worldcubeassociation.org/api/v0/competitions/{comp_id}/competitors"
-    
-    # INTENTO 1: Endpoint estándar
-    try:
-        response = session.get(url, timeout=20)
-        if response.status_code == 200:
-            names = [p['name'] for p in response.json()]
-            if len(names) > 0:
-                return names
-    except:
-        pass
-
-    # INTENTO 2: Si el anterior dio 0 o falló, vamos al WCIF (Plan B)
-    print(f"⚠️ {comp_id} devolvió 0. Intentando rescate vía WCIF...")
-    time.sleep(4) # Pausa de cortesía
-    names_wcif = fetch_names_from_wcif(comp_id)
-    
-    if len(names_wcif) > 0:
-        print(f"✅ Rescate exitoso para {comp_id} usando WCIF ({len(names_wcif)} personas)")
-        return names_wcif
+    return [(person_key(comp_id, p.get('wca_id'), p.get('registrant_id')), p['name'])
+            for p in iter_json_items(url, 'item')
+            if p.get('wca_id') or p.get('registrant_id') is not None]
 
-    return []
+def get_neighbour_matrix(wca_id, results_df=None, progress=None):
+    """
+    Matriz (vecino x año): en cuántas competiciones de cada año coincidió cada persona con `wca_id`.
+    Cada lista de competidores se pide una sola vez; "All" y cualquier año salen de aquí
+    con neighbours_for_year. `progress(hechas, total)` se llama tras cada competición.
 
-def get_wca_neighbours_old(wca_id, year):
-    results_df = get_wca_results(wca_id)
+    Devuelve un DataFrame con PersonId, WcaId, Name y una columna por año (int), sin la propia
+    persona, ordenado por total.
+    """
+    if results_df is None:
+        results_df = get_wca_results(wca_id)
     if results_df.empty:
         return pd.DataFrame()
 
-    comp_ids = results_df['Competition'].unique()
-
-    year = str(year)
-
-    
-    if year and year != 'All':
-        comp_ids = [cid for cid in comp_ids if cid.endswith(year)]
-
-    print(len(comp_ids))
-
-    competitors = {}
+    comps = results_df.drop_duplicates('Competition')
+    comp_ids = comps['Competition'].tolist()
+    comp_years = comps['CompDate'].dt.year.fillna(0).astype(int).to_numpy()
 
-    for comp in comp_ids:
-        results = fetch_names_from_comp(comp)
-        # add names to competitors dict
-        for name in results:
-            competitors[name] = competitors.get(name, 0) + 1
-        print(f"Processed competition {comp}, total competitors so far: {len(competitors)}")
-    # Convertir a DataFrame ordenado (Exactamente como lo tenías)
-    df_final = pd.DataFrame(list(competitors.items()), columns=['Name', 'Count'])
-    df_final = df_final.sort_values(by='Count', ascending=False).reset_index(drop=True)
+    done = 0
+    done_lock = threading.Lock()
 
-    return df_final
+    def fetch(comp):
+        nonlocal done
+        res = fetch_people_from_comp(comp.strip())
+        if progress is not None:
+            with done_lock:
+                done += 1
+                progress(done, len(comp_ids))
+        return res
 
-pause_lock = threading.Lock()
-
-# Bloqueo global
-pause_lock = threading.Lock()
+    # Pocos workers: la sesión compartida ya reintenta con espera los 429/5xx
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        people_per_comp = list(executor.map(fetch, comp_ids))
 
-def get_wca_neighbours(wca_id, year='All'):
-    results_df = get_wca_results(wca_id)
-    if results_df.empty:
+    sizes = np.array([len(ids) for ids in people_per_comp])
+    if sizes.sum() == 0:
         return pd.DataFrame()
 
-    comp_ids = results_df['Competition'].unique()
-    year = str(year)
-    
-    if year and year != 'All':
-        comp_ids = [cid for cid in comp_ids if cid.endswith(year)]
-
-    def process_single_comp(comp):
-        comp = comp.strip()
-        
-        # 1. ENTRADA: Todos los hilos deben pasar por aquí. 
-        # Si uno está durmiendo (bloqueando el lock), los demás se quedan parados aquí.
-        with pause_lock:
-            # Una vez que consiguen entrar (porque el bloqueo se liberó), 
-            # hacemos la petición normal.
-            res = fetch_names_from_comp(comp)
-        
-        # 2. EVALUACIÓN: Si falla, bloqueamos a todos otra vez para la siesta
-        if not res or len(res) == 0:
-            with pause_lock:
-                # Volvemos a comprobar por si otro hilo ya lo arregló mientras esperábamos
-                res = fetch_names_from_comp(comp)
-                
-                if not res or len(res) == 0:
-                    print(f"🛑 0 names in {comp}. RELAXING API (6s sleep)...")
-                    time.sleep(6) # Aquí es donde el programa se relaja de verdad
-                    
-                    print(f"🔄 Triggering WCIF rescue for {comp}...")
-                    res = fetch_names_from_wcif(comp)
-            
-        if res and len(res) > 0:
-            print(f"✅ {comp}: {len(res)} names")
-        else:
-            print(f"❌ {comp}: Final 0 names")
-            
-        return res if res else []
-
-    all_names = []
+    years, year_idx = np.unique(comp_years, return_inverse=True)
+    all_ids = np.concatenate(people_per_comp)
+    person_ids, person_idx = np.unique(all_ids, return_inverse=True)
+    # Un único bincount sobre (persona, año) aplanado
+    flat = person_idx * len(years) + np.repeat(year_idx, sizes)
+    counts = np.bincount(flat, minlength=len(person_ids) * len(years)).reshape(len(person_ids), len(years))
+
+    keys = [PERSON_KEYS[pid] for pid in person_ids]
+    matrix = pd.DataFrame(counts, columns=years.tolist())
+    matrix.insert(0, 'PersonId', person_ids)
+    matrix.insert(1, 'WcaId', [key if is_wca_id(key) else None for key in keys])
+    matrix.insert(2, 'Name', [PERSON_NAMES[pid] for pid in person_ids])
+    matrix = matrix[matrix['WcaId'] != wca_id]
+    order = np.argsort(-counts.sum(axis=1)[matrix.index.to_numpy()], kind='stable')
+    return matrix.iloc[order].reset_index(drop=True)
+
+def neighbours_for_year(matrix, year='All'):
+    """De la matriz de get_neighbour_matrix a la tabla PersonId, WcaId, Name, Count de un año (o 'All')."""
+    if matrix.empty:
+        return pd.DataFrame()
+    year_columns = [c for c in matrix.columns if isinstance(c, (int, np.integer))]
+    if str(year) == 'All':
+        counts = matrix[year_columns].sum(axis=1)
+    elif int(year) in year_columns:
+        counts = matrix[int(year)]
+    else:
+        return pd.DataFrame()
+    df = matrix[['PersonId', 'WcaId', 'Name']].assign(Count=counts)
+    df = df[df['Count'] > 0]
+    return df.sort_values(by='Count', ascending=False, kind='stable').reset_index(drop=True)
 
-    # Bajamos a 3 workers. Con 4 o más, a veces las ráfagas son demasiado rápidas 
-    # y el bloqueo no llega a tiempo para frenar la siguiente petición.
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        list_of_results = list(executor.map(process_single_comp, comp_ids))
-    
-    for names in list_of_results:
-        all_names.extend(names)
+def get_wca_neighbours(wca_id, year='All', results_df=None):
+    """Vecinos de `wca_id` en un año (o 'All'). `results_df` evita volver a pedir sus resultados."""
+    return neighbours_for_year(get_neighbour_matrix(wca_id, results_df=results_df), year)
 
-    if not all_names:
+def count_neighbours(people_per_comp, exclude=None):
+    """
+    Cuenta en cuántas de las competiciones (arrays de ids de intern_people) aparece cada persona.
+    Devuelve un DataFrame PersonId, WcaId (None si aún no tenía), Name, Count ordenado por Count,
+    sin la persona `exclude` (WCA ID).
+    """
+    arrays = [ids for ids in people_per_comp if len(ids)]
+    if not arrays:
         return pd.DataFrame()
 
-    competitors = {}
-    for name in all_names:
-        competitors[name] = competitors.get(name, 0) + 1
-        
-    df_final = pd.DataFrame(list(competitors.items()), columns=['Name', 'Count'])
-    return df_final.sort_values(by='Count', ascending=False).reset_index(drop=True)
+    counts = np.bincount(np.concatenate(arrays))
+    person_ids = np.flatnonzero(counts)
+    keys = [PERSON_KEYS[pid] for pid in person_ids]
+    df = pd.DataFrame({
+        'PersonId': person_ids,
+        'WcaId': [key if is_wca_id(key) else None for key in keys],
+        'Name': [PERSON_NAMES[pid] for pid in person_ids],
+        'Count': counts[person_ids],
+    })
+    if exclude:
+        df = df[df['WcaId'] != exclude]
+    return df.sort_values(by='Count', ascending=False, kind='stable').reset_index(drop=True)
 
 def get_scrambles(comp_id):
     """
@@ -515,14 +885,11 @@ def get_scrambles(comp_id):
     }
     """
     url = f"https://www.worldcubeassociation.org/api/v0/competitions/{comp_id}/scrambles"
-    raw_data = fetch_json(url)
-    
-    if not raw_data:
-        return {}
 
     structured_data = {}
 
-    for item in raw_data:
+    # En streaming: en un campeonato son miles de scrambles y solo guardamos 4 campos de cada uno
+    for item in iter_json_items(url, 'item'):
         ev_id = item['event_id']
         rnd_id = item['round_type_id']
         grp_id = item['group_id']
@@ -551,47 +918,71 @@ def get_scrambles(comp_id):
                 # Ordena por (es_extra, numero). False(0) va antes que True(1)
                 structured_data[ev][rnd][grp].sort(key=lambda x: (x['is_extra'], x['num']))
 
+    # Se van añadiendo al índice de búsqueda según se consultan competiciones
+    scramble_index.add_competition(comp_id, structured_data)
+
     return structured_data
 
-def get_organized_competitions(name_to_search):
+# Páginas del listado completo de competiciones (el snippet original iteraba 18; 20 por seguridad)
+COMPETITION_PAGE_URL = "https://raw.githubusercontent.com/robiningelbrecht/wca-rest-api/master/api/competitions-page-{page}.json"
+COMPETITION_PAGES = range(1, 21)
+
+def get_all_competitions(keep=None, progress=None):
     """
-    Busca todas las competiciones donde 'name_to_search' aparece como organizador.
-    Descarga en paralelo las páginas de la API para mayor velocidad.
+    Devuelve la lista de todas las competiciones (items de las páginas
+    competitions-page-{i}.json). Descarga las páginas en paralelo.
+    Con `keep` (función competición -> bool) solo se guardan las que pasan el filtro,
+    que se aplica según se va leyendo cada página.
+    `progress(hechas, total)` se llama tras cada página.
     """
-    all_competitions = []
+    # Usamos ThreadPoolExecutor para hacer las peticiones en paralelo.
+    pages_to_check = COMPETITION_PAGES
+    done = 0
+    done_lock = threading.Lock()
 
     # Función auxiliar para descargar una página específica
     def fetch_page(i):
-        url = f"https://raw.githubusercontent.com/robiningelbrecht/wca-rest-api/master/api/competitions-page-{i}.json"
-        return fetch_json(url)
-
-    # El snippet original iteraba 18 páginas. Ponemos 20 por seguridad.
-    # Usamos ThreadPoolExecutor para hacer las peticiones en paralelo.
-    pages_to_check = range(1, 21)
+        nonlocal done
+        url = COMPETITION_PAGE_URL.format(page=i)
+        page = [comp for comp in iter_json_items(url, 'items.item') if keep is None or keep(comp)]
+        if progress is not None:
+            with done_lock:
+                done += 1
+                progress(done, len(pages_to_check))
+        return page
     
     results = []
     # Reutilizamos la lógica de threads para velocidad
     with ThreadPoolExecutor(max_workers=10) as executor:
         results = list(executor.map(fetch_page, pages_to_check))
 
-    for data in results:
-        if data and 'items' in data:
-            for competition in data['items']:
-                # Extraemos los nombres de los organizadores
-                organisers_names = [org["name"] for org in competition.get("organisers", [])]
-                
-                # Verificamos si el nombre está en la lista
-                if name_to_search in organisers_names:
-                    comp_data = {
-                        "Nombre": competition.get("name"),
-                        "id": competition.get("id"),
-                        "city": competition.get("city"),
-                        "country": competition.get("country"),
-                        "date_start": competition.get("date", {}).get("from"),
-                        "date_end": competition.get("date", {}).get("till"),
-                        "no_days": competition.get("date", {}).get("numberOfDays")
-                    }
-                    all_competitions.append(comp_data)
+    competitions = []
+    for page in results:
+        competitions.extend(page)
+    return competitions
+
+def get_organized_competitions(name_to_search, progress=None):
+    """
+    Busca todas las competiciones donde 'name_to_search' aparece como organizador.
+    Descarga en paralelo las páginas de la API para mayor velocidad.
+    """
+    all_competitions = []
+
+    def organised_by(competition):
+        # Verificamos si el nombre está en la lista de organizadores
+        return any(org["name"] == name_to_search for org in competition.get("organisers", []))
+
+    for competition in get_all_competitions(keep=organised_by, progress=progress):
+        comp_data = {
+            "Nombre": competition.get("name"),
+            "id": competition.get("id"),
+            "city": competition.get("city"),
+            "country": competition.get("country"),
+            "date_start": competition.get("date", {}).get("from"),
+            "date_end": competition.get("date", {}).get("till"),
+            "no_days": competition.get("date", {}).get("numberOfDays")
+        }
+        all_competitions.append(comp_data)
 
     df = pd.DataFrame(all_competitions)
 
@@ -609,6 +1000,35 @@ def get_organized_competitions(name_to_search):
 
     return df
 
+def load_profile(wca_id):
+    """
+    Carga todo lo que necesita la app para un perfil (resultados, info, PRs y mapa).
+    Lo usan tanto la app de Streamlit como el CLI, así comparten las mismas cachés.
+    Devuelve None si la persona no tiene resultados.
+    """
+    results = get_wca_results(wca_id)
+    if results.empty: return None
+
+    info = get_wcaid_info(wca_id)
+    prs_dict = prs_info(wca_id, results_df=results)
+    stats_prs = number_of_prs(wca_id, results_df=results)
+    map_data = list(generate_map_data(wca_id, results_df=results))
+    progression = get_pb_progression(results)
+    yearly_bests = get_yearly_bests(results)
+    activity = get_activity_index(results)
+
+    return {
+        "wca_id": wca_id,
+        "info": info,
+        "results": results,
+        "prs_dict": prs_dict,
+        "stats_prs": stats_prs,
+        "map_data": map_data,
+        "progression": progression,
+        "yearly_bests": yearly_bests,
+        "activity": activity
+    }
+
 # rapido para probar la funcion de info
 if __name__ == "__main__":
     wcaid = "2016LOPE37"
@@ -0,0 +1,225 @@
+"""
+Head-to-head y podios a partir de los resultados completos de cada competición.
+
+Los resultados de cada competición (endpoint /competitions/{id}/results de la WCA)
+se guardan en una tabla SQLite local con índices por persona y por ronda, así
+"¿a quién gano más veces?", podios o el puesto dentro de cada ronda son
+consultas SQL sobre cientos de competiciones compartidas, sin volver a la API.
+
+La base vive junto a la caché de disco (CACHE_DIR/head_to_head.sqlite) y la
+comparten los procesos de la app y del CLI (modo WAL).
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import disk_cache
+import functions as fn
+
+DB_PATH = os.path.join(disk_cache.CACHE_DIR, "head_to_head.sqlite")
+RESULTS_URL = "https://www.worldcubeassociation.org/api/v0/competitions/{comp_id}/results"
+# Una competición que aún no había terminado al descargarla se vuelve a pedir pasado este tiempo
+OPEN_COMPETITION_TTL = 3600
+# Días tras el final de una competición en los que sus resultados aún pueden corregirse
+SETTLE_DAYS = 7
+FINAL_ROUNDS = ("f", "c")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    competition_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    round_type_id TEXT NOT NULL,
+    wca_id TEXT NOT NULL,
+    name TEXT,
+    pos INTEGER,
+    best INTEGER,
+    average INTEGER,
+    PRIMARY KEY (wca_id, competition_id, event_id, round_type_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_by_round ON results (competition_id, event_id, round_type_id, pos);
+CREATE TABLE IF NOT EXISTS competitions (
+    competition_id TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    settled INTEGER NOT NULL
+);
+"""
+
+_conn = None
+_lock = threading.RLock()  # get_db() se llama con el lock ya tomado
+
+
+def get_db():
+    """Conexión compartida (una por proceso), protegida con _lock."""
+    global _conn
+    if _conn is None:
+        with _lock:
+            if _conn is None:
+                os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+                conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                _conn = conn
+    return _conn
+
+
+def _query(sql, params=()):
+    with _lock:
+        return pd.read_sql_query(sql, get_db(), params=params)
+
+
+def _is_settled(comp_id):
+    comp = fn.get_comp_data(comp_id)
+    if comp is None or not comp.date_till:
+        return False
+    end = pd.Timestamp(comp.date_till)
+    return pd.Timestamp.now() - end > pd.Timedelta(days=SETTLE_DAYS)
+
+
+def _download(comp_id):
+    """Filas (competición, evento, ronda, wca_id, nombre, puesto, best, average) de una competición."""
+    url = RESULTS_URL.format(comp_id=comp_id)
+    rows = [
+        (comp_id, r["event_id"], r["round_type_id"], r["wca_id"], r.get("name"),
+         r.get("pos"), r.get("best"), r.get("average"))
+        for r in fn.iter_json_items(url, "item")
+        if r.get("wca_id")
+    ]
+    return rows, _is_settled(comp_id)
+
+
+def pending_competitions(comp_ids):
+    """Competiciones de `comp_ids` que faltan en la base (o no habían terminado y ya caducaron)."""
+    comp_ids = list(dict.fromkeys(comp_ids))
+    if not comp_ids:
+        return []
+    with _lock:
+        known = dict(get_db().execute(
+            f"SELECT competition_id, settled OR fetched_at > ? FROM competitions "
+            f"WHERE competition_id IN ({','.join('?' * len(comp_ids))})",
+            (time.time() - OPEN_COMPETITION_TTL, *comp_ids),
+        ).fetchall())
+    return [cid for cid in comp_ids if not known.get(cid)]
+
+
+def load_competitions(comp_ids, workers=8, progress=None):
+    """
+    Descarga (en paralelo) los resultados de las competiciones que falten y los guarda.
+    `progress(hechas, total)` se llama tras cada una. Devuelve cuántas se cargaron.
+    """
+    pending = pending_competitions(comp_ids)
+    if not pending:
+        return 0
+
+    loaded = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for done, (comp_id, (rows, settled)) in enumerate(
+            zip(pending, executor.map(_download, pending)), start=1
+        ):
+            if rows:
+                with _lock:
+                    db = get_db()
+                    with db:  # una transacción por competición
+                        db.execute("DELETE FROM results WHERE competition_id = ?", (comp_id,))
+                        db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                        db.execute(
+                            "INSERT OR REPLACE INTO competitions VALUES (?, ?, ?)",
+                            (comp_id, time.time(), int(settled)),
+                        )
+                loaded += 1
+            if progress is not None:
+                progress(done, len(pending))
+    return loaded
+
+
+def load_for_profile(results_df, **kwargs):
+    """Carga las competiciones en las que ha participado la persona del DataFrame de resultados."""
+    return load_competitions(results_df["Competition"].unique(), **kwargs)
+
+
+def head_to_head(wca_id, min_rounds=1):
+    """
+    Una fila por rival con el que se ha coincidido en alguna ronda: rondas compartidas,
+    victorias / derrotas / empates (por puesto en la ronda), competiciones y % de victorias.
+    """
+    df = _query(
+        """
+        SELECT o.wca_id AS rival_id, MAX(o.name) AS Name,
+               COUNT(*) AS Rounds,
+               SUM(m.pos < o.pos) AS Wins,
+               SUM(m.pos > o.pos) AS Losses,
+               SUM(m.pos = o.pos) AS Ties,
+               COUNT(DISTINCT m.competition_id) AS Competitions
+        FROM results m
+        JOIN results o
+          ON o.competition_id = m.competition_id
+         AND o.event_id = m.event_id
+         AND o.round_type_id = m.round_type_id
+         AND o.wca_id != m.wca_id
+        WHERE m.wca_id = ? AND m.pos > 0 AND o.pos > 0
+        GROUP BY o.wca_id
+        HAVING COUNT(*) >= ?
+        ORDER BY Rounds DESC, Wins DESC
+        """,
+        (wca_id, min_rounds),
+    )
+    df["WinRate"] = df["Wins"] / df["Rounds"]
+    return df
+
+
+def rivalry(wca_id, rival_id):
+    """Detalle de las rondas compartidas con un rival: puestos y resultados de ambos."""
+    return _query(
+        """
+        SELECT m.competition_id AS Competition, m.event_id AS Event, m.round_type_id AS Round,
+               m.pos AS MyPos, o.pos AS RivalPos,
+               m.best AS MyBest, o.best AS RivalBest,
+               m.average AS MyAverage, o.average AS RivalAverage
+        FROM results m
+        JOIN results o
+          ON o.competition_id = m.competition_id
+         AND o.event_id = m.event_id
+         AND o.round_type_id = m.round_type_id
+        WHERE m.wca_id = ? AND o.wca_id = ?
+        ORDER BY m.competition_id, m.event_id
+        """,
+        (wca_id, rival_id),
+    )
+
+
+def podiums(wca_id):
+    """Podios en finales (puesto 1-3 con resultado válido): una fila por competición y evento."""
+    return _query(
+        f"""
+        SELECT competition_id AS Competition, event_id AS Event, pos AS Place, best AS Best, average AS Average
+        FROM results
+        WHERE wca_id = ? AND round_type_id IN ({','.join('?' * len(FINAL_ROUNDS))})
+          AND pos BETWEEN 1 AND 3 AND best > 0
+        ORDER BY competition_id
+        """,
+        (wca_id, *FINAL_ROUNDS),
+    )
+
+
+def round_ranks(wca_id):
+    """Puesto en cada ronda disputada y nº de competidores de la ronda (y el percentil resultante)."""
+    df = _query(
+        """
+        SELECT m.competition_id AS Competition, m.event_id AS Event, m.round_type_id AS Round,
+               m.pos AS Pos, COUNT(o.wca_id) AS Competitors
+        FROM results m
+        JOIN results o
+          ON o.competition_id = m.competition_id
+         AND o.event_id = m.event_id
+         AND o.round_type_id = m.round_type_id
+        WHERE m.wca_id = ?
+        GROUP BY m.competition_id, m.event_id, m.round_type_id
+        """,
+        (wca_id,),
+    )
+    df["TopPercent"] = 100.0 * df["Pos"] / df["Competitors"]
+    return df
@@ -0,0 +1,222 @@
+"""
+Capa HTTP compartida: sesión con pool y reintentos + caché HTTP en disco.
+
+Todas las descargas de functions.py pasan por aquí (vía fetch_json):
+
+- Sesión única con pool de conexiones, User-Agent (la WCA bloquea peticiones sin él)
+  y política de reintentos con backoff para errores de red, 429 y 5xx.
+- Frescura: Cache-Control max-age de la respuesta si lo trae; si no, el TTL
+  heurístico que pase el llamador. no-store no se guarda.
+- Revalidación: una entrada caducada con ETag/Last-Modified se pide con
+  If-None-Match/If-Modified-Since; un 304 solo renueva la entrada (sin cuerpo).
+- Si la red falla y hay copia caducada, se sirve la copia (mejor viejo que nada).
+- iter_json_items recorre listas grandes (páginas de competiciones, scrambles,
+  personas del WCIF) elemento a elemento con ijson, sin cargar el documento
+  entero en memoria. ijson es opcional: sin él se parsea todo de golpe.
+"""
+
+import json
+import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import disk_cache
+
+try:
+    import ijson
+except ImportError:  # dependencia opcional
+    ijson = None
+
+USER_AGENT = "MyCubingApp/1.0 (streamlit_app_viewer)"
+TIMEOUT = 20
+CHUNK_SIZE = 64 * 1024
+
+retry_policy = Retry(
+    total=3,
+    connect=3,
+    read=2,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["GET", "HEAD"]),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+session = requests.Session()
+session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"})
+adapter = HTTPAdapter(pool_connections=100, pool_maxsize=100, max_retries=retry_policy)
+session.mount("https://", adapter)
+session.mount("http://", adapter)
+
+_stats_lock = threading.Lock()
+STATS = {"fresh_hits": 0, "revalidated": 0, "downloads": 0, "stale_served": 0, "errors": 0}
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _count(key):
+    with _stats_lock:
+        STATS[key] += 1
+
+
+def _cache_control(headers):
+    value = headers.get("Cache-Control", "").lower()
+    match = _MAX_AGE_RE.search(value)
+    return ("no-store" in value), (int(match.group(1)) if match else None)
+
+
+def _meta_from_response(response, ttl):
+    no_store, max_age = _cache_control(response.headers)
+    return no_store, {
+        "fetched_at": time.time(),
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        # El max-age del servidor manda; si no hay, usamos el TTL heurístico
+        "max_age": max_age if max_age is not None else ttl,
+    }
+
+
+def is_fresh(meta):
+    return meta is not None and time.time() - meta.get("fetched_at", 0) <= meta.get("max_age", 0)
+
+
+def cached_is_fresh(url):
+    """True si hay una copia fresca de `url` en la caché de disco."""
+    return is_fresh(disk_cache.get_meta(url))
+
+
+def _conditional_headers(meta):
+    headers = {}
+    if meta and meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta and meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def request(url, ttl, use_cache=True, stream=False):
+    """
+    Hace el GET de `url` aplicando la caché. Devuelve una tupla (estado, valor):
+
+    - ("cached", meta): hay copia válida en disco (fresca o revalidada con 304).
+    - ("response", response): respuesta 200 nueva (aún sin leer si stream=True).
+    - ("missing", None): 404.
+    - ("error", meta_o_None): fallo de red/HTTP; meta si hay copia caducada que servir.
+    """
+    meta = disk_cache.get_meta(url) if use_cache else None
+    if is_fresh(meta):
+        _count("fresh_hits")
+        return "cached", meta
+
+    try:
+        response = session.get(url, headers=_conditional_headers(meta), timeout=TIMEOUT, stream=stream)
+        if response.status_code == 304 and meta is not None:
+            response.close()
+            _, new_meta = _meta_from_response(response, meta.get("max_age", ttl))
+            # Un 304 puede no repetir los validadores: conservamos los que teníamos
+            new_meta["etag"] = new_meta["etag"] or meta.get("etag")
+            new_meta["last_modified"] = new_meta["last_modified"] or meta.get("last_modified")
+            disk_cache.update_meta(url, **new_meta)
+            _count("revalidated")
+            return "cached", new_meta
+        if response.status_code == 404:
+            response.close()
+            return "missing", None
+        response.raise_for_status()
+        _count("downloads")
+        return "response", response
+    except Exception:
+        _count("errors")
+        if meta is not None:
+            _count("stale_served")
+        return "error", meta
+
+
+def store(url, response, ttl, body=None):
+    """Guarda en disco la respuesta (si sus cabeceras lo permiten)."""
+    no_store, meta = _meta_from_response(response, ttl)
+    if not no_store:
+        disk_cache.put(url, meta, response.content if body is None else body)
+
+
+def get_json(url, ttl, use_cache=True):
+    """JSON de `url` pasando por la caché HTTP. None si 404 o error sin copia."""
+    status, value = request(url, ttl, use_cache=use_cache)
+    if status == "response":
+        try:
+            body = value.content
+            data = json.loads(body)
+        except (requests.RequestException, ValueError):
+            _count("errors")
+            return None
+        if use_cache:
+            store(url, value, ttl, body=body)
+        return data
+    if status in ("cached", "error") and value is not None:
+        entry = disk_cache.get(url)
+        return entry[1] if entry else None
+    return None
+
+
+def _items_at(data, prefix):
+    """Elementos de `data` en la ruta de ijson `prefix` ('items.item', 'persons.item', 'item')."""
+    node = data
+    for key in prefix.split(".")[:-1]:
+        node = node.get(key) if isinstance(node, dict) else None
+    return node if isinstance(node, list) else []
+
+
+def iter_json_items(url, ttl, prefix, use_cache=True):
+    """
+    Genera uno a uno los elementos de la lista que hay en `prefix` dentro del JSON de `url`
+    (ruta al estilo ijson: 'item' si el documento es una lista, 'items.item' si es {"items": [...]}).
+
+    La respuesta se vuelca por trozos a la caché de disco y se parsea en streaming desde
+    allí, así la memoria no depende del tamaño del documento. Sin ijson, parsea entero.
+    """
+    if ijson is None:
+        yield from _items_at(get_json(url, ttl, use_cache=use_cache), prefix)
+        return
+
+    status, value = request(url, ttl, use_cache=use_cache, stream=True)
+    if status == "response":
+        response = value
+        no_store, meta = _meta_from_response(response, ttl)
+        if not (use_cache and disk_cache.ENABLED and not no_store):
+            # Nada que guardar: parseamos directamente del socket
+            response.raw.decode_content = True
+            with response:
+                try:
+                    yield from ijson.items(response.raw, prefix, use_float=True)
+                except (ijson.JSONError, requests.RequestException):
+                    _count("errors")
+            return
+        with response:
+            try:
+                stored = disk_cache.put_stream(url, meta, response.iter_content(CHUNK_SIZE))
+            except requests.RequestException:
+                # Se cortó la descarga: si había copia anterior sigue en disco, intacta
+                _count("errors")
+                stored, meta = None, disk_cache.get_meta(url)
+        if stored is False:
+            # El disco falló a mitad: repetimos sin caché
+            yield from iter_json_items(url, ttl, prefix, use_cache=False)
+            return
+        value = meta
+
+    if value is None:
+        return
+    entry = disk_cache.open_body(url)
+    if entry is None:
+        return
+    _, f = entry
+    with f:
+        try:
+            yield from ijson.items(f, prefix, use_float=True)
+        except ijson.JSONError:
+            # Cuerpo corrupto o truncado: nos quedamos con lo leído hasta ahí
+            _count("errors")
@@ -0,0 +1,95 @@
+"""
+Trabajos en segundo plano para las pestañas lentas (vecinos, competiciones organizadas...).
+
+Streamlit vuelve a ejecutar el script en cada interacción: si el cálculo va dentro
+del script, cambiar de pestaña lo tira a la basura. Aquí cada trabajo corre en un
+hilo del proceso, identificado por (tarea, WCA ID, parámetros), así que sigue
+calculando aunque la página se recargue, informa de su progreso (hechas / total)
+y su resultado queda guardado para todas las sesiones durante RESULT_TTL.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 4
+RESULT_TTL = 3600  # segundos que se conserva un resultado terminado
+
+_jobs = {}
+_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="mycubing-job")
+
+
+class Job:
+    """Estado de un trabajo: 'running', 'done' o 'error', progreso y resultado."""
+
+    def __init__(self, key):
+        self.key = key
+        self.status = "running"
+        self.done = 0
+        self.total = None
+        self.result = None
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+
+    @property
+    def running(self):
+        return self.status == "running"
+
+    @property
+    def fraction(self):
+        """Progreso entre 0 y 1 (0 mientras no se sabe el total)."""
+        return self.done / self.total if self.total else 0.0
+
+    def progress(self, done, total):
+        """Callback de progreso que reciben las funciones lanzadas con submit."""
+        self.done, self.total = done, total
+
+    def expired(self):
+        return self.finished_at is not None and time.time() - self.finished_at > RESULT_TTL
+
+
+def job_key(task, wca_id, params=None):
+    return (task, wca_id, tuple(sorted((params or {}).items())))
+
+
+def get(task, wca_id, params=None):
+    """El trabajo (en curso o terminado y vigente) de esa tarea, o None."""
+    job = _jobs.get(job_key(task, wca_id, params))
+    if job is not None and job.expired():
+        return None
+    return job
+
+
+def submit(task, wca_id, func, *args, params=None, **kwargs):
+    """
+    Lanza func(*args, progress=job.progress, **kwargs) en segundo plano, salvo que ya haya
+    un trabajo igual en curso o terminado (entonces devuelve ese). Los fallidos se relanzan.
+    """
+    key = job_key(task, wca_id, params)
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None and job.status != "error" and not job.expired():
+            return job
+        _prune()
+        job = _jobs[key] = Job(key)
+    _executor.submit(_run, job, func, args, kwargs)
+    return job
+
+
+def _run(job, func, args, kwargs):
+    try:
+        job.result = func(*args, progress=job.progress, **kwargs)
+        job.status = "done"
+    except Exception as e:
+        job.error = e
+        job.status = "error"
+    finally:
+        job.finished_at = time.time()
+
+
+def _prune():
+    # Se llama con _lock tomado: olvida los resultados caducados
+    for key in [key for key, job in _jobs.items() if job.expired()]:
+        del _jobs[key]
@@ -0,0 +1,95 @@
+"""
+Caché en memoria acotada, con expulsión LRU y estadísticas.
+
+Para las cachés de proceso que antes eran diccionarios que crecían sin límite
+(una réplica de Streamlit vive días y va acumulando todo lo que se ha visto).
+Limita por nº de entradas y por bytes aproximados, y cuenta aciertos y fallos
+para poder ver si el tamaño está bien elegido.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+
+def approx_size(value):
+    """Bytes aproximados de `value` (objeto + sus atributos/elementos de primer nivel)."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        items = list(value.keys()) + list(value.values())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = value
+    elif hasattr(value, "__slots__"):
+        items = [getattr(value, name, None) for name in value.__slots__]
+    else:
+        items = ()
+    for item in items:
+        size += sys.getsizeof(item)
+        if isinstance(item, (list, tuple)):
+            size += sum(sys.getsizeof(x) for x in item)
+    return size
+
+
+class LRUCache:
+    """Diccionario con tope de entradas/bytes que expulsa lo menos usado recientemente. Seguro entre hilos."""
+
+    def __init__(self, max_entries, max_bytes=None, sizeof=approx_size):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._data = OrderedDict()  # clave -> (valor, bytes)
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._data[key] = (value, size)
+            self.bytes += size
+            while self._data and (
+                len(self._data) > self.max_entries
+                or (self.max_bytes is not None and self.bytes > self.max_bytes)
+            ):
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "evictions": self.evictions,
+        }
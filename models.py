@@ -0,0 +1,345 @@
+"""
+Modelos tipados de los datos de la WCA.
+
+Sustituyen a los diccionarios aplanados ("personal_records.333.single.world_rank")
+por dataclasses con __slots__: se parsean una vez y se consultan por atributo.
+"""
+
+import sys
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class PersonalRecord:
+    best: int
+    world_rank: int | None = None
+    continent_rank: int | None = None
+    country_rank: int | None = None
+
+    @classmethod
+    def from_json(cls, data):
+        if not data or not data.get("best"):
+            return None
+        return cls(
+            best=data["best"],
+            world_rank=data.get("world_rank"),
+            continent_rank=data.get("continent_rank"),
+            country_rank=data.get("country_rank"),
+        )
+
+
+@dataclass(slots=True)
+class EventRecords:
+    single: PersonalRecord | None = None
+    average: PersonalRecord | None = None
+
+
+@dataclass(slots=True)
+class Medals:
+    gold: int = 0
+    silver: int = 0
+    bronze: int = 0
+
+
+@dataclass(slots=True)
+class Records:
+    national: int = 0
+    continental: int = 0
+    world: int = 0
+
+
+@dataclass(slots=True)
+class Profile:
+    """
+    Perfil de una persona (endpoint /persons/{wca_id} de la WCA).
+
+    Los récords personales se parsean de forma perezosa: el JSON de cada evento se
+    convierte en EventRecords la primera vez que se pide con `pr()` o `records_for()`.
+    """
+    wca_id: str
+    name: str | None = None
+    country_iso2: str | None = None
+    gender: str | None = None
+    avatar_url: str | None = None
+    competition_count: int = 0
+    total_solves: int = 0
+    medals: Medals = field(default_factory=Medals)
+    records: Records = field(default_factory=Records)
+    _raw_prs: dict = field(default_factory=dict, repr=False)
+    _prs: dict = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_json(cls, wca_id, data):
+        """Construye el perfil desde el JSON de la API. Con `data` vacío devuelve un perfil vacío."""
+        if not data:
+            return cls(wca_id=wca_id)
+
+        person = data.get("person") or {}
+        medals = data.get("medals") or {}
+        records = data.get("records") or {}
+        return cls(
+            wca_id=person.get("wca_id") or wca_id,
+            name=person.get("name"),
+            country_iso2=(person.get("country") or {}).get("iso2") or person.get("country_iso2"),
+            gender=person.get("gender"),
+            avatar_url=(person.get("avatar") or {}).get("url"),
+            competition_count=data.get("competition_count") or 0,
+            total_solves=data.get("total_solves") or 0,
+            medals=Medals(medals.get("gold", 0), medals.get("silver", 0), medals.get("bronze", 0)),
+            records=Records(records.get("national", 0), records.get("continental", 0), records.get("world", 0)),
+            _raw_prs=data.get("personal_records") or {},
+        )
+
+    def to_json(self):
+        """JSON con la forma de la API (lo que lee from_json), para guardar el perfil (snapshot.py)."""
+        return {
+            "person": {
+                "wca_id": self.wca_id,
+                "name": self.name,
+                "country_iso2": self.country_iso2,
+                "gender": self.gender,
+                "avatar": {"url": self.avatar_url},
+            },
+            "competition_count": self.competition_count,
+            "total_solves": self.total_solves,
+            "medals": {"gold": self.medals.gold, "silver": self.medals.silver, "bronze": self.medals.bronze},
+            "records": {
+                "national": self.records.national,
+                "continental": self.records.continental,
+                "world": self.records.world,
+            },
+            "personal_records": self._raw_prs,
+        }
+
+    @property
+    def events(self):
+        """Eventos con algún récord personal."""
+        return list(self._raw_prs)
+
+    def records_for(self, event):
+        """EventRecords del evento (vacío si no tiene)."""
+        records = self._prs.get(event)
+        if records is None:
+            raw = self._raw_prs.get(event) or {}
+            records = EventRecords(
+                single=PersonalRecord.from_json(raw.get("single")),
+                average=PersonalRecord.from_json(raw.get("average")),
+            )
+            self._prs[event] = records
+        return records
+
+    def pr(self, event, kind="single"):
+        """PersonalRecord del evento y tipo ('single'/'average') o None."""
+        return getattr(self.records_for(event), kind)
+
+
+# --- WCIF público de una competición ---
+
+def parse_activity_code(code):
+    """'333-r1-g2' -> ('333', 1, 2). Las actividades sin evento ('other-lunch') dan (None, None, None)."""
+    parts = (code or "").split("-")
+    if not parts or parts[0] == "other":
+        return None, None, None
+    event_id, round_number, group_number = parts[0], None, None
+    for part in parts[1:]:
+        if part[:1] == "r" and part[1:].isdigit():
+            round_number = int(part[1:])
+        elif part[:1] == "g" and part[1:].isdigit():
+            group_number = int(part[1:])
+    return event_id, round_number, group_number
+
+
+@dataclass(slots=True)
+class WcifPerson:
+    registrant_id: int | None
+    name: str
+    wca_id: str | None = None
+    country_iso2: str | None = None
+    event_ids: tuple = ()
+    competing: bool = True
+
+
+@dataclass(slots=True)
+class WcifRound:
+    event_id: str
+    number: int
+    format: str | None = None
+    time_limit_cs: int | None = None
+    cumulative_limit: bool = False
+    cutoff_attempts: int | None = None
+    cutoff_cs: int | None = None
+    advancement_type: str | None = None
+    advancement_level: int | None = None
+    scramble_set_count: int = 0
+
+    @property
+    def code(self):
+        return f"{self.event_id}-r{self.number}"
+
+
+@dataclass(slots=True)
+class ScheduleActivity:
+    code: str
+    name: str
+    start: str
+    end: str
+    venue: str | None = None
+    room: str | None = None
+    event_id: str | None = None
+    round_number: int | None = None
+    group_number: int | None = None
+
+
+@dataclass(slots=True)
+class CompetitionWcif:
+    """
+    WCIF público de una competición, ya parseado y sin lo que la app no usa
+    (asignaciones, extensiones, resultados...): personas, rondas por evento y
+    el horario aplanado (rondas y grupos como actividades con su código).
+    """
+    id: str
+    name: str
+    start_date: str | None = None
+    number_of_days: int = 1
+    timezone: str | None = None
+    persons: list = field(default_factory=list)
+    rounds: dict = field(default_factory=dict)
+    activities: list = field(default_factory=list)
+
+    @classmethod
+    def from_json(cls, data):
+        """Construye el WCIF compacto desde el JSON de /wcif/public (None si no hay datos)."""
+        if not data:
+            return None
+
+        persons = []
+        for p in data.get("persons") or []:
+            registration = p.get("registration") or {}
+            persons.append(WcifPerson(
+                registrant_id=p.get("registrantId"),
+                name=p.get("name"),
+                wca_id=p.get("wcaId"),
+                country_iso2=p.get("countryIso2"),
+                event_ids=tuple(registration.get("eventIds") or ()),
+                # Sin registro (p. ej. solo staff) o no aceptado = no compite
+                competing=bool(registration) and registration.get("status", "accepted") == "accepted"
+                and registration.get("isCompeting", True),
+            ))
+
+        rounds = {}
+        for event in data.get("events") or []:
+            event_rounds = []
+            for number, r in enumerate(event.get("rounds") or [], start=1):
+                time_limit = r.get("timeLimit") or {}
+                cutoff = r.get("cutoff") or {}
+                advancement = r.get("advancementCondition") or {}
+                event_rounds.append(WcifRound(
+                    event_id=event["id"],
+                    number=parse_activity_code(r.get("id"))[1] or number,
+                    format=r.get("format"),
+                    time_limit_cs=time_limit.get("centiseconds"),
+                    cumulative_limit=bool(time_limit.get("cumulativeRoundIds")),
+                    cutoff_attempts=cutoff.get("numberOfAttempts"),
+                    cutoff_cs=cutoff.get("attemptResult"),
+                    advancement_type=advancement.get("type"),
+                    advancement_level=advancement.get("level"),
+                    scramble_set_count=r.get("scrambleSetCount") or 0,
+                ))
+            rounds[event["id"]] = event_rounds
+
+        schedule = data.get("schedule") or {}
+        activities = []
+        timezone = None
+
+        def add_activities(items, venue, room):
+            for a in items or []:
+                event_id, round_number, group_number = parse_activity_code(a.get("activityCode"))
+                activities.append(ScheduleActivity(
+                    code=a.get("activityCode"), name=a.get("name"),
+                    start=a.get("startTime"), end=a.get("endTime"),
+                    venue=venue, room=room,
+                    event_id=event_id, round_number=round_number, group_number=group_number,
+                ))
+                add_activities(a.get("childActivities"), venue, room)
+
+        for venue in schedule.get("venues") or []:
+            timezone = timezone or venue.get("timezone")
+            for room in venue.get("rooms") or []:
+                add_activities(room.get("activities"), venue.get("name"), room.get("name"))
+        activities.sort(key=lambda a: (a.start or "", a.code or ""))
+
+        return cls(
+            id=data.get("id"),
+            name=data.get("name") or data.get("id"),
+            start_date=schedule.get("startDate"),
+            number_of_days=schedule.get("numberOfDays") or 1,
+            timezone=timezone,
+            persons=persons,
+            rounds=rounds,
+            activities=activities,
+        )
+
+    def competitors(self):
+        return [p for p in self.persons if p.competing]
+
+    def competitor_names(self):
+        return [p.name for p in self.competitors()]
+
+    def rounds_for(self, event_id):
+        """Rondas del evento, en orden."""
+        return self.rounds.get(event_id, [])
+
+    def round_activities(self):
+        """Actividades de ronda (sin grupos) y las que no son de ningún evento (comidas, premios...)."""
+        return [a for a in self.activities if a.group_number is None]
+
+    def groups_for(self, event_id, round_number):
+        """Actividades de los grupos de una ronda, ordenadas por número de grupo."""
+        groups = [a for a in self.activities
+                  if a.event_id == event_id and a.round_number == round_number and a.group_number is not None]
+        return sorted(groups, key=lambda a: a.group_number)
+
+
+# --- Ficha de competición (lo que la app usa de /competitions/{id}.json) ---
+
+@dataclass(slots=True)
+class CompetitionSummary:
+    """
+    Proyección mínima de la ficha de una competición. Los textos repetidos entre
+    competiciones (país, ciudad, organizadores) se internan para no duplicarlos.
+    """
+    id: str
+    name: str
+    country: str | None = None
+    city: str | None = None
+    date_from: str | None = None
+    date_till: str | None = None
+    days: int = 1
+    lat: float | None = None
+    lon: float | None = None
+    organisers: tuple = ()
+
+    @classmethod
+    def from_json(cls, comp_id, data):
+        """Proyecta el JSON completo de la competición (None si no hay datos)."""
+        if not data:
+            return None
+        date = data.get("date") or {}
+        coords = (data.get("venue") or {}).get("coordinates") or {}
+        lat, lon = coords.get("latitude"), coords.get("longitude")
+        return cls(
+            id=data.get("id") or comp_id,
+            name=data.get("name") or comp_id,
+            country=_intern(data.get("country")),
+            city=_intern(data.get("city")),
+            date_from=date.get("from"),
+            date_till=date.get("till"),
+            days=date.get("numberOfDays") or 1,
+            lat=float(lat) if lat is not None else None,
+            lon=float(lon) if lon is not None else None,
+            organisers=tuple(_intern(o.get("name")) for o in data.get("organisers") or [] if o.get("name")),
+        )
+
+
+def _intern(text):
+    return sys.intern(text) if isinstance(text, str) else text
@@ -0,0 +1,111 @@
+"""
+Snapshot local de los rankings mundiales y motor de percentiles.
+
+Para cada (evento, 'single'/'average') se descarga una vez el ranking mundial
+(endpoints rank/world/{tipo}/{evento}.json de la wca-rest-api) y se guarda como
+dos arrays ordenados (mejor resultado y WCA ID) en un .npz en la carpeta de la
+caché de disco. Con eso, percentiles, "qué tiempo necesito para el puesto N" y
+rivales cercanos son búsquedas binarias (np.searchsorted), sin llamadas a la API.
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+
+import disk_cache
+import functions as fn
+
+RANK_URL = "https://raw.githubusercontent.com/robiningelbrecht/wca-rest-api/master/api/rank/world/{kind}/{event}.json"
+SNAPSHOT_DIR = os.path.join(disk_cache.CACHE_DIR, "rankings")
+SNAPSHOT_TTL = 24 * 3600  # el export de la WCA se actualiza a diario
+
+_SNAPSHOTS = {}
+_LOCK = threading.Lock()
+
+
+class RankingSnapshot:
+    """Ranking mundial de un evento y tipo: `bests` ordenado de mejor a peor y `person_ids` alineado."""
+
+    def __init__(self, bests, person_ids, fetched_at):
+        self.bests = bests
+        self.person_ids = person_ids
+        self.fetched_at = fetched_at
+
+    def __len__(self):
+        return len(self.bests)
+
+    def rank_of(self, value):
+        """Puesto mundial que tendría `value` (empates comparten puesto, como en la WCA)."""
+        return int(np.searchsorted(self.bests, value, side="left")) + 1
+
+    def top_percent(self, value):
+        """Porcentaje de gente rankeada que está por delante o empatada (1% = top 1%)."""
+        if len(self) == 0:
+            return None
+        return 100.0 * self.rank_of(value) / len(self)
+
+    def value_for_rank(self, rank):
+        """Resultado necesario para estar en el puesto `rank` (igualar al que lo ocupa ahora)."""
+        if len(self) == 0:
+            return None
+        rank = min(max(int(rank), 1), len(self))
+        return int(self.bests[rank - 1])
+
+    def rivals(self, value, k=5):
+        """Los `k` inmediatamente por delante y por detrás de `value`: lista de (puesto, wca_id, best)."""
+        pos = int(np.searchsorted(self.bests, value, side="left"))
+        lo, hi = max(pos - k, 0), min(pos + k + 1, len(self))
+        ranks = np.searchsorted(self.bests, self.bests[lo:hi], side="left") + 1
+        return list(zip(ranks.tolist(), self.person_ids[lo:hi].tolist(), self.bests[lo:hi].tolist()))
+
+
+def _snapshot_path(event, kind):
+    return os.path.join(SNAPSHOT_DIR, f"{kind}_{event}.npz")
+
+
+def _download(event, kind):
+    data = fn.fetch_json(RANK_URL.format(kind=kind, event=event), use_disk_cache=False)
+    items = data.get("items", []) if isinstance(data, dict) else (data or [])
+
+    bests = np.fromiter((item["best"] for item in items), dtype=np.int64, count=len(items))
+    person_ids = np.array([item["personId"] for item in items], dtype="U10")
+    order = np.argsort(bests, kind="stable")
+    return bests[order], person_ids[order]
+
+
+def _load(event, kind):
+    path = _snapshot_path(event, kind)
+    try:
+        if time.time() - os.path.getmtime(path) < SNAPSHOT_TTL:
+            with np.load(path) as npz:
+                return RankingSnapshot(npz["bests"], npz["person_ids"], os.path.getmtime(path))
+    except (OSError, ValueError, KeyError):
+        pass
+
+    bests, person_ids = _download(event, kind)
+    if len(bests):
+        try:
+            os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+            tmp = path + ".tmp.npz"
+            np.savez(tmp, bests=bests, person_ids=person_ids)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+    return RankingSnapshot(bests, person_ids, time.time())
+
+
+def get_snapshot(event, kind="single"):
+    """Snapshot del ranking mundial (se carga de disco o se descarga la primera vez)."""
+    key = (event, kind)
+    snapshot = _SNAPSHOTS.get(key)
+    if snapshot is None or time.time() - snapshot.fetched_at > SNAPSHOT_TTL:
+        with _LOCK:
+            snapshot = _SNAPSHOTS.get(key)
+            if snapshot is None or time.time() - snapshot.fetched_at > SNAPSHOT_TTL:
+                snapshot = _load(event, kind)
+                # Si la descarga falló no lo memorizamos: se reintenta en la próxima consulta
+                if len(snapshot):
+                    _SNAPSHOTS[key] = snapshot
+    return snapshot
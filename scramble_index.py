@@ -0,0 +1,220 @@
+"""
+Índice de búsqueda de scrambles de todas las competiciones vistas.
+
+Cada vez que get_scrambles descarga (o lee de caché) los scrambles de una
+competición, se añaden aquí: una tabla SQLite con (competición, evento, ronda,
+grupo, número) y un índice FTS5 de trigramas sobre el texto del scramble, así
+buscar "R U R' U'" dentro de miles de competiciones es una consulta que no
+recorre la tabla. Sin FTS5 (SQLite antiguo) se busca con instr() sobre la tabla.
+
+Los movimientos distinguen mayúsculas (r no es R), así que el índice también.
+La base vive junto a la caché de disco (CACHE_DIR/scrambles.sqlite), como la
+de head_to_head.py.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+import disk_cache
+
+DB_PATH = os.path.join(disk_cache.CACHE_DIR, "scrambles.sqlite")
+MIN_FTS_QUERY = 3  # los trigramas no sirven para buscar menos de 3 caracteres
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrambles (
+    id INTEGER PRIMARY KEY,  -- propio (el id de la WCA no hace falta): es el rowid del índice FTS
+    competition_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    round_type_id TEXT NOT NULL,
+    group_id TEXT NOT NULL,
+    num INTEGER,
+    is_extra INTEGER NOT NULL,
+    scramble TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scrambles_by_competition ON scrambles (competition_id);
+CREATE TABLE IF NOT EXISTS competitions (
+    competition_id TEXT PRIMARY KEY,
+    indexed_at REAL NOT NULL,
+    scrambles INTEGER NOT NULL
+);
+"""
+FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS scramble_text "
+    "USING fts5(scramble, tokenize='trigram case_sensitive 1')"
+)
+
+_conn = None
+_fts = False
+_lock = threading.RLock()
+_COMP_FROM_URL = re.compile(r"/competitions/([^/]+)/scrambles")
+
+
+def get_db():
+    """Conexión compartida (una por proceso), protegida con _lock."""
+    global _conn, _fts
+    if _conn is None:
+        with _lock:
+            if _conn is None:
+                os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+                conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                try:
+                    conn.execute(FTS_SCHEMA)
+                    _fts = True
+                except sqlite3.OperationalError:  # SQLite sin FTS5 o sin el tokenizador trigram
+                    _fts = False
+                _conn = conn
+    return _conn
+
+
+def normalize(scramble):
+    """Un solo espacio entre movimientos (los de megaminx vienen en varias líneas)."""
+    return " ".join(scramble.split())
+
+
+def is_indexed(comp_id):
+    with _lock:
+        row = get_db().execute(
+            "SELECT 1 FROM competitions WHERE competition_id = ?", (comp_id,)
+        ).fetchone()
+    return row is not None
+
+
+def _store(comp_id, rows):
+    """Sustituye los scrambles indexados de una competición por `rows`, en una transacción."""
+    with _lock:
+        db = get_db()
+        with db:
+            old = [r for (r,) in db.execute("SELECT id FROM scrambles WHERE competition_id = ?", (comp_id,))]
+            if old and _fts:
+                db.executemany("DELETE FROM scramble_text WHERE rowid = ?", [(r,) for r in old])
+            db.execute("DELETE FROM scrambles WHERE competition_id = ?", (comp_id,))
+            db.executemany(
+                "INSERT INTO scrambles (competition_id, event_id, round_type_id, group_id, num, is_extra, scramble) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if _fts:
+                db.execute(
+                    "INSERT INTO scramble_text (rowid, scramble) SELECT id, scramble FROM scrambles WHERE competition_id = ?",
+                    (comp_id,),
+                )
+            db.execute(
+                "INSERT OR REPLACE INTO competitions VALUES (?, ?, ?)", (comp_id, time.time(), len(rows))
+            )
+
+
+def add_competition(comp_id, scrambles):
+    """
+    Indexa los scrambles de una competición con la estructura de get_scrambles
+    ({evento: {ronda: {grupo: [scramble, ...]}}}). Si ya estaba indexada no hace nada.
+    """
+    if not scrambles:
+        return
+    try:
+        if is_indexed(comp_id):
+            return
+        rows = [
+            (comp_id, ev, rnd, grp, item["num"], int(bool(item["is_extra"])), normalize(item["scramble"]))
+            for ev, rounds in scrambles.items()
+            for rnd, groups in rounds.items()
+            for grp, items in groups.items()
+            for item in items
+        ]
+        _store(comp_id, rows)
+    except sqlite3.Error:
+        # El índice es un extra: si la base no se puede escribir, los scrambles se muestran igual
+        pass
+
+
+def index_cached(progress=None):
+    """
+    Indexa los scrambles que ya están en la caché de disco y aún no están en el índice
+    (sin tocar la red). `progress(hechas, total)` tras cada competición. Devuelve
+    (añadidas, fallidas): una competición que SQLite no deja escribir se salta y se cuenta.
+    """
+    pending = []
+    for url in disk_cache.urls("/scrambles"):
+        match = _COMP_FROM_URL.search(url)
+        if match and not is_indexed(match.group(1)):
+            pending.append((match.group(1), url))
+
+    added = failed = 0
+    for done, (comp_id, url) in enumerate(pending, start=1):
+        entry = disk_cache.get(url)
+        if entry is not None and isinstance(entry[1], list) and entry[1]:
+            rows = [
+                (comp_id, item["event_id"], item["round_type_id"], item["group_id"],
+                 item["scramble_num"], int(bool(item["is_extra"])), normalize(item["scramble"]))
+                for item in entry[1]
+            ]
+            try:
+                _store(comp_id, rows)
+                added += 1
+            except sqlite3.Error:
+                # Como en add_competition: una base bloqueada o llena no corta el resto
+                failed += 1
+        if progress is not None:
+            progress(done, len(pending))
+    return added, failed
+
+
+def search(query, event_id=None, whole_moves=True, starts_with=False, limit=500):
+    """
+    Scrambles que contienen la secuencia `query`. Con `whole_moves` solo cuentan
+    coincidencias de movimientos completos ("R U" no encuentra "R U2"), y con
+    `starts_with` solo las que empiezan el scramble. Una fila por scramble.
+    """
+    query = normalize(query)
+    columns = ["Competition", "Event", "Round", "Group", "Number", "IsExtra", "Scramble"]
+    if not query:
+        return pd.DataFrame(columns=columns)
+
+    get_db()  # fija _fts
+    if _fts and len(query) >= MIN_FTS_QUERY:
+        source = "scramble_text t JOIN scrambles s ON s.id = t.rowid WHERE scramble_text MATCH ?"
+        params = ['"' + query.replace('"', '""') + '"']
+    else:
+        source = "scrambles s WHERE instr(s.scramble, ?) > 0"
+        params = [query]
+    if whole_moves and starts_with:
+        # El límite de movimiento se mira en la posición 0: "R U" no vale para "R U2 ... R U ..."
+        source += " AND substr(' ' || s.scramble || ' ', 1, ?) = ?"
+        params += [len(query) + 2, f" {query} "]
+    elif whole_moves:
+        source += " AND instr(' ' || s.scramble || ' ', ?) > 0"
+        params.append(f" {query} ")
+    elif starts_with:
+        source += " AND substr(s.scramble, 1, ?) = ?"
+        params += [len(query), query]
+    if event_id:
+        source += " AND s.event_id = ?"
+        params.append(event_id)
+
+    with _lock:
+        return pd.read_sql_query(
+            f"""
+            SELECT s.competition_id AS Competition, s.event_id AS Event, s.round_type_id AS Round,
+                   s.group_id AS "Group", s.num AS Number, s.is_extra AS IsExtra, s.scramble AS Scramble
+            FROM {source}
+            ORDER BY s.competition_id, s.event_id, s.round_type_id, s.group_id, s.is_extra, s.num
+            LIMIT ?
+            """,
+            get_db(),
+            params=(*params, limit),
+        )
+
+
+def stats():
+    """Competiciones y scrambles indexados, por evento."""
+    with _lock:
+        db = get_db()
+        comps = db.execute("SELECT COUNT(*) FROM competitions").fetchone()[0]
+        by_event = dict(db.execute("SELECT event_id, COUNT(*) FROM scrambles GROUP BY event_id").fetchall())
+    return {"competitions": comps, "scrambles": sum(by_event.values()), "events": by_event, "fts": _fts}
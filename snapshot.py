@@ -0,0 +1,261 @@
+"""
+Snapshots de perfil: todo lo que calcula load_profile en un solo fichero.
+
+Abrir un perfil en una réplica nueva significa cientos de peticiones (resultados,
+ficha de cada competición...). Un snapshot guarda el perfil ya cargado (resultados,
+info, competiciones, PRs, mapa, progresión, actividad) para reabrirlo sin red:
+se puede descargar desde la app, generar con el CLI y copiar entre réplicas
+(MYCUBING_SNAPSHOT_DIR) o usar como datos de prueba.
+
+Formato del fichero (.mcsnap):
+
+    MAGIC (8 bytes) | longitud de la cabecera (8 bytes, little endian) | cabecera JSON
+    y después, alineadas a 64 bytes, las tablas como streams Arrow IPC (zstd).
+
+La cabecera lleva la versión, los datos pequeños en JSON (info, PRs, mapa) y el
+desplazamiento de cada tabla. Al leer se mapea el fichero en memoria y cada tabla
+se abre directamente sobre su trozo del mapa, sin leer el fichero entero a Python.
+Necesita pyarrow.
+
+Uso:
+    snapshot.save(profile, "2016LOPE37.mcsnap")
+    profile = snapshot.load("2016LOPE37.mcsnap")
+"""
+
+import dataclasses
+import json
+import os
+import struct
+import time
+
+import numpy as np
+import pandas as pd
+
+import batch
+import functions as fn
+from models import CompetitionSummary, Profile
+
+try:
+    import pyarrow as pa
+except ImportError:  # dependencia opcional
+    pa = None
+
+MAGIC = b"MCSNAP01"
+VERSION = 1
+SUFFIX = ".mcsnap"
+ALIGNMENT = 64
+SNAPSHOT_DIR = os.environ.get("MYCUBING_SNAPSHOT_DIR")
+
+
+class SnapshotError(ValueError):
+    """El fichero no es un snapshot válido (o es de otra versión)."""
+
+
+def _require_arrow():
+    if pa is None:
+        raise RuntimeError("Snapshots need pyarrow (pip install pyarrow).")
+
+
+# --- Perfil <-> tablas ---
+
+def _tables(profile):
+    """Las partes grandes del perfil como DataFrames planos (sin índices ni columnas no-string)."""
+    results = profile["results"]
+    competitions = fn.prefetch_competitions(results["Competition"].unique())
+    comps = pd.DataFrame([dataclasses.asdict(c) for c in competitions.values()])
+    if not comps.empty:
+        comps["organisers"] = comps["organisers"].map(list)
+
+    yearly_bests = profile["yearly_bests"].reset_index()
+    yearly_bests.columns = yearly_bests.columns.astype(str)
+
+    progression = pd.concat(
+        [pd.DataFrame({"Event": event, "Kind": kind, "dates": s["dates"], "values": s["values"]})
+         for (event, kind), s in profile["progression"].items()],
+        ignore_index=True,
+    ) if profile["progression"] else pd.DataFrame(columns=["Event", "Kind", "dates", "values"])
+
+    activity = profile["activity"]
+    return {
+        "results": results,
+        "competitions": comps,
+        "yearly_bests": yearly_bests,
+        "progression": progression,
+        "activity_comps": activity["comps"],
+        "activity_daily": activity["daily"].reset_index(),
+        "activity_monthly": activity["monthly"],
+        "activity_yearly": activity["yearly"],
+    }
+
+
+def _profile(header, tables):
+    """Reconstruye el dict de load_profile a partir de la cabecera y las tablas leídas."""
+    meta = header["meta"]
+
+    yearly_bests = tables["yearly_bests"]
+    if not yearly_bests.empty:
+        yearly_bests = yearly_bests.set_index(["Event", "Kind"])
+        yearly_bests.columns = yearly_bests.columns.astype(int).rename("Year")
+
+    progression = {
+        key: {"dates": group["dates"].to_numpy(), "values": group["values"].to_numpy(dtype=np.float32)}
+        for key, group in tables["progression"].groupby(["Event", "Kind"], sort=False)
+    }
+
+    daily = tables["activity_daily"]
+    if not daily.empty:
+        daily = daily.set_index("date")
+
+    return {
+        "wca_id": header["wca_id"],
+        "info": Profile.from_json(header["wca_id"], meta["info"]),
+        "results": tables["results"],
+        "prs_dict": {key: tuple(values) for key, values in meta["prs_dict"].items()},
+        "stats_prs": meta["stats_prs"],
+        "map_data": meta["map_data"],
+        "progression": progression,
+        "yearly_bests": yearly_bests,
+        "activity": {
+            "comps": tables["activity_comps"],
+            "daily": daily,
+            "monthly": tables["activity_monthly"],
+            "yearly": tables["activity_yearly"],
+        },
+    }
+
+
+def _restore_competitions(comps):
+    """Mete las fichas del snapshot en COMP_CACHE: las demás pestañas no las vuelven a pedir."""
+    for row in comps.to_dict("records"):
+        row = {k: (None if not isinstance(v, (list, np.ndarray)) and pd.isna(v) else v) for k, v in row.items()}
+        # Arrow devuelve la lista como ndarray: su valor de verdad es ambiguo con 0 o 2+ elementos
+        organisers = row.get("organisers")
+        row["organisers"] = tuple(organisers) if organisers is not None else ()
+        fn.COMP_CACHE.put(row["id"], CompetitionSummary(**row))
+
+
+# --- Escritura ---
+
+def _pad(n):
+    return (-n) % ALIGNMENT
+
+
+def dumps(profile):
+    """Serializa un perfil (el dict de load_profile) a bytes."""
+    _require_arrow()
+    encoded = {name: batch.encode_table(df) for name, df in _tables(profile).items()}
+
+    header = {
+        "version": VERSION,
+        "wca_id": profile["wca_id"],
+        "created_at": time.time(),
+        "meta": {
+            "info": profile["info"].to_json(),
+            "prs_dict": profile["prs_dict"],
+            "stats_prs": {k: int(v) for k, v in profile["stats_prs"].items()},
+            "map_data": profile["map_data"],
+        },
+        "tables": {},
+    }
+    # Desplazamientos relativos al inicio de las tablas; la cabecera se rellena con
+    # espacios para que ese inicio (y con él cada tabla) quede alineado
+    offset = 0
+    for name, (buffer, columns) in encoded.items():
+        header["tables"][name] = {"offset": offset, "length": buffer.size, "columns": columns}
+        offset += buffer.size + _pad(buffer.size)
+    header_bytes = json.dumps(header, separators=(",", ":"), default=str).encode("utf-8")
+    start = len(MAGIC) + 8 + len(header_bytes)
+    header_bytes += b" " * _pad(start)
+
+    parts = [MAGIC, struct.pack("<Q", len(header_bytes)), header_bytes]
+    for buffer, _ in encoded.values():
+        parts += [buffer.to_pybytes(), b"\0" * _pad(buffer.size)]
+    return b"".join(parts)
+
+
+def save(profile, path):
+    """Guarda el snapshot de un perfil en `path` (escritura atómica). Devuelve los bytes escritos."""
+    data = dumps(profile)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return len(data)
+
+
+# --- Lectura ---
+
+def _slice(source, offset, length):
+    # En un mapa de memoria read_buffer no copia: Arrow lee directamente de las páginas del fichero
+    source.seek(offset)
+    return source.read_buffer(length)
+
+
+def read_header(source):
+    """(cabecera, posición de la primera tabla) de un fichero Arrow (mapa de memoria o BufferReader)."""
+    start = len(MAGIC) + 8
+    prefix = _slice(source, 0, start).to_pybytes()
+    if len(prefix) < start or prefix[:len(MAGIC)] != MAGIC:
+        raise SnapshotError("Not a MyCubing snapshot.")
+    (length,) = struct.unpack("<Q", prefix[len(MAGIC):])
+    raw = _slice(source, start, length)
+    try:
+        header = json.loads(raw.to_pybytes())
+    except ValueError as e:
+        raise SnapshotError(f"Corrupt snapshot header: {e}") from e
+    if header.get("version") != VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {header.get('version')}.")
+    return header, start + length
+
+
+def _read(source, restore_competitions=True):
+    header, base = read_header(source)
+    tables = {}
+    for name, entry in header["tables"].items():
+        offset, length = base + entry["offset"], entry["length"]
+        buffer = _slice(source, offset, length)
+        if buffer.size != length:
+            raise SnapshotError("Truncated snapshot.")
+        try:
+            tables[name] = batch.decode_table((buffer, entry["columns"]))
+        except (pa.ArrowException, OSError, KeyError, ValueError) as e:
+            # Un stream dañado puede fallar al leerlo (ArrowInvalid, OSError) o salir sin sus columnas
+            raise SnapshotError(f"Corrupt snapshot table {name!r}: {e}") from e
+    try:
+        profile = _profile(header, tables)
+        if restore_competitions:
+            _restore_competitions(tables["competitions"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise SnapshotError(f"Corrupt snapshot: {e}") from e
+    return profile
+
+
+def load(path, restore_competitions=True):
+    """Lee un snapshot de disco (mapeado en memoria). Devuelve el dict de load_profile."""
+    _require_arrow()
+    with pa.memory_map(path, "r") as source:
+        return _read(source, restore_competitions)
+
+
+def loads(data, restore_competitions=True):
+    """Como load, pero desde bytes (p. ej. un fichero subido en la app)."""
+    _require_arrow()
+    return _read(pa.BufferReader(data), restore_competitions)
+
+
+def path_for(wca_id, directory=None):
+    return os.path.join(directory or SNAPSHOT_DIR or "snapshots", f"{wca_id}{SUFFIX}")
+
+
+def find(wca_id):
+    """Perfil del snapshot de MYCUBING_SNAPSHOT_DIR para ese WCA ID, o None si no hay (o no se puede leer)."""
+    if not SNAPSHOT_DIR or pa is None:
+        return None
+    path = path_for(wca_id)
+    if not os.path.exists(path):
+        return None
+    try:
+        return load(path)
+    except (OSError, SnapshotError):
+        return None
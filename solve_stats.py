@@ -0,0 +1,205 @@
+"""
+Estadísticas a nivel de intento (solve).
+
+Explota el bloque de intentos de get_wca_results (columna Solves / time1..time5)
+en arrays planos por intento (evento, fecha, valor, DNF) en orden cronológico y
+calcula medias móviles aoN, tasa de DNF, conteos sub-X e histogramas con código
+vectorizado (ventanas deslizantes de NumPy, sin bucles por intento).
+
+Convenciones: los valores están en las unidades de la WCA (centésimas, o
+movimientos en FMC). En las medias, un DNF se representa como np.inf.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from functions import SOLVE_COLUMNS, decode_mbld
+
+ROLLING_SIZES = (5, 12, 50, 100)
+# Multi-Blind guarda enteros empaquetados (no tiempos): no entra en estas estadísticas,
+# tiene las suyas en mbld_attempts / mbld_summary
+EXCLUDED_EVENTS = {"333mbf"}
+
+
+def explode_solves(results_df):
+    """
+    Devuelve un DataFrame compacto con un intento por fila, en orden cronológico:
+    Event (category), CompDate (datetime64), Competition (category), value (int32, DNF = -1/-2)
+    y dnf (bool). Los intentos no realizados (0) se descartan.
+    """
+    if results_df.empty:
+        return pd.DataFrame(columns=["Event", "CompDate", "Competition", "value", "dnf"])
+
+    df = results_df[~results_df["Event"].isin(EXCLUDED_EVENTS)]
+    # Orden cronológico: fecha, ronda y, dentro de la ronda, el número de intento
+    df = df.sort_values(by=["CompDate", "RoundRank"], kind="stable")
+
+    block = df[SOLVE_COLUMNS].to_numpy(dtype=np.int32)
+    flat = block.ravel()
+    keep = flat != 0
+    rows = np.repeat(np.arange(len(df)), block.shape[1])[keep]
+
+    return pd.DataFrame({
+        "Event": df["Event"].to_numpy()[rows],
+        "CompDate": df["CompDate"].to_numpy()[rows],
+        "Competition": df["Competition"].to_numpy()[rows],
+        "value": flat[keep],
+        "dnf": flat[keep] < 0,
+    }).astype({"Event": "category", "Competition": "category"})
+
+
+def trim_count(n):
+    """Intentos que se descartan por cada lado en un aoN (5% redondeado hacia arriba, como csTimer/WCA)."""
+    return max(1, math.ceil(n * 0.05))
+
+
+def rolling_average(values, n):
+    """
+    Media móvil aoN de `values` (int, DNF < 0). Devuelve un array float de longitud
+    len(values) - n + 1 (vacío si no hay suficientes intentos); np.inf = media DNF.
+    """
+    values = np.asarray(values)
+    if len(values) < n:
+        return np.empty(0)
+
+    times = np.where(values > 0, values, np.inf).astype(np.float64)
+    windows = np.lib.stride_tricks.sliding_window_view(times, n)
+    trim = trim_count(n)
+    counting = np.sort(windows, axis=1)[:, trim:n - trim]
+
+    # Si queda algún DNF entre los que cuentan, la media sale inf (DNF)
+    return counting.mean(axis=1)
+
+
+def best_of(averages):
+    """Mejor media (mínimo finito) o None."""
+    finite = averages[np.isfinite(averages)]
+    return float(finite.min()) if len(finite) else None
+
+
+def sub_x_counts(values, thresholds):
+    """{umbral: nº de intentos válidos por debajo de umbral} (umbral en las unidades del evento)."""
+    values = np.asarray(values)
+    ok = np.sort(values[values > 0])
+    return {t: int(np.searchsorted(ok, t, side="left")) for t in thresholds}
+
+
+def histogram(values, bins=30):
+    """Histograma de los intentos válidos: (conteos, bordes)."""
+    values = np.asarray(values)
+    ok = values[values > 0]
+    if len(ok) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    return np.histogram(ok, bins=bins)
+
+
+def event_summary(values, rolling=None):
+    """
+    Resumen de un evento a partir de sus intentos en orden cronológico.
+    `rolling` ({n: medias}) evita recalcular las medias móviles si ya se tienen.
+    """
+    values = np.asarray(values)
+    if rolling is None:
+        rolling = {n: rolling_average(values, n) for n in ROLLING_SIZES}
+    ok = values[values > 0]
+    summary = {
+        "solves": int(len(values)),
+        "dnf": int((values < 0).sum()),
+        "dnf_rate": float((values < 0).mean()) if len(values) else 0.0,
+        "best": int(ok.min()) if len(ok) else None,
+        "mean": float(ok.mean()) if len(ok) else None,
+    }
+    for n, averages in rolling.items():
+        summary[f"best_ao{n}"] = best_of(averages)
+        summary[f"current_ao{n}"] = float(averages[-1]) if len(averages) else None
+    return summary
+
+
+def compute_solve_stats(results_df):
+    """
+    Calcula todo lo que necesita la vista de estadísticas de un perfil.
+
+    Devuelve {"solves": DataFrame de explode_solves, "events": {evento: {
+        "values": array int32, "dates": array datetime64, "summary": dict,
+        "rolling": {n: array float}}}}.
+    Pensado para calcularse una vez por perfil y cachearse.
+    """
+    solves = explode_solves(results_df)
+    events = {}
+    for event, group in solves.groupby("Event", observed=True, sort=False):
+        values = group["value"].to_numpy()
+        rolling = {n: rolling_average(values, n) for n in ROLLING_SIZES}
+        events[event] = {
+            "values": values,
+            "dates": group["CompDate"].to_numpy(),
+            "summary": event_summary(values, rolling),
+            "rolling": rolling,
+        }
+    return {"solves": solves, "events": events}
+
+
+# --- Multi-Blind y FMC ---
+
+def mbld_attempts(results_df):
+    """
+    Un intento de Multi-Blind por fila, en orden cronológico y ya decodificado:
+    CompDate, Competition, points, solved, attempted, seconds (int) y dnf (bool).
+    Un DNF/DNS pierde el detalle (la WCA solo publica -1/-2), así que va con ceros.
+    """
+    df = results_df[results_df["Event"] == "333mbf"].sort_values(by=["CompDate", "RoundRank"], kind="stable")
+    block = df[SOLVE_COLUMNS].to_numpy(dtype=np.int64)
+    flat = block.ravel()
+    keep = flat != 0
+    rows = np.repeat(np.arange(len(df)), block.shape[1])[keep]
+
+    points, solved, attempted, seconds = decode_mbld(flat[keep])
+    return pd.DataFrame({
+        "CompDate": df["CompDate"].to_numpy()[rows],
+        "Competition": df["Competition"].to_numpy()[rows],
+        "points": points.astype(np.int16),
+        "solved": solved.astype(np.int16),
+        "attempted": attempted.astype(np.int16),
+        "seconds": seconds.astype(np.int32),
+        "dnf": flat[keep] < 0,
+    })
+
+
+def mbld_summary(attempts):
+    """
+    Resumen de Multi-Blind a partir de mbld_attempts: tasa de éxito (intentos no DNF),
+    tasa de cubos resueltos, puntos por hora (sobre los intentos con éxito) y mejores marcas.
+    """
+    ok = attempts[~attempts["dnf"]]
+    seconds = int(ok["seconds"].sum())
+    attempted = int(ok["attempted"].sum())
+    return {
+        "attempts": int(len(attempts)),
+        "successes": int(len(ok)),
+        "success_rate": float(len(ok) / len(attempts)) if len(attempts) else 0.0,
+        "cube_rate": float(ok["solved"].sum() / attempted) if attempted else None,
+        "points_per_hour": float(ok["points"].sum() * 3600 / seconds) if seconds else None,
+        "best_points": int(ok["points"].max()) if len(ok) else None,
+        "most_solved": int(ok["solved"].max()) if len(ok) else None,
+    }
+
+
+def fmc_means(results_df, window=5):
+    """
+    Medias de 3 de FMC (en movimientos) por ronda en orden cronológico, con su PB
+    acumulado y la media móvil de las últimas `window`: CompDate, Competition, Round,
+    mean, best (mejor single de la ronda), pb y trend. Usa las columnas fmc_* de la carga.
+    """
+    df = results_df[(results_df["Event"] == "333fm") & results_df["fmc_mean"].notna()]
+    df = df.sort_values(by=["CompDate", "RoundRank"], kind="stable")
+    means = df["fmc_mean"].to_numpy(dtype=np.float64)
+    return pd.DataFrame({
+        "CompDate": df["CompDate"].to_numpy(),
+        "Competition": df["Competition"].to_numpy(),
+        "Round": df["Round"].to_numpy(),
+        "mean": means,
+        "best": df["fmc_moves"].to_numpy(dtype=np.float64, na_value=np.nan),
+        "pb": np.minimum.accumulate(means) if len(means) else means,
+        "trend": pd.Series(means).rolling(window, min_periods=1).mean().to_numpy(),
+    })
@@ -0,0 +1,13 @@
+"""
+Configuración común de los tests: el repositorio en sys.path (los módulos viven en
+la raíz) y una caché de disco temporal, fijada antes de importar nada, para que las
+bases SQLite y el almacén de competiciones no toquen ~/.cache/mycubing.
+"""
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("MYCUBING_CACHE_DIR", tempfile.mkdtemp(prefix="mycubing-tests-"))
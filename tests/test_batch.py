@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import batch
+import functions as fn
+
+
+def results_table():
+    df = pd.DataFrame({
+        "Competition": ["A2020", "B2021"],
+        "Event": ["333", "333fm"],
+        "CompDate": pd.to_datetime(["2020-01-01", "2021-06-05"]),
+        "RoundRank": [5, 1],
+        "best_cs": [800, 25],
+        "avg_cs": [1000, 2833],
+        "time1": [1000, 25], "time2": [900, 30], "time3": [1100, 30],
+        "time4": [1200, 0], "time5": [800, 0],
+    })
+    return fn.add_event_columns(fn.add_solve_stats(df))
+
+
+@pytest.fixture(params=["arrow", "pickle"])
+def codec(request, monkeypatch):
+    if request.param == "pickle":
+        monkeypatch.setattr(batch, "pa", None)
+    elif batch.pa is None:
+        pytest.skip("pyarrow not installed")
+    return request.param
+
+
+def test_results_round_trip(codec):
+    df = results_table()
+    out = batch.decode_table(batch.encode_table(df))
+
+    assert list(out.columns) == list(df.columns)
+    pd.testing.assert_frame_equal(out.drop(columns=["Solves"]), df.drop(columns=["Solves"]))
+    # Solves se reconstruye desde time1..time5 como vistas de un bloque contiguo
+    assert [s.tolist() for s in out["Solves"]] == [s.tolist() for s in df["Solves"]]
+    assert out["Solves"].iloc[0].base is out["Solves"].iloc[1].base
+
+
+def test_plain_solves_column_is_kept(codec):
+    # Fuera de los resultados, "Solves" es una columna normal (p. ej. un recuento)
+    df = pd.DataFrame({"Event": ["333", "222"], "Solves": np.array([10, 4])})
+    out = batch.decode_table(batch.encode_table(df))
+    assert out["Solves"].tolist() == [10, 4]
+
+
+def test_build_tables_reuses_loaded_results(monkeypatch):
+    results = results_table()
+    profile = {
+        "results": results,
+        "prs_dict": {},
+        "stats_prs": {"total": 0},
+        "map_data": [],
+        "yearly_bests": fn.get_yearly_bests(results),
+    }
+    monkeypatch.setattr(fn, "load_profile", lambda wca_id: profile)
+    monkeypatch.setattr(fn, "get_activity_index", lambda df: {"monthly": pd.DataFrame()})
+
+    def no_refetch(wca_id):
+        raise AssertionError("results fetched again")
+
+    seen = []
+
+    def matrix(wca_id, results_df=None, progress=None):
+        seen.append(results_df)
+        return pd.DataFrame()
+
+    monkeypatch.setattr(fn, "get_wca_results", no_refetch)
+    monkeypatch.setattr(fn, "get_neighbour_matrix", matrix)
+
+    tables = batch.build_tables("2016TEST01", neighbours=True)
+    assert seen[0] is results
+    assert tables["neighbours"].empty
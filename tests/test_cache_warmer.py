@@ -0,0 +1,39 @@
+import cache_warmer
+import functions as fn
+
+
+def test_warm_profile_includes_person(monkeypatch):
+    warmed = []
+    monkeypatch.setattr(cache_warmer, "_warm_url", lambda url, limiter: warmed.append(url) or True)
+    monkeypatch.setattr(fn, "fetch_json", lambda url: [{"competition_id": "A2020"}, {"competition_id": "A2020"}])
+
+    assert cache_warmer.warm_profile("2016TEST01", limiter=None, scrambles=False) == 3
+    assert warmed == [
+        f"{cache_warmer.WCA_API}/persons/2016TEST01",
+        f"{cache_warmer.WCA_API}/persons/2016TEST01/results",
+        f"{cache_warmer.GITHUB_API}/competitions/A2020.json",
+    ]
+
+
+def test_warm_reports_failures(monkeypatch):
+    def warm_profile(wca_id, limiter, scrambles):
+        if wca_id == "BROKEN":
+            raise RuntimeError("API down")
+        return 2
+
+    monkeypatch.setattr(cache_warmer, "warm_profile", warm_profile)
+    seen = []
+    summary = cache_warmer.warm(wca_ids=["OK1", "BROKEN", "OK2"], rate=0, workers=1,
+                                progress=lambda done, total, label: seen.append(label))
+
+    assert summary == {"tasks": 3, "fetched": 4, "errors": [("profile BROKEN", "API down")]}
+    assert len(seen) == 3
+
+
+def test_region_pages_go_through_the_limiter(monkeypatch):
+    warmed = []
+    monkeypatch.setattr(cache_warmer, "_warm_url", lambda url, limiter: warmed.append(url) or True)
+    monkeypatch.setattr(fn, "get_all_competitions", lambda: [])
+
+    cache_warmer.competitions_in_region(["ES"], limiter=cache_warmer.RateLimiter(0))
+    assert warmed == [fn.COMPETITION_PAGE_URL.format(page=page) for page in fn.COMPETITION_PAGES]
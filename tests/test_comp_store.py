@@ -0,0 +1,113 @@
+import os
+
+import pytest
+
+import comp_store
+
+
+def comp(comp_id, lat=None, lon=None, start="2024-05-01", end="2024-05-02", **extra):
+    item = {"id": comp_id, "name": comp_id, "city": "x", "country": "ES",
+            "date": {"from": start, "till": end, "numberOfDays": 2},
+            "organisers": [{"name": "Org"}], **extra}
+    if lat is not None:
+        item["venue"] = {"coordinates": {"latitude": lat, "longitude": lon}}
+    return item
+
+
+COMPETITIONS = [
+    comp("Madrid2024", 40.42, -3.70),
+    comp("Toledo2023", 39.86, -4.02, start="2023-03-01", end="2023-03-01"),
+    comp("Barcelona2024", 41.39, 2.17),
+    comp("Fiji2024", -18.14, 178.44),
+    comp("Samoa2024", -13.83, -171.76),
+    comp("Cancelled2024", 40.42, -3.70, isCanceled=True),
+    comp("Online2020"),
+]
+
+
+@pytest.fixture(scope="module")
+def store():
+    return comp_store.CompetitionStore.from_competitions(COMPETITIONS)
+
+
+def test_within_radius(store):
+    df = store.within_radius(40.42, -3.70, 150)
+    # Ordenadas por distancia; las canceladas y las que no tienen coordenadas no salen
+    assert df["id"].tolist() == ["Madrid2024", "Toledo2023"]
+    assert df["distance_km"].iloc[1] == pytest.approx(71, abs=5)
+    assert "Barcelona2024" in store.within_radius(40.42, -3.70, 600)["id"].tolist()
+
+
+def test_within_radius_filters(store):
+    assert store.within_radius(40.42, -3.70, 150, start="2024-01-01")["id"].tolist() == ["Madrid2024"]
+    assert store.within_radius(40.42, -3.70, 150, exclude={"Madrid2024"})["id"].tolist() == ["Toledo2023"]
+    assert store.within_radius(40.42, -3.70, 150, limit=1)["id"].tolist() == ["Madrid2024"]
+
+
+def test_within_radius_across_antimeridian(store):
+    # Desde 179.9 E, Samoa (171.76 W) está a ~1000 km aunque su longitud sea negativa
+    ids = store.within_radius(-16.0, 179.9, 1200)["id"].tolist()
+    assert sorted(ids) == ["Fiji2024", "Samoa2024"]
+
+
+def test_within_bbox(store):
+    assert sorted(store.within_bbox(39, -5, 42, 3)["id"]) == ["Barcelona2024", "Madrid2024", "Toledo2023"]
+    # lon_min > lon_max: la caja cruza el antimeridiano
+    assert sorted(store.within_bbox(-20, 170, -10, -170)["id"]) == ["Fiji2024", "Samoa2024"]
+    assert store.within_bbox(-20, -170, -10, 170)["id"].tolist() == []
+
+
+def test_summary(store):
+    assert len(store) == 6
+    madrid = store.summary("Madrid2024")
+    assert (madrid.date_from, madrid.date_till, madrid.organisers) == ("2024-05-01", "2024-05-02", ("Org",))
+    online = store.summary("Online2020")
+    assert online.lat is None and online.lon is None
+    assert store.summary("Cancelled2024") is None and store.summary("Zzz") is None
+
+
+@pytest.fixture
+def store_path(tmp_path, monkeypatch):
+    if comp_store.pa is None:
+        pytest.skip("pyarrow not installed")
+    path = str(tmp_path / "competitions.arrow")
+    monkeypatch.setattr(comp_store, "STORE_PATH", path)
+    monkeypatch.setattr(comp_store, "_STORE", None)
+    monkeypatch.setattr(comp_store, "_last_failed_open", 0.0)
+    return path
+
+
+def test_mapped_store_matches_memory(store, store_path):
+    comp_store.write_store(comp_store.build_columns(COMPETITIONS))
+    mapped = comp_store.CompetitionStore.open()
+    assert mapped.path == store_path
+    assert mapped.summary("Madrid2024") == store.summary("Madrid2024")
+    assert mapped.within_bbox(-20, 170, -10, -170)["id"].tolist() == store.within_bbox(-20, 170, -10, -170)["id"].tolist()
+
+
+def test_lookup_backs_off_after_failed_open(store_path, monkeypatch):
+    opens = []
+    open_mapped = comp_store._open_mapped
+    monkeypatch.setattr(comp_store, "_open_mapped", lambda: opens.append(1) or open_mapped())
+
+    assert comp_store.lookup("Madrid2024") is None
+    comp_store.write_store(comp_store.build_columns(COMPETITIONS))
+    # Dentro de REOPEN_INTERVAL no se vuelve a intentar abrir el fichero
+    assert comp_store.lookup("Madrid2024") is None
+    assert len(opens) == 1
+
+    monkeypatch.setattr(comp_store, "_last_failed_open", 0.0)
+    assert comp_store.lookup("Madrid2024").name == "Madrid2024"
+    assert comp_store.lookup("Toledo2023").name == "Toledo2023"
+    assert len(opens) == 2
+
+
+def test_stale_checks_mtime_at_most_every_interval(store_path, monkeypatch):
+    comp_store.write_store(comp_store.build_columns(COMPETITIONS))
+    mapped = comp_store.CompetitionStore.open()
+    comp_store.write_store(comp_store.build_columns(COMPETITIONS[:2]))
+    os.utime(store_path, (0, mapped.mtime + 10))
+
+    assert not mapped.stale()  # recién abierto: aún no toca mirar el mtime
+    monkeypatch.setattr(comp_store, "STAT_INTERVAL", 0)
+    assert mapped.stale()
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import functions as fn
+
+
+def results_frame(rows):
+    """DataFrame mínimo de resultados: (evento, [intentos]) por fila."""
+    return pd.DataFrame({
+        "Event": [event for event, _ in rows],
+        **{col: [solves[i] for _, solves in rows] for i, col in enumerate(fn.SOLVE_COLUMNS)},
+    })
+
+
+def test_round_order():
+    order = ["0", "1", "b", "2", "3", "f"]
+    ranks = [fn.ROUND_ORDER[r] for r in order]
+    assert ranks == sorted(ranks) and len(set(ranks)) == len(ranks)
+    # Las rondas combined comparten puesto con su equivalente normal
+    for combined, normal in [("h", "0"), ("d", "1"), ("e", "2"), ("g", "3"), ("c", "f")]:
+        assert fn.ROUND_ORDER[combined] == fn.ROUND_ORDER[normal]
+
+
+def test_add_solve_stats_ao5_and_mo3():
+    df = fn.add_solve_stats(results_frame([
+        ("333", [1000, 900, 1100, 1200, 800]),  # ao5: cuentan 900, 1000, 1100
+        ("666", [6000, 6300, 6600, 0, 0]),      # mo3: cuentan los tres
+        ("333", [1000, -1, 1100, 1200, 800]),   # un DNF es el peor y se descarta
+        ("333", [1000, -1, -2, 1200, 800]),     # dos DNF/DNS: media DNF
+        ("333", [1000, 1100, 0, 0, 0]),         # cortado por el cutoff: sin media
+    ]))
+
+    assert df["n_attempts"].tolist() == [5, 3, 5, 5, 2]
+    assert df["n_dnf"].tolist() == [0, 0, 1, 2, 0]
+    assert df["worst_cs"].tolist() == [1200, 6600, -1, -1, 1100]
+    np.testing.assert_allclose(df["counting_avg_cs"].to_numpy()[:4], [1000, 6300, 1100, -1])
+    assert np.isnan(df["counting_avg_cs"].iloc[4])
+    np.testing.assert_allclose(df["counting_std_cs"].iloc[0], np.std([900, 1000, 1100]))
+    assert np.isnan(df["counting_std_cs"].iloc[3])
+
+
+def test_add_solve_stats_solves_block():
+    df = fn.add_solve_stats(results_frame([("333", [1000, 900, 1100, 1200, 800]),
+                                           ("333mbf", [580325400, 0, 0, 0, 0])]))
+    # Cada fila de Solves es una vista del mismo bloque contiguo (n, 5)
+    assert df["Solves"].iloc[0].base is df["Solves"].iloc[1].base
+    assert df["Solves"].iloc[0].tolist() == [1000, 900, 1100, 1200, 800]
+    # Multi-Blind guarda enteros empaquetados, no tiempos
+    assert np.isnan(df["counting_avg_cs"].iloc[1])
+
+
+# --- Decodificadores (Multi-Blind, FMC, tiempos) ---
+
+@pytest.mark.parametrize("value, decoded", [
+    # Formato actual 0DDTTTTTMM: 3/4 en 60:00 -> 2 puntos
+    (970360001, (2, 3, 4, 3600)),
+    # 41/41 en 54:14
+    (580325400, (41, 41, 41, 3254)),
+    # Formato antiguo 1SSAATTTTT: 3/4 en 60:00
+    (1960403600, (2, 3, 4, 3600)),
+    # DNF, DNS y sin intento: todo 0
+    (-1, (0, 0, 0, 0)),
+    (-2, (0, 0, 0, 0)),
+    (0, (0, 0, 0, 0)),
+])
+def test_decode_mbld(value, decoded):
+    assert tuple(int(x) for x in fn.decode_mbld(value)) == decoded
+
+
+def test_decode_mbld_vectorised():
+    points, solved, attempted, seconds = fn.decode_mbld([970360001, 1960403600, -1])
+    assert points.tolist() == [2, 2, 0]
+    assert attempted.tolist() == [4, 4, 0]
+
+
+@pytest.mark.parametrize("value, event, text", [
+    (943, "333", "9.43s"),
+    (6543, "333", "1:05.43s"),
+    (-1, "333", "DNF"),
+    (-2, "333", "DNS"),
+    (0, "333", ""),
+    (25, "333fm", "25 moves"),
+    (2833, "333fm", "28.33 moves"),
+    (970360001, "333mbf", "3/4 in 60:00"),
+])
+def test_format_wca_time(value, event, text):
+    assert fn.format_wca_time(value, event_code=event) == text
+
+
+def test_add_event_columns():
+    df = fn.add_event_columns(pd.DataFrame({
+        "Event": ["333mbf", "333mbf", "333fm", "333fm", "333"],
+        "best_cs": [970360001, -1, 25, -1, 900],
+        "avg_cs": [0, 0, 2833, -1, 1000],
+    }))
+
+    assert df["mbf_points"].iloc[0] == 2 and df["mbf_solved"].iloc[0] == 3
+    assert df["mbf_attempted"].iloc[0] == 4 and df["mbf_seconds"].iloc[0] == 3600
+    assert df["mbf_points"].iloc[1:].isna().all()
+    assert df["fmc_moves"].iloc[2] == 25
+    assert df["fmc_mean"].iloc[2] == pytest.approx(28.33, abs=1e-4)
+    assert df[["fmc_moves", "fmc_mean"]].iloc[[0, 1, 3, 4]].isna().all().all()
+    assert str(df["mbf_points"].dtype) == "Int16" and str(df["fmc_mean"].dtype) == "Float32"
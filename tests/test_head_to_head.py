@@ -0,0 +1,68 @@
+import pytest
+
+import head_to_head as h2h
+
+# (competición, evento, ronda, wca_id, nombre, puesto, best, average)
+ROWS = [
+    ("A2020", "333", "1", "ME", "Me", 1, 800, 1000),
+    ("A2020", "333", "1", "RIVAL", "Rival", 2, 850, 1050),
+    ("A2020", "333", "1", "OTHER", "Other", 3, 900, 1100),
+    ("A2020", "333", "f", "ME", "Me", 2, 790, 990),
+    ("A2020", "333", "f", "RIVAL", "Rival", 1, 780, 980),
+    ("B2021", "222", "1", "ME", "Me", 3, 300, 400),
+    ("B2021", "222", "1", "RIVAL", "Rival", 3, 300, 400),
+    ("B2021", "222", "1", "DNF", "No Result", 0, -1, -1),
+]
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(h2h, "DB_PATH", str(tmp_path / "head_to_head.sqlite"))
+    monkeypatch.setattr(h2h, "_conn", None)
+    conn = h2h.get_db()
+    with conn:
+        conn.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", ROWS)
+    yield conn
+    conn.close()
+
+
+def test_head_to_head_counts(db):
+    df = h2h.head_to_head("ME").set_index("rival_id")
+
+    # Sin puesto (0) no cuenta como ronda compartida
+    assert list(df.index) == ["RIVAL", "OTHER"]
+    rival = df.loc["RIVAL"]
+    assert (rival["Rounds"], rival["Wins"], rival["Losses"], rival["Ties"]) == (3, 1, 1, 1)
+    assert rival["Competitions"] == 2
+    assert rival["WinRate"] == pytest.approx(1 / 3)
+    assert df.loc["OTHER", "Wins"] == 1
+
+
+def test_head_to_head_min_rounds(db):
+    assert h2h.head_to_head("ME", min_rounds=2)["rival_id"].tolist() == ["RIVAL"]
+
+
+def test_rivalry(db):
+    df = h2h.rivalry("ME", "RIVAL")
+    assert len(df) == 3
+    final = df[(df["Competition"] == "A2020") & (df["Round"] == "f")].iloc[0]
+    assert (final["MyPos"], final["RivalPos"], final["MyBest"], final["RivalBest"]) == (2, 1, 790, 780)
+
+
+def test_podiums_only_finals(db):
+    assert h2h.podiums("RIVAL")[["Competition", "Event", "Place"]].values.tolist() == [["A2020", "333", 1]]
+
+
+def test_load_competitions_skips_settled(db, monkeypatch):
+    downloads = []
+
+    def download(comp_id):
+        downloads.append(comp_id)
+        return [(comp_id, "333", "f", "ME", "Me", 1, 700, 800)], True
+
+    monkeypatch.setattr(h2h, "_download", download)
+    assert h2h.load_competitions(["C2022"], workers=1) == 1
+    # Ya está en la base y ha terminado: no se vuelve a pedir
+    assert h2h.load_competitions(["C2022"], workers=1) == 0
+    assert downloads == ["C2022"]
+    assert "C2022" in h2h.podiums("ME")["Competition"].tolist()
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+import disk_cache
+import http_cache
+
+URL = "https://example.org/api/v0/things"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise http_cache.requests.HTTPError(self.status_code)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """session.get falso: responde en orden las respuestas de `server.responses` y guarda las peticiones."""
+    monkeypatch.setattr(disk_cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(disk_cache, "ENABLED", True)
+
+    class Server:
+        responses = []
+        requests = []
+
+    def get(url, headers=None, **kwargs):
+        Server.requests.append(headers or {})
+        return Server.responses.pop(0)
+
+    monkeypatch.setattr(http_cache.session, "get", get)
+    return Server
+
+
+def test_304_revalidates_cached_copy(server):
+    body = json.dumps({"items": [1, 2, 3]}).encode()
+    server.responses = [
+        # max-age=0: la copia queda caducada en cuanto se guarda
+        FakeResponse(200, body, {"ETag": '"v1"', "Cache-Control": "max-age=0"}),
+        FakeResponse(304, headers={"Cache-Control": "max-age=3600"}),
+    ]
+    revalidated = http_cache.STATS["revalidated"]
+
+    assert http_cache.get_json(URL, ttl=3600) == {"items": [1, 2, 3]}
+    assert http_cache.get_json(URL, ttl=3600) == {"items": [1, 2, 3]}
+
+    # La segunda petición es condicional y el 304 sirve la copia de disco
+    assert server.requests[1]["If-None-Match"] == '"v1"'
+    assert http_cache.STATS["revalidated"] == revalidated + 1
+    meta = disk_cache.get_meta(URL)
+    assert meta["etag"] == '"v1"'  # el 304 no repite el ETag: se conserva el anterior
+    assert meta["max_age"] == 3600
+
+    # Ya fresca: la tercera no llega a la red
+    assert http_cache.get_json(URL, ttl=3600) == {"items": [1, 2, 3]}
+    assert len(server.requests) == 2
+
+
+def test_error_serves_stale_copy(server):
+    server.responses = [
+        FakeResponse(200, b"[1, 2]", {"Cache-Control": "max-age=0"}),
+        FakeResponse(503),
+    ]
+    assert http_cache.get_json(URL, ttl=3600) == [1, 2]
+    assert http_cache.get_json(URL, ttl=3600) == [1, 2]
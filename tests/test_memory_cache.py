@@ -0,0 +1,43 @@
+from memory_cache import LRUCache
+
+
+def test_evicts_least_recently_used_entry():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" pasa a ser la más reciente
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_by_bytes():
+    cache = LRUCache(max_entries=100, max_bytes=250, sizeof=lambda value: value)
+    cache.put("a", 100)
+    cache.put("b", 100)
+    cache.put("c", 100)  # 300 bytes > 250: sale "a"
+
+    assert "a" not in cache and len(cache) == 2
+    assert cache.bytes == 200
+
+    cache.put("b", 50)  # sustituir una entrada descuenta su tamaño anterior
+    assert cache.bytes == 150 and len(cache) == 2
+
+
+def test_entry_larger_than_max_bytes_is_not_kept():
+    cache = LRUCache(max_entries=10, max_bytes=100, sizeof=lambda value: value)
+    cache.put("a", 10)
+    cache.put("huge", 500)
+    assert len(cache) == 0 and cache.bytes == 0
+
+
+def test_stats_hit_rate():
+    cache = LRUCache(max_entries=2)
+    assert cache.stats()["hit_rate"] is None
+    cache.put("a", 1)
+    cache.get("a")
+    assert cache.get("missing", "default") == "default"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
@@ -0,0 +1,96 @@
+import json
+import sqlite3
+
+import pytest
+
+import disk_cache
+import scramble_index as si
+
+SCRAMBLES = {
+    "333": {
+        "1": {"A": [{"num": 1, "is_extra": False, "scramble": "R U R' U' F2 D"},
+                    {"num": 2, "is_extra": False, "scramble": "R U2 R' F B"}],
+              "B": [{"num": 1, "is_extra": True, "scramble": "F R U R' U' F'"}]},
+    },
+    "444": {
+        "1": {"A": [{"num": 1, "is_extra": False, "scramble": "Rw U R U' r"}]},
+    },
+}
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(si, "DB_PATH", str(tmp_path / "scrambles.sqlite"))
+    monkeypatch.setattr(si, "_conn", None)
+    si.add_competition("A2020", SCRAMBLES)
+    yield
+    si.get_db().close()
+
+
+def found(df):
+    return sorted(zip(df["Event"], df["Group"], df["Number"]))
+
+
+def test_whole_moves(index):
+    # "R U" no encuentra "R U2": solo movimientos completos
+    assert found(si.search("R U")) == [("333", "A", 1), ("333", "B", 1)]
+    assert found(si.search("R U", whole_moves=False)) == [
+        ("333", "A", 1), ("333", "A", 2), ("333", "B", 1), ("444", "A", 1)]
+
+
+def test_starts_with_and_event(index):
+    assert found(si.search("R U", starts_with=True)) == [("333", "A", 1)]
+    assert found(si.search("U R", event_id="444")) == [("444", "A", 1)]
+    assert found(si.search("U R", event_id="333")) == []
+
+
+def test_starts_with_whole_moves_checks_the_start(index):
+    # "R U2 R' F B" no empieza por el movimiento "R U" aunque empiece por el texto "R U"
+    si.add_competition("B2021", {"333": {"1": {"A": [
+        {"num": 1, "is_extra": False, "scramble": "R U2 F R U D"},
+        {"num": 2, "is_extra": False, "scramble": "R U F2 D"},
+    ]}}})
+    df = si.search("R U", starts_with=True, event_id="333")
+    assert sorted(zip(df["Competition"], df["Number"])) == [("A2020", 1), ("B2021", 2)]
+    df = si.search("R U", starts_with=True, whole_moves=False, event_id="333")
+    assert len(df) == 4
+
+
+def test_case_sensitive(index):
+    # r (capa interior) no es R
+    assert found(si.search("U' r")) == [("444", "A", 1)]
+    assert found(si.search("U R'")) == [("333", "A", 1), ("333", "B", 1)]
+
+
+def test_short_query_and_whitespace(index):
+    # Menos de 3 caracteres no sirve para los trigramas: se busca sin FTS
+    assert len(si.search("F'")) == 1
+    assert found(si.search("  R   U2 ")) == [("333", "A", 2)]
+    assert si.search("").empty
+
+
+def test_add_competition_is_idempotent(index):
+    si.add_competition("A2020", {"333": {"1": {"A": [{"num": 1, "is_extra": False, "scramble": "L"}]}}})
+    stats = si.stats()
+    assert (stats["competitions"], stats["scrambles"]) == (1, 4)
+
+
+def test_index_cached_counts_failures(index, tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "CACHE_DIR", str(tmp_path / "http"))
+    monkeypatch.setattr(disk_cache, "ENABLED", True)
+    for comp_id in ("B2021", "C2022"):
+        url = f"https://www.worldcubeassociation.org/api/v0/competitions/{comp_id}/scrambles"
+        item = {"event_id": "333", "round_type_id": "f", "group_id": "A", "scramble_num": 1,
+                "is_extra": False, "scramble": f"D2 B2 {comp_id}"}
+        disk_cache.put(url, {"url": url, "fetched_at": 0, "max_age": 0}, json.dumps([item]).encode())
+
+    store = si._store
+
+    def flaky_store(comp_id, rows):
+        if comp_id == "C2022":
+            raise sqlite3.OperationalError("database is locked")
+        store(comp_id, rows)
+
+    monkeypatch.setattr(si, "_store", flaky_store)
+    assert si.index_cached() == (1, 1)
+    assert si.is_indexed("B2021") and not si.is_indexed("C2022")
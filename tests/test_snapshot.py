@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import functions as fn
+import snapshot
+from models import CompetitionSummary, Profile
+
+pytestmark = pytest.mark.skipif(snapshot.pa is None, reason="pyarrow not installed")
+
+COMPETITIONS = [
+    CompetitionSummary(id="A2020", name="A Open 2020", country="ES", city="Madrid",
+                       date_from="2020-01-04", date_till="2020-01-05", days=2, lat=40.4, lon=-3.7,
+                       organisers=("Ana", "Luis")),
+    CompetitionSummary(id="B2021", name="B Open 2021", country="ES", city="Toledo",
+                       date_from="2021-06-05", date_till="2021-06-05", lat=39.9, lon=-4.0),
+]
+
+
+def make_profile():
+    for comp in COMPETITIONS:
+        fn.COMP_CACHE.put(comp.id, comp)
+    results = fn.add_event_columns(fn.add_solve_stats(pd.DataFrame({
+        "Competition": ["A2020", "A2020", "B2021"],
+        "CompName": ["A Open 2020", "A Open 2020", "B Open 2021"],
+        "CompDate": pd.to_datetime(["2020-01-04", "2020-01-04", "2021-06-05"]),
+        "CompDays": [2, 2, 1],
+        "Event": ["333", "333fm", "333"],
+        "Round": ["1", "f", "f"],
+        "RoundRank": [1, 5, 5],
+        "best_cs": [900, 28, 850],
+        "avg_cs": [1000, 3000, 950],
+        "time1": [1000, 28, 850], "time2": [900, 30, 900], "time3": [1100, 32, 1000],
+        "time4": [1200, 0, 950], "time5": [800, 0, 990],
+    })))
+    return {
+        "wca_id": "2016TEST01",
+        "info": Profile(wca_id="2016TEST01", name="Test Person", country_iso2="ES"),
+        "results": results,
+        "prs_dict": {"333": [850, 950]},
+        "stats_prs": {"single": 2, "average": 1},
+        "map_data": [{"id": "A2020", "lat": 40.4, "lon": -3.7}],
+        "progression": {("333", "single"): {
+            "dates": pd.to_datetime(["2020-01-04", "2021-06-05"]).to_numpy(),
+            "values": np.array([900, 850], dtype=np.float32),
+        }},
+        "yearly_bests": fn.get_yearly_bests(results),
+        "activity": fn.get_activity_index(results),
+    }
+
+
+def test_round_trip():
+    profile = make_profile()
+    data = snapshot.dumps(profile)
+    fn.COMP_CACHE.clear()
+    loaded = snapshot.loads(data)
+
+    assert loaded["wca_id"] == profile["wca_id"]
+    assert loaded["info"].name == "Test Person"
+    pd.testing.assert_frame_equal(loaded["results"].drop(columns=["Solves"]),
+                                  profile["results"].drop(columns=["Solves"]))
+    pd.testing.assert_frame_equal(loaded["yearly_bests"], profile["yearly_bests"])
+    assert loaded["yearly_bests"].columns.name == "Year"
+    np.testing.assert_array_equal(loaded["progression"][("333", "single")]["values"], [900, 850])
+    pd.testing.assert_frame_equal(loaded["activity"]["daily"], profile["activity"]["daily"])
+
+    # Las fichas vuelven a COMP_CACHE, con varios organizadores o ninguno
+    assert fn.COMP_CACHE.get("A2020") == COMPETITIONS[0]
+    assert fn.COMP_CACHE.get("B2021").organisers == ()
+
+
+def test_loads_without_restoring_competitions():
+    data = snapshot.dumps(make_profile())
+    fn.COMP_CACHE.clear()
+    snapshot.loads(data, restore_competitions=False)
+    assert fn.COMP_CACHE.get("A2020") is None
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: b"NOTASNAP" + data[8:],
+    lambda data: data[:len(data) // 2],
+    lambda data: data[:-200] + b"\0" * 200,
+])
+def test_corrupt_snapshot_raises_snapshot_error(damage):
+    with pytest.raises(snapshot.SnapshotError):
+        snapshot.loads(damage(snapshot.dumps(make_profile())))
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import solve_stats
+
+
+@pytest.mark.parametrize("n, trim", [(5, 1), (12, 1), (20, 1), (21, 2), (50, 3), (100, 5)])
+def test_trim_count(n, trim):
+    # 5% por cada lado redondeado hacia arriba, y como mínimo uno
+    assert solve_stats.trim_count(n) == trim
+
+
+def test_rolling_average_ao5():
+    values = [1000, 900, 1100, 1200, 800, 700]
+    averages = solve_stats.rolling_average(values, 5)
+    # Ventanas: sin el mejor ni el peor de cada una
+    np.testing.assert_allclose(averages, [1000, (900 + 1100 + 800) / 3])
+
+
+def test_rolling_average_dnf():
+    # Un DNF se descarta como peor; dos hacen la media DNF (inf)
+    assert solve_stats.rolling_average([1000, -1, 1100, 1200, 800], 5)[0] == pytest.approx(1100)
+    assert np.isinf(solve_stats.rolling_average([1000, -1, -2, 1200, 800], 5)[0])
+
+
+def test_rolling_average_ao12_trims_one_each_side():
+    values = np.arange(1, 13) * 100
+    values[0] = -1  # el DNF es el peor: se descarta junto al mejor válido
+    expected = np.mean(np.arange(3, 13) * 100)
+    assert solve_stats.rolling_average(values, 12)[0] == pytest.approx(expected)
+
+
+def test_rolling_average_too_few_solves():
+    assert len(solve_stats.rolling_average([1000, 900], 5)) == 0
+
+
+def test_best_of_ignores_dnf_averages():
+    assert solve_stats.best_of(np.array([np.inf, 1200.0, 1100.0])) == 1100.0
+    assert solve_stats.best_of(np.array([np.inf])) is None
+
+
+def test_explode_solves_chronological():
+    df = pd.DataFrame({
+        "Event": ["333", "333", "333mbf"],
+        "CompDate": pd.to_datetime(["2020-02-01", "2020-01-01", "2020-01-01"]),
+        "RoundRank": [1, 5, 5],
+        "Competition": ["B2020", "A2020", "A2020"],
+        "time1": [300, 100, 580325400], "time2": [400, 200, 0], "time3": [-1, 0, 0],
+        "time4": [0, 0, 0], "time5": [0, 0, 0],
+    })
+    solves = solve_stats.explode_solves(df)
+    # Multi-Blind queda fuera y los intentos no realizados (0) se descartan
+    assert solves["value"].tolist() == [100, 200, 300, 400, -1]
+    assert solves["dnf"].tolist() == [False, False, False, False, True]
+
+
+# --- Multi-Blind y FMC ---
+
+def test_mbld_attempts_and_summary():
+    df = pd.DataFrame({
+        "Event": ["333mbf", "333mbf", "333"],
+        "CompDate": pd.to_datetime(["2021-01-01", "2020-01-01", "2020-01-01"]),
+        "RoundRank": [5, 5, 5],
+        "Competition": ["B2021", "A2020", "A2020"],
+        # 3/4 en 60:00 y un DNF; 41/41 en 54:14 (antes); 333 no cuenta
+        "time1": [970360001, 580325400, 900], "time2": [-1, 0, 900], "time3": [0, 0, 900],
+        "time4": [0, 0, 900], "time5": [0, 0, 900],
+    })
+    attempts = solve_stats.mbld_attempts(df)
+    assert attempts["Competition"].tolist() == ["A2020", "B2021", "B2021"]
+    assert attempts["points"].tolist() == [41, 2, 0]
+    assert attempts["dnf"].tolist() == [False, False, True]
+
+    summary = solve_stats.mbld_summary(attempts)
+    assert (summary["attempts"], summary["successes"]) == (3, 2)
+    assert summary["cube_rate"] == pytest.approx(44 / 45)
+    assert summary["points_per_hour"] == pytest.approx(43 * 3600 / (3254 + 3600))
+    assert (summary["best_points"], summary["most_solved"]) == (41, 41)
+
+
+def test_fmc_means():
+    df = pd.DataFrame({
+        "Event": ["333fm", "333fm", "333fm", "333"],
+        "CompDate": pd.to_datetime(["2020-01-01", "2020-01-01", "2021-01-01", "2020-01-01"]),
+        "RoundRank": [5, 1, 5, 5],
+        "Competition": ["A2020", "A2020", "B2021", "A2020"],
+        "Round": ["f", "1", "f", "f"],
+        "fmc_mean": pd.array([30.0, 32.0, None, 10.0], dtype="Float32"),
+        "fmc_moves": pd.array([28, 30, 25, 8], dtype="Int16"),
+    })
+    means = solve_stats.fmc_means(df, window=2)
+    # Las rondas sin media (DNF) quedan fuera; orden por fecha y ronda
+    assert means["Round"].tolist() == ["1", "f"]
+    assert means["mean"].tolist() == [32.0, 30.0]
+    assert means["pb"].tolist() == [32.0, 30.0]
+    assert means["trend"].tolist() == [32.0, 31.0]
+    assert means["best"].tolist() == [30.0, 28.0]
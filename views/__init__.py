@@ -0,0 +1,7 @@
+"""
+Renderizado de cada pestaña de la app.
+
+Cada módulo se importa desde wca_app.py la primera vez que se abre su pestaña,
+así las dependencias pesadas (plotly, pydeck, numpy...) solo se cargan cuando
+hacen falta.
+"""
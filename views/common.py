@@ -0,0 +1,41 @@
+"""Piezas compartidas por todas las pestañas (diccionario de eventos, tarjetas y progreso de trabajos)."""
+
+import streamlit as st
+
+event_dict = {
+            "333": "3x3x3", "222": "2x2x2", "444": "4x4x4", 
+            "555": "5x5x5", "666": "6x6x6", "777": "7x7x7", "333fm": "3x3x3 Fewest Moves",
+            "333bf": "3x3x3 Blindfolded", "333oh": "3x3x3 One-Handed", 
+            "minx": "Megaminx", "pyram": "Pyraminx", "skewb": "Skewb", 
+            "sq1": "Square-1", "clock": "Clock", "444bf": "4x4x4 Blindfolded",
+            "555bf": "5x5x5 Blindfolded", "333mbf": "3x3x3 Multi-Blind","333ft": "3x3x3 With Feet",
+            "magic": "Magic", "mmagic": "Master Magic",
+        } 
+
+def render_metric(label, value):
+    with st.container(border=True):
+        st.metric(label=label, value=value)
+
+def render_pr_card(title, time_str, comp_name, date_str):
+    with st.container(border=True):
+        st.markdown(f"""
+        <div class="pr-card-title">{title}</div>
+        <div class="pr-card-time">{time_str}</div>
+        <div class="pr-card-comp">📍 {comp_name}</div>
+        <div class="pr-card-date">📅 {date_str}</div>
+        <div style="height: 10px;"></div> """, unsafe_allow_html=True)
+
+def render_job_progress(job, label, unit="competitions"):
+    """
+    Barra de progreso de un trabajo de jobs.py. Se refresca sola cada segundo sin
+    bloquear la página y, cuando el trabajo termina, recarga la página para mostrar el resultado.
+    """
+    @st.fragment(run_every=1.0)
+    def poll():
+        if not job.running:
+            st.rerun()
+        text = f"{label} ({job.done}/{job.total} {unit})" if job.total else f"{label}..."
+        st.progress(job.fraction, text=text)
+        st.caption("You can keep browsing other tabs: the search continues in the background.")
+
+    poll()
@@ -0,0 +1,466 @@
+"""Pestaña Competitions: historial, mapa de viajes, heatmap de actividad y ficha de competición."""
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+import pydeck as pdk
+import functions as fn
+from views.common import event_dict
+
+def render_competitions_tab(data):
+    st.header("🌍 Competitions Hub")
+ 
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📜 History List", "🗺️ Travel Map", "🔥 Competition Heatmap", "📍 Near You", "🏟️ Competition Detail"])
+    
+    with tab1:
+        render_competition_list(data)
+        
+    with tab2:
+        render_competition_map(data)
+        
+    with tab3:
+        render_activity_heatmap(data)
+
+    with tab4:
+        render_nearby_competitions(data)
+
+    with tab5:
+        render_competition_detail(data)
+
+def render_activity_heatmap(data):
+    st.header("🗓️ Competition Heatmap")
+    activity = data["activity"]
+    if activity["monthly"].empty:
+        st.warning("No data available.")
+        return
+
+    # 1. Selector de escala de colores
+    colores_dict = {
+        "Blues 🔵": "Blues",
+        "Reds 🔴": "Reds",
+        "Greens 🟢": "Greens",
+        "Purples 🟣": "Purples",
+        "Orange and Sun ☀️": "YlOrRd",
+        "Glacier ❄️": "Ice",
+        "Viridis🌈": "Viridis"
+    }
+    
+    col_view, col_selector, _ = st.columns([1, 1, 1])
+    with col_view:
+        granularity = st.selectbox("View:", ["Monthly", "Yearly", "Daily calendar"], index=0)
+    with col_selector:
+        seleccion = st.selectbox("Choose the style of the map:", list(colores_dict.keys()), index=0)
+    
+    escala_elegida = colores_dict[seleccion]
+
+    if granularity == "Monthly":
+        fig = monthly_heatmap(activity["monthly"], escala_elegida)
+    elif granularity == "Yearly":
+        fig = yearly_heatmap(activity["yearly"], escala_elegida)
+    else:
+        years = sorted(activity["yearly"]["Year"].unique(), reverse=True)
+        year = st.selectbox("Year:", years, index=0)
+        fig = daily_calendar(activity["daily"], int(year), escala_elegida)
+
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=10, r=10, t=40, b=10),
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+def monthly_heatmap(monthly, colorscale):
+    pivot_df = monthly.pivot(index='Year', columns='Month', values='Count').fillna(0)
+    pivot_df = pivot_df.reindex(columns=range(1, 13), fill_value=0)
+    month_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+    # Cálculo de altura dinámica
+    # Base de 150px + 35px por cada año en el índice
+    num_years = len(pivot_df.index)
+    dynamic_height = 150 + (num_years * 35)
+
+    fig = go.Figure(data=go.Heatmap(
+        z=pivot_df.values,
+        x=month_names,
+        y=pivot_df.index.astype(str),
+        colorscale=colorscale,
+        xgap=3, 
+        ygap=3,
+        hovertemplate='<b>Año %{y}</b><br>Mes: %{x}<br>Competiciones: %{z}<extra></extra>'
+    ))
+    fig.update_layout(
+        height=dynamic_height, # Aplicamos la altura calculada
+        xaxis_nticks=12, 
+        xaxis=dict(side="top"), # Meses arriba para mejor lectura
+    )
+    return fig
+
+def yearly_heatmap(yearly, colorscale):
+    fig = go.Figure(data=go.Heatmap(
+        z=[yearly['Count'].to_numpy()],
+        x=yearly['Year'].astype(str),
+        y=["Comps"],
+        customdata=[yearly[['Rounds', 'Solves']].to_numpy()],
+        colorscale=colorscale,
+        xgap=3,
+        hovertemplate='<b>%{x}</b><br>Competiciones: %{z}<br>Rondas: %{customdata[0]}<br>Intentos: %{customdata[1]}<extra></extra>'
+    ))
+    fig.update_layout(height=180, xaxis=dict(side="top", type="category"))
+    return fig
+
+def daily_calendar(daily, year, colorscale):
+    """Calendario tipo GitHub: columnas = semanas, filas = días de la semana."""
+    days = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq="D")
+    cal = daily.reindex(days)
+    counts = cal['competitions'].fillna(0).to_numpy()
+
+    weekday = days.weekday.to_numpy()
+    # Semana relativa al lunes de la semana del 1 de enero
+    week = (np.arange(len(days)) + days[0].weekday()) // 7
+
+    z = np.full((7, week.max() + 1), np.nan)
+    z[weekday, week] = counts
+    text = np.full(z.shape, "", dtype=object)
+    names = cal['names'].fillna("").to_numpy()
+    rounds = cal['rounds'].fillna(0).to_numpy()
+    solves = cal['solves'].fillna(0).to_numpy()
+    labels = [
+        f"{d:%d %b %Y}" + (f"<br>{n}<br>~{r:.0f} rounds · ~{s_:.0f} solves" if n else "")
+        for d, n, r, s_ in zip(days, names, rounds, solves)
+    ]
+    text[weekday, week] = labels
+
+    fig = go.Figure(data=go.Heatmap(
+        z=z,
+        x=np.arange(z.shape[1]),
+        y=["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
+        text=text,
+        colorscale=colorscale,
+        showscale=False,
+        xgap=2,
+        ygap=2,
+        hovertemplate='%{text}<extra></extra>'
+    ))
+    month_starts = days[days.day == 1]
+    fig.update_layout(
+        height=250,
+        yaxis=dict(autorange="reversed"),
+        xaxis=dict(
+            side="top",
+            tickvals=((np.arange(len(days))[days.day == 1] + days[0].weekday()) // 7),
+            ticktext=[d.strftime('%b') for d in month_starts],
+        ),
+    )
+    return fig
+
+def render_competition_list(data):
+    st.header("📋 Competition History")
+    df = data["results"].copy()
+    
+    if not df.empty:
+        # 1. Agrupar obteniendo eventos únicos
+        comps = df.groupby(['CompName', 'CompDate', 'Country'])['Event'].unique().reset_index()
+        comps = comps.sort_values(by="CompDate", ascending=False)
+        
+        comps['Date'] = comps['CompDate'].dt.strftime('%Y-%m-%d')
+        comps['Location'] = comps['Country'].apply(lambda x: f"{fn.get_flag_emoji(x)} {fn.get_country_name(x)}")
+    
+        # --- PREPARAR EL ORDEN CORRECTO ---
+        wca_order_keys = list(event_dict.keys())
+
+        # 2. Generador de HTML con iconos
+        def get_event_icons_html(event_list):
+            html = '<div style="display: flex; flex-wrap: wrap; gap: 4px;">'
+            
+            # ### CORRECCIÓN DE ORDEN ###
+            # Ordenamos usando el índice en la lista de claves de event_dict.
+            # Si un evento no está en el dict (raro), lo mandamos al final (999).
+            sorted_events = sorted(
+                event_list, 
+                key=lambda x: wca_order_keys.index(x) if x in wca_order_keys else 999
+            )
+            # ############################
+
+            for ev in sorted_events:
+                icon_url = f"https://raw.githubusercontent.com/cubing/icons/main/src/svg/event/{ev}.svg"
+                html += f'<img src="{icon_url}" class="wca-icon" title="{event_dict.get(ev, ev)}">'
+            html += "</div>"
+            return html
+
+        comps['Events'] = comps['Event'].apply(get_event_icons_html)
+        final_view = comps[['Date', 'CompName', 'Location', 'Events']].rename(columns={'CompName': 'Competition'})
+        
+        # 3. Renderizar tabla HTML
+        table_html = final_view.to_html(index=False, escape=False)
+        
+        # --- CSS PARA EL SCROLL INTERNO Y ESTILO ---
+        st.markdown("""
+        <style>
+        .wca-scroll-container {
+            width: 100%;
+            overflow-x: auto; /* Permite scroll horizontal en móviles */
+            max-height: 450px; 
+            overflow-y: auto;
+            border: 1px solid rgba(49, 51, 63, 0.2);
+            border-radius: 8px;
+        }
+
+        .wca-table {
+            width: 100%;
+            min-width: 600px; /* Evita que las columnas se colapsen en pantallas pequeñas */
+            border-collapse: collapse;
+            font-family: sans-serif;
+            font-size: 14px;
+        }
+
+        /* Estilo para los Cabeceros */
+        .wca-table thead th {
+            position: sticky;
+            top: 0;
+            z-index: 10;
+            background-color: #e0e0e0; /* Gris claro para destacar */
+            color: #000000 !important; /* Texto negro forzado */
+            font-weight: bold;
+            padding: 12px;
+            text-align: left;
+            border-bottom: 2px solid #ccc;
+        }
+
+        .wca-table td {
+            padding: 12px;
+            text-align: left;
+            border-bottom: 1px solid rgba(128, 128, 128, 0.2);
+        }
+
+        /* Ajuste de Iconos para Modo Oscuro */
+        img.wca-icon {
+            width: 22px !important;
+            height: 22px !important;
+            object-fit: contain;
+            display: inline-block !important;
+            filter: none;
+        }
+
+        @media (prefers-color-scheme: dark) {
+            /* Invierte los iconos WCA de negro a blanco en modo oscuro */
+            img.wca-icon {
+                filter: invert(1) brightness(2);
+            }
+            /* Mantiene el cabecero legible en modo oscuro */
+            .wca-table thead th {
+                background-color: #cccccc; 
+                color: #000000 !important;
+            }
+            .wca-table td {
+                color: #ffffff;
+            }
+        }
+        </style>
+        """, unsafe_allow_html=True)
+
+        table_html = final_view.to_html(index=False, escape=False)
+        table_html = table_html.replace('<table border="1" class="dataframe">', '<table class="wca-table">')
+        st.markdown(f'<div class="wca-scroll-container">{table_html}</div>', unsafe_allow_html=True)
+
+def render_competition_map(data):
+    st.header("🌍 World Map of Competitions")
+    map_df = pd.DataFrame(data["map_data"])
+    
+    if map_df.empty:
+        st.warning("No location data available to display the map.")
+        return
+
+    # --- 1. Lógica de Jitter (Mantener para evitar solapamiento visual) ---
+    map_df['pos_key'] = map_df['lat'].astype(str) + map_df['lon'].astype(str)
+    metres_in_degrees = 0.000045 
+    
+    def apply_jitter(group):
+        if len(group) > 1:
+            for i in range(len(group)):
+                angle = 2 * np.pi * i / len(group)
+                group.iloc[i, group.columns.get_loc('lat')] += metres_in_degrees * np.cos(angle)
+                group.iloc[i, group.columns.get_loc('lon')] += metres_in_degrees * np.sin(angle)
+        return group
+
+    map_df = map_df.groupby('pos_key', group_keys=False).apply(apply_jitter)
+
+    # --- 2. Lógica para encontrar el centro más denso (NUEVO) ---
+    # Creamos columnas temporales redondeando las coordenadas (aprox. 1 grado ~ 111km)
+    # Esto agrupa competiciones que ocurrieron en la misma región/ciudad grande.
+    map_df['lat_cluster'] = map_df['lat'].round(0)
+    map_df['lon_cluster'] = map_df['lon'].round(0)
+    
+    # Encontramos el cluster con más ocurrencias
+    if not map_df.empty:
+        # idxmax devuelve el índice (lat, lon) del grupo más grande
+        densest_region = map_df.groupby(['lat_cluster', 'lon_cluster']).size().idxmax()
+        center_lat, center_lon = densest_region
+        initial_zoom = 5  # Zoom más cercano (nivel país/región)
+    else:
+        # Fallback por si acaso
+        center_lat = map_df['lat'].mean()
+        center_lon = map_df['lon'].mean()
+        initial_zoom = 1.5
+
+    view_state = pdk.ViewState(
+        latitude=center_lat, 
+        longitude=center_lon,
+        zoom=initial_zoom, 
+        pitch=0
+    )
+    
+    # --- 3. Renderizado ---
+    layer = pdk.Layer(
+        "ScatterplotLayer", map_df,
+        get_position='[lon, lat]', 
+        get_color='[255, 75, 75, 200]',
+        radius_min_pixels=5, 
+        radius_max_pixels=15,
+        pickable=True, 
+        stroked=True,
+        line_width_min_pixels=1, 
+        get_line_color=[255, 255, 255]
+    )
+    
+    st.pydeck_chart(pdk.Deck(
+        map_style='https://basemaps.cartocdn.com/gl/positron-gl-style/style.json',
+        initial_view_state=view_state, 
+        layers=[layer],
+        tooltip={"text": "{nombre}\n📅 {fecha}"}
+    ))
+
+def home_coordinates(map_data):
+    """Centro de la región (celda de ~1 grado) donde más competiciones ha hecho la persona."""
+    map_df = pd.DataFrame(map_data)
+    if map_df.empty:
+        return 40.4168, -3.7038  # Madrid por defecto
+    cluster = map_df.groupby([map_df['lat'].round(0), map_df['lon'].round(0)])
+    densest = cluster.size().idxmax()
+    home = cluster.get_group(densest)
+    return float(home['lat'].mean()), float(home['lon'].mean())
+
+def render_nearby_competitions(data):
+    import comp_store
+
+    st.header("📍 Competitions Near You")
+
+    home_lat, home_lon = home_coordinates(data["map_data"])
+
+    c1, c2, c3 = st.columns(3)
+    lat = c1.number_input("Latitude", value=round(home_lat, 4), min_value=-90.0, max_value=90.0, format="%.4f")
+    lon = c2.number_input("Longitude", value=round(home_lon, 4), min_value=-180.0, max_value=180.0, format="%.4f")
+    radius = c3.slider("Radius (km)", 10, 1000, 150, step=10)
+
+    f1, f2 = st.columns(2)
+    only_unvisited = f1.checkbox("Only competitions I haven't attended", value=True)
+    only_upcoming = f2.checkbox("Only upcoming competitions", value=False)
+
+    with st.spinner("Loading the competitions index..."):
+        store = comp_store.get_store()
+
+    start = pd.Timestamp.now().normalize() if only_upcoming else None
+    visited = data["results"]['Competition'].unique() if only_unvisited else ()
+    nearby = store.within_radius(lat, lon, radius, start=start, exclude=set(visited))
+
+    if nearby.empty:
+        st.info("No competitions found in this area.")
+        return
+
+    st.metric("Competitions found", len(nearby))
+
+    nearby['Date'] = nearby['date_start'].dt.strftime('%Y-%m-%d')
+    nearby['Location'] = nearby.apply(
+        lambda r: f"{fn.get_flag_emoji(r['country'])} {r['city']}", axis=1
+    )
+    nearby['Distance'] = nearby['distance_km'].round(0).astype(int).astype(str) + " km"
+    st.dataframe(
+        nearby[['Date', 'name', 'Location', 'Distance']].rename(columns={'name': 'Competition'}),
+        use_container_width=True, hide_index=True
+    )
+
+    layer = pdk.Layer(
+        "ScatterplotLayer", nearby[['lat', 'lon', 'name', 'Date']],
+        get_position='[lon, lat]',
+        get_color='[75, 75, 255, 200]',
+        radius_min_pixels=5,
+        radius_max_pixels=15,
+        pickable=True,
+    )
+    st.pydeck_chart(pdk.Deck(
+        map_style='https://basemaps.cartocdn.com/gl/positron-gl-style/style.json',
+        initial_view_state=pdk.ViewState(latitude=lat, longitude=lon, zoom=6, pitch=0),
+        layers=[layer],
+        tooltip={"text": "{name}\n📅 {Date}"}
+    ))
+
+def render_competition_detail(data):
+    st.header("🏟️ Competition Detail")
+
+    col_type, col_search = st.columns([1, 2])
+    with col_type:
+        mode = st.radio("Search mode:", ["My Competitions", "Manual ID"], key="detail_mode")
+
+    comp_id = None
+    with col_search:
+        if mode == "My Competitions":
+            df = data["results"]
+            if df.empty:
+                st.warning("No personal competition history found.")
+                return
+            comps_df = df[['CompName', 'CompDate', 'Competition']].drop_duplicates().sort_values(by='CompDate', ascending=False)
+            selected = st.selectbox("Select one of your comps:", comps_df['CompName'], key="detail_comp")
+            comp_id = comps_df[comps_df['CompName'] == selected].iloc[0]['Competition']
+        else:
+            comp_id = st.text_input("Enter WCA Competition ID:", placeholder="Example: SpanishChampionship2025", key="detail_id").strip()
+
+    if not comp_id:
+        return
+
+    with st.spinner("Loading competition..."):
+        wcif = fn.get_competition_wcif(comp_id)
+    if wcif is None:
+        st.warning(f"No public WCIF available for '{comp_id}'.")
+        return
+
+    competitors = wcif.competitors()
+    n_rounds = sum(len(rounds) for rounds in wcif.rounds.values())
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Competitors", len(competitors))
+    m2.metric("Events", len(wcif.rounds))
+    m3.metric("Rounds", n_rounds)
+    m4.metric("Days", wcif.number_of_days)
+
+    if any(p.wca_id == data["wca_id"] for p in competitors):
+        st.success(f"✅ You competed at **{wcif.name}**.")
+
+    st.subheader("🏁 Events and Rounds")
+    rounds = fn.get_wcif_rounds_table(wcif)
+    if not rounds.empty:
+        order = list(event_dict.keys())
+        rounds["order"] = rounds["Event"].map(lambda ev: order.index(ev) if ev in order else 999)
+        rounds = rounds.sort_values(["order", "Round"]).drop(columns="order")
+        rounds["Event"] = rounds["Event"].map(lambda ev: event_dict.get(ev, ev))
+        st.dataframe(rounds, use_container_width=True, hide_index=True)
+
+    st.subheader("🕒 Schedule")
+    show_groups = st.checkbox("Show groups", value=False, key="detail_groups")
+    schedule = fn.get_wcif_schedule(wcif, groups=show_groups)
+    if schedule.empty:
+        st.info("No schedule published.")
+    else:
+        for day, day_df in schedule.groupby("Day"):
+            with st.expander(f"📅 {day:%A, %d %B %Y}", expanded=len(schedule["Day"].unique()) == 1):
+                view = day_df.assign(
+                    Time=day_df["Start"].dt.strftime("%H:%M") + " – " + day_df["End"].dt.strftime("%H:%M")
+                )
+                st.dataframe(view[["Time", "Activity", "Room"]], use_container_width=True, hide_index=True)
+
+    st.subheader("🌐 Competitors by Country")
+    countries = pd.Series([p.country_iso2 for p in competitors if p.country_iso2]).value_counts()
+    if not countries.empty:
+        by_country = pd.DataFrame({
+            "Country": [f"{fn.get_flag_emoji(c)} {fn.get_country_name(c)}" for c in countries.index],
+            "Competitors": countries.to_numpy(),
+        })
+        st.dataframe(by_country, use_container_width=True, hide_index=True)
@@ -0,0 +1,199 @@
+"""Pestaña WCA Neighbours: cubers con los que más competiciones compartes y head-to-head."""
+
+import streamlit as st
+import pandas as pd
+import functions as fn
+import jobs
+from views.common import event_dict, render_job_progress
+
+def render_neighbours_tab(data):
+    st.header("🤝 WCA Neighbours")
+
+    tab_shared, tab_h2h = st.tabs(["👥 Shared Competitions", "⚔️ Head-to-Head"])
+    with tab_shared:
+        render_shared_competitions(data)
+    with tab_h2h:
+        render_head_to_head(data)
+
+def render_shared_competitions(data):
+    st.info("Find the cubers that have attended the most competitions with you!")
+
+    info = data['info']
+    wca_id = info.wca_id
+    results = data.get('results', pd.DataFrame())
+
+    if not wca_id or results.empty:
+        st.error("Insufficient data.")
+        return
+
+    # 1. Selección de año
+    years = sorted(results['CompDate'].dt.year.unique().astype(int), reverse=True)
+    options = ["All"] + [str(y) for y in years]
+    
+    col_sel, _ = st.columns([1, 2])
+    selected_year_opt = col_sel.selectbox("📅 Select a year", options)
+
+    # Una sola pasada por todas las competiciones, en segundo plano: "All" y cada año
+    # salen de la misma matriz, y el cálculo sigue aunque cambies de pestaña
+    job = jobs.get("neighbours", wca_id)
+    if job is None or job.status == "error":
+        if job is not None:
+            st.error(f"The last search failed: {job.error}")
+        if not st.button("Search neighbours"):
+            return
+        job = jobs.submit("neighbours", wca_id, fn.get_neighbour_matrix, wca_id, results)
+    if job.running:
+        render_job_progress(job, "Analyzing competitions")
+        return
+
+    matrix = job.result
+    df_neigh = fn.neighbours_for_year(matrix, selected_year_opt)
+
+    if df_neigh is not None and not df_neigh.empty:
+        # 2. Limpieza de datos
+        df_neigh = df_neigh.sort_values(by='Count', ascending=False).reset_index(drop=True)
+        df_neigh = df_neigh[df_neigh['WcaId'] != wca_id]
+
+        # --- LÓGICA DE PODIO ---
+        unique_counts = sorted(df_neigh['Count'].unique(), reverse=True)
+        podium_slots = []
+        ids_in_podium = []
+        current_total_people = 0
+
+        # Definimos medallas y colores
+        tiers = [
+            {"medal": "🥇", "color": "#FFD700"},
+            {"medal": "🥈", "color": "#C0C0C0"},
+            {"medal": "🥉", "color": "#CD7F32"}
+        ]
+
+        for count_value in unique_counts:
+            if current_total_people >= 3: break
+            
+            at_this_level = df_neigh[df_neigh['Count'] == count_value]
+            people_at_this_level = at_this_level['Name'].tolist()
+            tier = tiers[len(podium_slots)]
+            
+            podium_slots.append((people_at_this_level, tier["medal"], tier["color"], count_value))
+            ids_in_podium.extend(at_this_level['PersonId'])
+            current_total_people += len(people_at_this_level)
+
+        # --- RENDERIZADO DE PODIO ---
+        st.subheader(f"Top companions in {selected_year_opt}")
+        cols_podium = st.columns(len(podium_slots))
+
+        for i, (names, medal, color, count) in enumerate(podium_slots):
+            names_display = "<br>".join(names)
+            with cols_podium[i]:
+                st.markdown(f"""
+                <div style="background-color: {color}22; padding: 15px; border-radius: 15px; 
+                     border: 2px solid {color}; text-align: center; min-height: 200px; 
+                     display: flex; flex-direction: column; justify-content: center;">
+                    <h1 style="margin:0;">{medal}</h1>
+                    <div style="font-size: 24px; font-weight: 800; margin: 10px 0;">
+                        {count} <span style="font-size: 14px; font-weight: 400;">Comps</span>
+                    </div>
+                    <div style="font-size: 14px; line-height: 1.2;">{names_display}</div>
+                </div>
+                """, unsafe_allow_html=True)
+                
+        st.markdown("---")
+
+        # --- SECCIÓN RESTO DE LA LISTA ---
+        df_others = df_neigh[~df_neigh['PersonId'].isin(ids_in_podium)].head(20)
+        
+        if not df_others.empty:
+            with st.expander("See rest of cubers", expanded=True):
+                current_rank = len(ids_in_podium) + 1
+                max_count = df_neigh['Count'].max()
+                
+                others_grouped = df_others.groupby('Count', sort=False)
+                for count, group in others_grouped:
+                    num_people_in_tie = len(group)
+                    for _, row in group.iterrows():
+                        c1, c2 = st.columns([3, 1])
+                        c1.write(f"{current_rank}. **{row['Name']}**")
+                        c2.caption(f"{row['Count']} matches")
+                        st.progress(row['Count'] / max_count)
+                    current_rank += num_people_in_tie
+
+        with st.expander("📅 Per-year breakdown"):
+            top = matrix[matrix['PersonId'].isin(df_neigh['PersonId'].head(20))]
+            year_cols = sorted((c for c in matrix.columns if isinstance(c, int)), reverse=True)
+            st.dataframe(top.set_index('Name')[year_cols], use_container_width=True)
+
+        # Botón de descarga
+        st.download_button(
+            "Download complete list (CSV)",
+            df_neigh.drop(columns='PersonId').to_csv(index=False),
+            f"neighbours_wca_{selected_year_opt}.csv",
+            "text/csv"
+        )
+    else:
+        st.warning("No matches found.")
+
+def render_head_to_head(data):
+    import head_to_head as h2h
+
+    st.info("Who do you beat most often? Compares your position with every rival in the rounds you shared.")
+
+    wca_id = data['info'].wca_id
+    results = data['results']
+
+    pending = h2h.pending_competitions(results['Competition'].unique())
+    if pending:
+        # La descarga corre en segundo plano (jobs.py): sigue aunque cambies de pestaña
+        job = jobs.get("head_to_head", wca_id)
+        if job is None or job.status == "error":
+            if job is not None:
+                st.error(f"The last download failed: {job.error}")
+            if not st.button(f"Load results of your competitions ({len(pending)} to download)"):
+                return
+            job = jobs.submit("head_to_head", wca_id, h2h.load_for_profile, results)
+        if job.running:
+            render_job_progress(job, "Downloading competition results")
+            return
+
+    comp_names = results.drop_duplicates('Competition').set_index('Competition')['CompName']
+
+    # --- PODIOS ---
+    podiums = h2h.podiums(wca_id)
+    st.subheader("🏅 Podiums")
+    if podiums.empty:
+        st.caption("No podiums yet.")
+    else:
+        medals = podiums.pivot_table(index='Event', columns='Place', values='Competition', aggfunc='count', fill_value=0)
+        medals = medals.reindex(columns=[1, 2, 3], fill_value=0)
+        medals.columns = ["🥇", "🥈", "🥉"]
+        medals.index = [event_dict.get(ev, ev) for ev in medals.index]
+        c1, c2, c3 = st.columns(3)
+        c1.metric("🥇 Gold", int(medals["🥇"].sum()))
+        c2.metric("🥈 Silver", int(medals["🥈"].sum()))
+        c3.metric("🥉 Bronze", int(medals["🥉"].sum()))
+        st.dataframe(medals, use_container_width=True)
+
+    # --- RIVALES ---
+    st.subheader("⚔️ Rivals")
+    min_rounds = st.slider("Minimum shared rounds", 1, 20, 3)
+    rivals = h2h.head_to_head(wca_id, min_rounds=min_rounds)
+    if rivals.empty:
+        st.warning("No rivals with that many shared rounds.")
+        return
+
+    table = rivals.assign(**{"Win %": (rivals['WinRate'] * 100).round(0)})
+    st.dataframe(
+        table[['Name', 'Rounds', 'Wins', 'Losses', 'Ties', 'Competitions', 'Win %']].head(50),
+        use_container_width=True, hide_index=True,
+        column_config={"Win %": st.column_config.ProgressColumn("Win %", min_value=0, max_value=100, format="%d%%")},
+    )
+
+    labels = {f"{row.Name} ({row.rival_id})": row.rival_id for row in rivals.head(200).itertuples()}
+    selected = st.selectbox("Rivalry detail:", list(labels.keys()))
+    detail = h2h.rivalry(wca_id, labels[selected])
+    if not detail.empty:
+        detail.insert(0, 'CompName', detail['Competition'].map(comp_names).fillna(detail['Competition']))
+        for col in ['MyBest', 'RivalBest', 'MyAverage', 'RivalAverage']:
+            detail[col] = [fn.format_wca_time(v, ev) for v, ev in zip(detail[col], detail['Event'])]
+        detail['Event'] = detail['Event'].map(lambda ev: event_dict.get(ev, ev))
+        detail['Round'] = detail['Round'].map(lambda r: fn.ROUND_NAMES.get(r, r))
+        st.dataframe(detail.drop(columns='Competition'), use_container_width=True, hide_index=True)
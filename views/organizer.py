@@ -0,0 +1,84 @@
+"""Pestaña Organized comps: competiciones organizadas por el usuario."""
+
+import streamlit as st
+import functions as fn
+import jobs
+from views.common import render_job_progress
+
+def render_organizer_tab(data):
+    # Intentamos obtener el nombre real del usuario desde la info cargada
+    user_name = data["info"].name
+    
+    if not user_name:
+        st.error("Could not identify the organizer name from the WCA ID.")
+        return
+
+    st.header(f"📋 Competitions organized by {user_name}")
+
+    # La búsqueda recorre todas las páginas de competiciones: va en segundo plano (jobs.py),
+    # así sigue aunque cambies de pestaña y el resultado se reutiliza al volver
+    params = {"name": user_name}
+    job = jobs.get("organized", data["wca_id"], params)
+    if job is not None and job.status == "error":
+        st.error(f"The search failed: {job.error}")
+        if not st.button("Retry"):
+            return
+        job = None
+    if job is None:
+        job = jobs.submit("organized", data["wca_id"], fn.get_organized_competitions, user_name, params=params)
+    if job.running:
+        render_job_progress(job, f"Searching organized competitions for {user_name}", unit="pages")
+        return
+    df_org = job.result
+
+    if df_org.empty:
+        st.warning(f"No organized competitions found for '{user_name}'. Check if the WCA name matches exactly.")
+        return
+
+    # 1. Total arriba
+    st.metric("Total Organized", len(df_org))
+    st.divider()
+
+    # 2. Mosaico por años
+    # Obtenemos años únicos ordenados descendentemente
+    years = sorted(df_org['Year'].unique(), reverse=True)
+
+    # 2. Mosaico por años
+    # Obtenemos años únicos ordenados descendentemente
+    years = sorted(df_org['Year'].unique(), reverse=True)
+
+    for year in years:
+        # Filtramos primero para poder contar
+        comps_year = df_org[df_org['Year'] == year]
+        count_year = len(comps_year)
+        
+        # Mostramos Año y Cantidad entre paréntesis
+        st.subheader(f"{year} ({count_year})")
+        
+        # Creamos un grid de 5 columnas para las tarjetas
+        cols = st.columns(5)
+        for idx, (_, row) in enumerate(comps_year.iterrows()):
+            with cols[idx % 5]:
+                with st.container(border=True):
+                    st.markdown(f"**{row['Nombre']}**")
+                    st.caption(f"📍 {row['city']}, {row['country']}")
+                    
+                    # --- LÓGICA DE FECHAS (Incluye la mejora de la respuesta anterior) ---
+                    start = row['date_start']
+                    end = row['date_end']
+                    days = row['no_days']
+
+                    if days > 1:
+                        if start.month == end.month:
+                            date_str = f"{start.strftime('%d')} - {end.strftime('%d %b')}"
+                        else:
+                            date_str = f"{start.strftime('%d %b')} - {end.strftime('%d %b')}"
+                    else:
+                        date_str = start.strftime('%d %b')
+                    
+                    st.text(f"📅 {date_str}")
+                    # ---------------------------------------------------------------------
+                    
+                    # Link a la web de la WCA
+                    wca_url = f"https://www.worldcubeassociation.org/competitions/{row['id']}"
+                    st.markdown(f"[View on WCA]({wca_url})")
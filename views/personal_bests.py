@@ -0,0 +1,92 @@
+"""Pestaña Personal Bests: tarjetas de PB filtrables por periodo."""
+
+import streamlit as st
+import pandas as pd
+import functions as fn
+from views.common import event_dict, render_pr_card
+
+def render_personal_bests_cards(data):
+    st.header("🏆 Personal Bests")
+    df = data["results"].copy()
+    if df.empty: return
+
+    # Definimos la referencia temporal real (Hoy)
+    today = pd.Timestamp.now().normalize() 
+
+    # --- SECCIÓN DE FILTROS ---
+    with st.expander("📅 Time period", expanded=True):
+        c1, c2 = st.columns([1, 2])
+        
+        filter_type = c1.selectbox(
+            "Select the period:", 
+            ["All Time", "Past Year", "Current Year", "Custom Range"]
+        )
+        
+        df_filtered = df.copy()
+
+        if filter_type == "Past Year":
+            # Un año exacto hacia atrás desde hoy
+            start_date = today - pd.DateOffset(years=1)
+            df_filtered = df[(df['CompDate'] >= start_date) & (df['CompDate'] <= today)]
+            st.info(f"Mostrando resultados desde el {start_date.strftime('%d/%m/%Y')} hasta hoy.")
+
+        elif filter_type == "Current Year":
+            # Desde el 1 de enero del año actual
+            start_date = pd.Timestamp(year=today.year, month=1, day=1)
+            df_filtered = df[(df['CompDate'] >= start_date) & (df['CompDate'] <= today)]
+            st.info(f"Showing only results from  {today.year}")
+
+        elif filter_type == "Custom Range":
+            min_comp = df['CompDate'].min().to_pydatetime()
+            date_range = c2.date_input(
+                "Custom Range:",
+                value=(min_comp, today.to_pydatetime()),
+                max_value=today.to_pydatetime()
+            )
+            if isinstance(date_range, tuple) and len(date_range) == 2:
+                df_filtered = df[(df['CompDate'] >= pd.to_datetime(date_range[0])) & 
+                                 (df['CompDate'] <= pd.to_datetime(date_range[1]))]
+
+    # Reemplazamos el DF original por el filtrado para los cálculos de PB
+    df = df_filtered
+
+    if df.empty:
+        if filter_type == "All Time":
+            st.warning("No results found. Have you competed yet? 😉")
+        elif filter_type == "Current Year":
+            st.warning("No results this year. Time to go to a comp!! 😉")
+        else:
+            st.warning("No results in this period!")
+        return
+
+    # Orden de eventos estándar
+    ordered_events = [k for k in event_dict.keys() if k in df['Event'].unique()]
+
+    for event_code in ordered_events:
+        event_name = event_dict.get(event_code, event_code)
+        ev_df = df[df['Event'] == event_code]
+        
+        # Lógica mejorada para encontrar PB
+        best_single_row = ev_df[ev_df['best_cs'] > 0].sort_values(by=['best_cs', 'CompDate']).iloc[0] if not ev_df[ev_df['best_cs'] > 0].empty else None
+        best_avg_row = ev_df[ev_df['avg_cs'] > 0].sort_values(by=['avg_cs', 'CompDate']).iloc[0] if not ev_df[ev_df['avg_cs'] > 0].empty else None
+
+        if best_single_row is None and best_avg_row is None: continue
+
+        st.subheader(event_name)
+        c1, c2 = st.columns(2)
+
+        with c1:
+            if best_single_row is not None:
+                s_time = fn.format_wca_time(best_single_row['best_cs'], event_code=event_code)
+                s_date = best_single_row['CompDate'].strftime('%d %b %Y') if pd.notnull(best_single_row['CompDate']) else "Unknown"
+                render_pr_card("SINGLE", s_time, best_single_row['CompName'], s_date)
+            else:
+                st.info("No Single result")
+
+        with c2:
+            if best_avg_row is not None:
+                a_time = fn.format_wca_time(best_avg_row['avg_cs'], event_code=event_code)
+                a_date = best_avg_row['CompDate'].strftime('%d %b %Y') if pd.notnull(best_avg_row['CompDate']) else "Unknown"
+                render_pr_card("AVERAGE", a_time, best_avg_row['CompName'], a_date)
+            else:
+                st.write("")
@@ -0,0 +1,243 @@
+"""Pestaña Progression: evolución de PBs y comparación entre años."""
+
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+import functions as fn
+
+def render_progression(data):
+    st.header("📈 Personal Best Progression")
+    
+    # Check for data
+    if 'results' not in data:
+        st.warning("No results found.")
+        return
+
+    df = data["results"]
+    if df.empty: 
+        st.warning("No data available.")
+        return
+
+    # Dictionary of available events in the user's data
+    # (assuming event_dict is available globally or imported from functions)
+    # If event_dict is not in scope, we define a basic one or use the keys from df
+    # For safety, I will assume event_dict exists as in previous context, 
+    # but I'll add a fallback just in case.
+    event_dict_local = {
+        '333': '3x3x3', '222': '2x2x2', '444': '4x4x4', '555': '5x5x5',
+        '666': '6x6x6', '777': '7x7x7', '333bf': '3x3x3 Blindfolded',
+        '333fm': '3x3x3 Fewest Moves', '333oh': '3x3x3 One-Handed',
+        'clock': 'Clock', 'minx': 'Megaminx', 'pyram': 'Pyraminx',
+        'skewb': 'Skewb', 'sq1': 'Square-1', '444bf': '4x4x4 Blindfolded',
+        '555bf': '5x5x5 Blindfolded', '333mbf': '3x3x3 Multi-Blind'
+    }
+    
+    # Filter available events
+    available_events_codes = [e for e in event_dict_local.keys() if e in df['Event'].unique()]
+    
+    # Map Name -> Code
+    opts = {event_dict_local.get(e, e): e for e in available_events_codes}
+    
+    # --- SECTION 1: EVOLUTION GRAPH (Single Selection Only) ---
+    st.subheader("Evolution Graph")
+    
+    c1, c2 = st.columns([3, 1])
+    with c1:
+        # "All Events" removed here as requested
+        sel_name_graph = st.selectbox("Select Event (Graph):", list(opts.keys()), key="event_graph")
+    with c2:
+        type_sel_graph = st.selectbox("Type (Graph):", ["Single", "Average"], key="type_graph")
+
+    sel_code_graph = opts[sel_name_graph]
+    kind_graph = 'single' if type_sel_graph == "Single" else 'average'
+
+    # Series precalculadas en load_profile: cambiar de evento es solo un lookup
+    series = data["progression"].get((sel_code_graph, kind_graph))
+    
+    if series is not None:
+        if sel_code_graph == "333mbf":
+            y_label = "Points (Solved - Missed)"
+            marker_color = '#4B4BFF'
+        else:
+            y_label = "Moves" if sel_code_graph == "333fm" else "Time (s)"
+            marker_color = '#FF4B4B'
+
+        # Plot
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=series["dates"], 
+            y=series["values"], 
+            mode='lines+markers', 
+            name='Personal Best', 
+            line=dict(color=marker_color, shape='hv')
+        ))
+        
+        fig.update_layout(
+            title=f"{sel_name_graph} Progression",
+            yaxis_title=y_label,
+            margin=dict(l=20, r=20, t=40, b=20),
+            height=350
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("No data available for this selection.")
+
+    st.divider()
+
+    # --- SECTION 2: YEAR-OVER-YEAR COMPARISON ---
+    st.markdown("### 🗓️ Year-over-Year Comparison")
+    
+    cc1, cc2 = st.columns([3, 1])
+    with cc1:
+        # "All Events" added here
+        comp_options = ["All Events"] + list(opts.keys())
+        sel_name_comp = st.selectbox("Select Event (Comparison):", comp_options, key="event_comp")
+    with cc2:
+        type_sel_comp = st.selectbox("Type (Comparison):", ["Single", "Average"], key="type_comp")
+
+    # Determine which events to process
+    if sel_name_comp == "All Events":
+        events_to_compare = available_events_codes
+    else:
+        events_to_compare = [opts[sel_name_comp]]
+
+    # Años con alguna competición, aunque no dejaran ningún resultado válido (solo DNF):
+    # la matriz (evento, tipo) x año de load_profile solo tiene columnas para los años con
+    # marca, así que se reindexa y esos años quedan como huecos (NaN)
+    comp_years = data["results"]["CompDate"].dt.year.dropna().astype(int).unique()
+    all_years = sorted(set(comp_years.tolist()) | set(data["yearly_bests"].columns), reverse=True)
+    yearly_bests = data["yearly_bests"].reindex(columns=sorted(all_years))
+    kind_comp = 'single' if type_sel_comp == "Single" else 'average'
+    
+    if len(all_years) < 2:
+        st.info("You need results in at least two different years to compare.")
+        return
+
+    y_col1, y_col2 = st.columns(2)
+    with y_col1:
+        year1 = st.selectbox("Year 1 (Base):", all_years, index=min(1, len(all_years)-1), key="y1")
+    with y_col2:
+        year2 = st.selectbox("Year 2 (Target):", all_years, index=0, key="y2")
+
+# --- LOOP THROUGH EVENTS ---
+    found_any = False
+    
+    for code in events_to_compare:
+        if (code, kind_comp) not in yearly_bests.index:
+            continue
+
+        # Get best result for Year 1 and Year 2
+        event_years = yearly_bests.loc[(code, kind_comp)]
+        best_y1 = event_years[year1]
+        best_y2 = event_years[year2]
+
+        if pd.isna(best_y1) and pd.isna(best_y2):
+            continue
+
+        found_any = True
+        event_name = event_dict_local.get(code, code)
+        is_mbld_comp = (code == "333mbf")
+        
+        if pd.isna(best_y1) or pd.isna(best_y2):
+            # Un año sin marca en este evento: hueco vacío, sin mejora que calcular
+            val1_str = "—" if pd.isna(best_y1) else fn.format_wca_time(int(best_y1), event_code=code)
+            val2_str = "—" if pd.isna(best_y2) else fn.format_wca_time(int(best_y2), event_code=code)
+            delta_val = percent = None
+
+        elif is_mbld_comp:
+            # Lógica de Puntos para MBLD
+            p1, p2 = (int(p) for p in fn.decode_mbld([best_y1, best_y2])[0])
+            diff = p2 - p1
+            percent = ((p2 - p1) / p1 * 100) if p1 > 0 else 100.0 
+            val1_str = f"{p1} pts"
+            val2_str = f"{p2} pts"
+            delta_val = f"{diff} pts"
+        
+        else:
+            # Lógica para Tiempos y FMC
+            best_y1, best_y2 = int(best_y1), int(best_y2)
+            is_fmc_c = (code == "333fm")
+            # En WCA, los tiempos están en centésimas (cs)
+            diff_cs = int(best_y1 - best_y2) 
+            percent = ((best_y1 - best_y2) / best_y1) * 100
+            
+            val1_str = fn.format_wca_time(best_y1, event_code=code)
+            val2_str = fn.format_wca_time(best_y2, event_code=code)
+
+            # FORMATEO DE LA MEJORA (Improvement)
+            if is_fmc_c:
+                delta_val = f"{diff_cs} moves" if type_sel_comp == "Single" else f"{diff_cs / fn.FMC_AVERAGE_SCALE:.2f} moves"
+            else:
+                # Si la mejora es de 60s o más, formateamos como M:SS.cc
+                abs_diff = abs(diff_cs)
+                if abs_diff >= 6000:
+                    mins = abs_diff // 6000
+                    secs = (abs_diff % 6000) // 100
+                    cents = abs_diff % 100
+                    # Añadimos signo negativo si empeoró (best_y2 > best_y1)
+                    sign = "-" if diff_cs < 0 else ""
+                    delta_val = f"{sign}{mins}:{secs:02d}.{cents:02d}s"
+                else:
+                    delta_val = f"{diff_cs/100:.2f}s"
+
+        # Renderizado de métricas
+        if sel_name_comp == "All Events":
+            st.markdown(f"#### {event_name}")
+            
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric(f"PB {year1}", val1_str)
+        m2.metric(f"PB {year2}", val2_str)
+        
+        # La delta se muestra verde si es positiva (mejora)
+        # En tiempos, diff_cs es positivo si el tiempo bajó.
+        if delta_val is None:
+            m3.metric("Improvement", "—")
+            m4.metric("Percentage", "—")
+        else:
+            m3.metric("Improvement", delta_val, delta=delta_val)
+            m4.metric("Percentage", f"{percent:.1f}%", delta=f"{percent:.1f}%")
+        
+        if sel_name_comp == "All Events":
+            st.divider()
+
+    if not found_any and sel_name_comp == "All Events":
+        st.info(f"No events found with data in {year1} or {year2}.")
+    elif not found_any and sel_name_comp != "All Events":
+        st.info(f"No data for {sel_name_comp} in the selected years.")
+
+    render_yearly_trend(yearly_bests, events_to_compare, kind_comp, sel_name_comp, event_dict_local)
+
+def render_yearly_trend(yearly_bests, events, kind, sel_name, names):
+    """Tendencia del mejor resultado de cada año (lookups sobre la matriz precalculada)."""
+    rows = [(code, yearly_bests.loc[(code, kind)].dropna()) for code in events
+            if (code, kind) in yearly_bests.index]
+    rows = [(code, years) for code, years in rows if len(years) >= 2]
+    if not rows:
+        return
+
+    st.markdown("### 📉 Multi-year Trend")
+    fig = go.Figure()
+    if sel_name == "All Events":
+        # Cada evento relativo a su primer año (100% = primer año; menos es mejor,
+        # salvo en Multi-Blind donde se comparan puntos)
+        for code, years in rows:
+            units = fn.to_plot_units(years.to_numpy(), code, kind)
+            if units[0] == 0:
+                continue
+            fig.add_trace(go.Scatter(x=years.index, y=units / units[0] * 100,
+                                     mode='lines+markers', name=names.get(code, code)))
+        y_label = "% of first year's best"
+    else:
+        code, years = rows[0]
+        fig.add_trace(go.Scatter(x=years.index, y=fn.to_plot_units(years.to_numpy(), code, kind),
+                                 mode='lines+markers', name=names.get(code, code),
+                                 line=dict(color='#FF4B4B')))
+        y_label = "Points" if code == "333mbf" else "Moves" if code == "333fm" else "Time (s)"
+
+    fig.update_layout(
+        xaxis=dict(dtick=1),
+        yaxis_title=y_label,
+        margin=dict(l=20, r=20, t=20, b=20),
+        height=350
+    )
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,219 @@
+"""Pestaña Scrambles: explorador de scrambles por competición."""
+
+import html
+import urllib.parse
+import streamlit as st
+import streamlit.components.v1 as components
+import functions as fn
+import scramble_index
+from views.common import event_dict
+from models import parse_activity_code
+
+# --- CONFIGURACIÓN Y MAPEOS ---
+TWIZZLE_PUZZLE_MAP = {
+    '333': '3x3x3', '222': '2x2x2', '444': '4x4x4', '555': '5x5x5', '666': '6x6x6', '777': '7x7x7',
+    '333oh': '3x3x3', '333bf': '3x3x3', '333fm': '3x3x3',
+    'minx': 'megaminx', 'pyram': 'pyraminx', 'skewb': 'skewb', 'clock': 'clock', 'sq1': 'square1',
+    '444bf': '4x4x4', '555bf': '5x5x5', '333mbf': '3x3x3'
+}
+WCA_EVENT_MAP = {
+    '333': '333', '222': '222', '444': '444', '555': '555', '666': '666', '777': '777',
+    '333oh': '333', '333bf': '333', 'minx': 'minx', 'pyram': 'pyram', 
+    'skewb': 'skewb', 'clock': 'clock', 'sq1': 'sq1', '444bf': '444', '555bf': '555'
+}
+
+def render_scrambles(data):
+    st.header("🔀 Scrambles Explorer")
+
+    tab_explorer, tab_search = st.tabs(["📂 By competition", "🔎 Search"])
+    with tab_explorer:
+        render_scramble_explorer(data)
+    with tab_search:
+        render_scramble_search()
+
+def render_scramble_explorer(data):
+    # --- CSS PARA ARREGLAR MÓVILES ---
+    st.markdown("""
+        <style>
+            /* Optimizar espaciado en contenedores para móviles */
+            [data-testid="stVerticalBlock"] {
+                gap: 0.5rem;
+            }
+        </style>
+    """, unsafe_allow_html=True)
+
+
+    # --- 2. SELECCIÓN DE COMPETICIÓN ---
+    col_type, col_search = st.columns([1, 2])
+    with col_type:
+        mode = st.radio("Search mode:", ["My Competitions", "Manual ID"])
+
+    comp_id = None
+    if mode == "My Competitions":
+        df = data.get("results", None)
+        if df is not None and not df.empty:
+            comps_df = df[['CompName', 'CompDate', 'Competition']].drop_duplicates().sort_values(by='CompDate', ascending=False)
+            selected_comp_name = st.selectbox("Select one of your comps:", comps_df['CompName'])
+            comp_id = comps_df[comps_df['CompName'] == selected_comp_name].iloc[0]['Competition']
+        else:
+            st.warning("No personal competition history found.")
+    else:
+        comp_id = st.text_input("Enter WCA Competition ID:", placeholder="Example: SpanishChampionship2025").strip()
+
+    if not comp_id: return
+
+    # --- 3. CARGA DE DATOS ---
+    scramble_data = load_scrambles(comp_id)
+    if not scramble_data:
+        st.warning(f"No public scrambles available for '{comp_id}'.")
+        return
+
+    st.info(f"Showing: **{comp_id}**")
+    
+    # --- 4. SELECTORES Y VISTA ---
+    col_sel1, col_sel2 = st.columns(2)
+    with col_sel1:
+        selected_event_code = st.selectbox("Event:", list(scramble_data.keys()))
+    with col_sel2:
+        available_rounds = sorted(scramble_data[selected_event_code].keys(), key=lambda r: fn.ROUND_ORDER.get(r, 99))
+        round_options = {fn.ROUND_NAMES.get(r, f"Round {r}"): r for r in available_rounds}
+        selected_round_code = round_options[st.selectbox("Round:", list(round_options.keys()))]
+
+    # Formato, límites y horario de los grupos salen del WCIF (la misma descarga que usa la ficha)
+    wcif = fn.get_competition_wcif(comp_id)
+    wcif_round, group_times = None, {}
+    if wcif is not None:
+        # Las rondas del WCIF van numeradas en orden: la i-ésima de scrambles es la ronda i+1
+        number = available_rounds.index(selected_round_code) + 1
+        wcif_round = next((r for r in wcif.rounds_for(selected_event_code) if r.number == number), None)
+        schedule = fn.get_wcif_schedule(wcif, groups=True)
+        if not schedule.empty:
+            for code, start in zip(schedule["Code"], schedule["Start"]):
+                ev, rnd, grp = parse_activity_code(code)
+                if ev == selected_event_code and rnd == number and grp is not None:
+                    # Los scrambles nombran los grupos con letras (A, B...) y el WCIF con números (g1, g2...)
+                    group_times[chr(ord("A") + grp - 1)] = start.strftime("%a %H:%M")
+    if wcif_round is not None:
+        details = [fn.WCIF_FORMAT_NAMES.get(wcif_round.format, wcif_round.format or "")]
+        if wcif_round.time_limit_cs:
+            details.append(f"Time limit {fn.format_wca_time(wcif_round.time_limit_cs)}")
+        if wcif_round.cutoff_attempts:
+            details.append(f"Cutoff {wcif_round.cutoff_attempts} @ {fn.format_wca_time(wcif_round.cutoff_cs, selected_event_code)}")
+        st.caption(" · ".join(d for d in details if d))
+
+    view_type = st.segmented_control("View:", ["2D", "3D"], default="2D")
+    st.divider()
+
+    # --- 5. RENDERIZADO: toda la ronda en un único componente HTML cacheado ---
+    # El 333mbf no tiene visualización útil (son varios cubos por intento)
+    if selected_event_code == '333mbf':
+        return
+    groups_data = scramble_data[selected_event_code][selected_round_code]
+    round_html, height = render_round_html(
+        comp_id, selected_event_code, selected_round_code, view_type or "2D", group_times, _groups=groups_data
+    )
+    components.html(round_html, height=height, scrolling=True)
+
+# Alturas (px) para calcular la del iframe sin medir nada en el navegador
+GROUP_HEADER_HEIGHT = 56
+SCRAMBLE_ROW_HEIGHT = 210
+MAX_COMPONENT_HEIGHT = 4000
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_scrambles(comp_id):
+    return fn.get_scrambles(comp_id)
+
+@st.cache_data(ttl=24 * 3600, max_entries=200, show_spinner=False)
+def render_round_html(comp_id, event_code, round_code, view_type, group_times, _groups):
+    """
+    HTML de una ronda completa (grupos, scrambles, enlaces a Twizzle y visualizaciones)
+    en un solo fragmento, cacheado por (competición, evento, ronda, vista). Devuelve (html, altura).
+    """
+    puzzle_twizzle = TWIZZLE_PUZZLE_MAP.get(event_code, '3x3x3')
+    puzzle_wca = WCA_EVENT_MAP.get(event_code, '333')
+
+    parts = []
+    n_rows = 0
+    for g_id in sorted(_groups.keys()):
+        when = f" · 🕒 {html.escape(group_times[g_id])}" if g_id in group_times else ""
+        rows = []
+        for item in _groups[g_id]:
+            scram_str = item['scramble'].replace('\n', ' ') if event_code == 'minx' else item['scramble']
+            label_num = f"E{item['num']}" if item.get('is_extra') else f"{item['num']}"
+            twizzle_url = f"https://alpha.twizzle.net/edit/?setup-alg={urllib.parse.quote(scram_str)}&puzzle={puzzle_twizzle}"
+            rows.append(f"""
+            <div class="scramble">
+                <scramble-display event="{puzzle_wca}" scramble="{html.escape(scram_str)}" visualization="{view_type}"></scramble-display>
+                <div class="text">
+                    <div class="head"><b>{label_num}.</b>
+                        <a href="{html.escape(twizzle_url)}" target="_blank"><button>See in 🌐 Twizzle</button></a>
+                    </div>
+                    <code>{html.escape(scram_str)}</code>
+                </div>
+            </div>""")
+        n_rows += len(rows)
+        parts.append(f'<div class="group"><h3>📂 Group {html.escape(str(g_id))}{when}</h3>{"".join(rows)}</div>')
+
+    page = f"""
+    <script src="https://cdn.cubing.net/v0/js/scramble-display" type="module"></script>
+    <style>
+        body {{ margin: 0; font-family: "Source Sans Pro", sans-serif; background: transparent; }}
+        .group {{ border: 1px solid #ddd; border-radius: 8px; padding: 0 12px 8px; margin-bottom: 12px; }}
+        .group h3 {{ margin: 10px 0; }}
+        .scramble {{ display: flex; gap: 12px; align-items: center; height: {SCRAMBLE_ROW_HEIGHT - 10}px; }}
+        .scramble + .scramble {{ border-top: 1px solid rgba(0,0,0,0.1); }}
+        scramble-display {{ flex: 0 0 28%; height: 100%; max-width: 100%; --scramble-display-bg-color: transparent; }}
+        .text {{ flex: 1; min-width: 0; }}
+        .head {{ display: flex; justify-content: space-between; align-items: center; margin-bottom: 6px; }}
+        button {{ font-size: 10px; cursor: pointer; border-radius: 5px; border: 1px solid #ddd; padding: 2px 6px;
+                  background-color: #f9f9f9; }}
+        /* Forzar que el código salte de línea y no se salga de la pantalla */
+        code {{ display: block; white-space: pre-wrap; word-break: break-word; font-size: 0.85rem;
+                background: #f6f6f6; border-radius: 6px; padding: 8px; }}
+        /* En móvil la imagen va encima del texto (el iframe tiene scroll si no cabe) */
+        @media (max-width: 600px) {{
+            .scramble {{ flex-direction: column; align-items: stretch; height: auto; padding: 6px 0; }}
+            scramble-display {{ height: 160px; }}
+        }}
+    </style>
+    {"".join(parts)}
+    """
+    height = len(parts) * GROUP_HEADER_HEIGHT + n_rows * SCRAMBLE_ROW_HEIGHT + 20
+    return page, min(height, MAX_COMPONENT_HEIGHT)
+
+def render_scramble_search():
+    st.info("Search a scramble or a sequence of moves in every competition you have opened here.")
+
+    stats = scramble_index.stats()
+    c_stats, c_backfill = st.columns([3, 1])
+    c_stats.caption(f"{stats['scrambles']:,} scrambles from {stats['competitions']:,} competitions indexed.")
+    if c_backfill.button("Index cached scrambles"):
+        with st.spinner("Indexing..."):
+            added, failed = scramble_index.index_cached()
+        st.toast(f"{added} competitions added to the index."
+                 + (f" {failed} could not be written." if failed else ""))
+        stats = scramble_index.stats()
+
+    col_q, col_ev = st.columns([3, 1])
+    query = col_q.text_input("Moves:", placeholder="Example: R U R' U'")
+    events = ["All"] + sorted(stats["events"], key=lambda ev: event_dict.get(ev, ev))
+    event = col_ev.selectbox("Event:", events, format_func=lambda ev: event_dict.get(ev, ev))
+    c1, c2 = st.columns(2)
+    whole_moves = c1.checkbox("Whole moves only", value=True, help="'R U' does not match 'R U2'")
+    starts_with = c2.checkbox("Scramble starts with it")
+
+    if not query.strip():
+        return
+
+    hits = scramble_index.search(
+        query, event_id=None if event == "All" else event, whole_moves=whole_moves, starts_with=starts_with
+    )
+    if hits.empty:
+        st.warning("No scrambles found.")
+        return
+
+    st.caption(f"{len(hits)} matches" + (" (first ones only)" if len(hits) >= 500 else ""))
+    hits['Event'] = hits['Event'].map(lambda ev: event_dict.get(ev, ev))
+    hits['Round'] = hits['Round'].map(lambda r: fn.ROUND_NAMES.get(r, r))
+    hits['Number'] = [f"E{n}" if extra else str(n) for n, extra in zip(hits['Number'], hits['IsExtra'])]
+    st.dataframe(hits.drop(columns='IsExtra'), use_container_width=True, hide_index=True)
@@ -0,0 +1,228 @@
+"""Pestaña Statistics: reparto de rondas, PRs por evento y estadísticas por intento."""
+
+import numpy as np
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import functions as fn
+import solve_stats
+from views.common import event_dict
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_solve_stats(wca_id, _results):
+    # La clave de caché es el WCA ID (el DataFrame no se hashea, por eso el "_")
+    return solve_stats.compute_solve_stats(_results)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_mbld_fmc_stats(wca_id, _results):
+    attempts = solve_stats.mbld_attempts(_results)
+    return attempts, solve_stats.mbld_summary(attempts), solve_stats.fmc_means(_results)
+
+def format_average(value, event_code):
+    """Formatea una media (float) de solve_stats: inf = DNF, None = sin datos."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return "-"
+    if np.isinf(value):
+        return "DNF"
+    if event_code == "333fm":
+        return f"{value:.2f} moves"
+    return fn.format_wca_time(int(round(value)), event_code=event_code)
+
+def render_statistics(data):
+    st.header("📊 Statistics")
+
+    tab_overview, tab_solves, tab_special = st.tabs(["📊 Overview", "⏱️ Solve Statistics", "🧠 Multi-Blind & FMC"])
+    with tab_overview:
+        render_statistics_overview(data)
+    with tab_solves:
+        render_solve_statistics(data)
+    with tab_special:
+        render_mbld_fmc_statistics(data)
+
+def render_statistics_overview(data):
+    df = data["results"]
+    if not df.empty:
+        c1, c2 = st.columns(2)
+        with c1:
+            with c1:
+                st.subheader("Round Breakdown")
+                event_counts = df['Event'].value_counts().reset_index()
+                event_counts.columns = ['EventID', 'Count']
+                
+                event_order = list(event_dict.keys())
+                event_counts['sort_order'] = event_counts['EventID'].apply(
+                    lambda x: event_order.index(x) if x in event_order else 999
+                )
+                
+                # Ordenar y limpiar
+                event_counts = event_counts[event_counts['sort_order'] != 999].sort_values('sort_order')
+                event_counts['Event Name'] = event_counts['EventID'].map(event_dict)
+                
+                # Dibujar con Plotly asegurando que no re-ordene por tamaño
+                fig = px.pie(event_counts, values='Count', names='Event Name', hole=0.5)
+                fig.update_traces(sort=False) # IMPORTANTE: Esto mantiene nuestro orden
+                st.plotly_chart(fig, use_container_width=True)
+
+        with c2:
+            with c2:
+                st.subheader("PR Count by Event")
+                # 1. Obtener los PRs ignorando el total
+                pr_data = data["stats_prs"].copy()
+                pr_data.pop('total', None)
+                
+                if pr_data:
+                    # 2. Crear DataFrame
+                    pr_df = pd.DataFrame(list(pr_data.items()), columns=['EventID', 'Count'])
+                    
+                    # 3. Definir el orden estricto basado en tu event_dict
+                    event_order = list(event_dict.keys())
+                    
+                    # 4. Crear columna de orden: si el evento no está en el dict, va al final (999)
+                    pr_df['sort_order'] = pr_df['EventID'].apply(
+                        lambda x: event_order.index(x) if x in event_order else 999
+                    )
+                    
+                    # 5. Filtrar eventos "fantasma" o muy antiguos que no quieras (opcional)
+                    # Si quieres que 333ft no aparezca si no está en tu dict:
+                    pr_df = pr_df[pr_df['sort_order'] != 999]
+                    
+                    # 6. Mapear los nombres amigables (333 -> 3x3x3)
+                    pr_df['Event Name'] = pr_df['EventID'].map(event_dict)
+                    
+                    # 7. Ordenar físicamente el DataFrame
+                    pr_df = pr_df.sort_values('sort_order')
+                    
+                    # 8. Dibujar usando el nombre amigable
+                    st.bar_chart(pr_df.set_index('Event Name')['Count'])
+                else:
+                    st.info("No PRs recorded yet.")
+
+def render_solve_statistics(data):
+    df = data["results"]
+    if df.empty:
+        st.info("No solves recorded yet.")
+        return
+
+    stats = get_solve_stats(data["wca_id"], df)
+    events = stats["events"]
+    available = [e for e in event_dict if e in events]
+    if not available:
+        st.info("No solves recorded yet.")
+        return
+
+    sel_name = st.selectbox("Event:", [event_dict[e] for e in available], key="solve_stats_event")
+    event_code = available[[event_dict[e] for e in available].index(sel_name)]
+    ev = events[event_code]
+    summary = ev["summary"]
+
+    # --- Resumen ---
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Solves", summary["solves"])
+    m2.metric("DNF rate", f"{summary['dnf_rate']:.1%}")
+    m3.metric("Best single", fn.format_wca_time(summary["best"], event_code=event_code) if summary["best"] else "-")
+    m4.metric("Mean", format_average(summary["mean"], event_code))
+
+    cols = st.columns(len(solve_stats.ROLLING_SIZES))
+    for col, n in zip(cols, solve_stats.ROLLING_SIZES):
+        col.metric(f"Best ao{n}", format_average(summary[f"best_ao{n}"], event_code),
+                   help=f"Current ao{n}: {format_average(summary[f'current_ao{n}'], event_code)}")
+
+    # --- Medias móviles ---
+    st.subheader("Rolling averages")
+    is_fmc = event_code == "333fm"
+    scale = 1 if is_fmc else 100
+    fig = go.Figure()
+    for n, averages in ev["rolling"].items():
+        if len(averages) == 0:
+            continue
+        y = np.where(np.isfinite(averages), averages / scale, np.nan)
+        fig.add_trace(go.Scatter(x=np.arange(n, n + len(averages)), y=y, mode='lines', name=f"ao{n}"))
+    fig.update_layout(
+        xaxis_title="Solve #",
+        yaxis_title="Moves" if is_fmc else "Time (s)",
+        margin=dict(l=20, r=20, t=20, b=20),
+        height=350
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # --- Sub-X y distribución ---
+    c1, c2 = st.columns([1, 2])
+    with c1:
+        st.subheader("Sub-X")
+        valid = ev["values"][ev["values"] > 0]
+        default_x = float(np.median(valid) / scale) if len(valid) else 10.0
+        x = st.number_input("Threshold (moves)" if is_fmc else "Threshold (s)",
+                            min_value=0.0, value=round(default_x, 0), step=1.0)
+        count = solve_stats.sub_x_counts(ev["values"], [x * scale])[x * scale]
+        st.metric(f"Sub-{x:g}", count, f"{count / max(summary['solves'], 1):.1%} of solves", delta_color="off")
+    with c2:
+        st.subheader("Distribution")
+        counts, edges = solve_stats.histogram(ev["values"], bins=30)
+        if len(counts):
+            centers = (edges[:-1] + edges[1:]) / 2 / scale
+            fig_h = go.Figure(go.Bar(x=centers, y=counts, width=np.diff(edges) / scale, marker_color='#FF4B4B'))
+            fig_h.update_layout(
+                xaxis_title="Moves" if is_fmc else "Time (s)",
+                yaxis_title="Solves",
+                margin=dict(l=20, r=20, t=20, b=20),
+                height=300
+            )
+            st.plotly_chart(fig_h, use_container_width=True)
+
+def render_mbld_fmc_statistics(data):
+    df = data["results"]
+    if df.empty:
+        st.info("No solves recorded yet.")
+        return
+
+    attempts, mbld, fmc = get_mbld_fmc_stats(data["wca_id"], df)
+    if attempts.empty and fmc.empty:
+        st.info("No Multi-Blind or Fewest Moves results yet.")
+        return
+
+    if not attempts.empty:
+        st.subheader(f"🧠 {event_dict['333mbf']}")
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Best", f"{mbld['best_points']} pts" if mbld["best_points"] is not None else "-")
+        m2.metric("Success rate", f"{mbld['success_rate']:.0%}", help=f"{mbld['successes']} of {mbld['attempts']} attempts")
+        m3.metric("Cubes solved", f"{mbld['cube_rate']:.0%}" if mbld["cube_rate"] is not None else "-",
+                  help="Solved / attempted cubes in successful attempts")
+        m4.metric("Points per hour", f"{mbld['points_per_hour']:.1f}" if mbld["points_per_hour"] else "-")
+
+        ok = attempts[~attempts["dnf"]]
+        fig = go.Figure()
+        fig.add_trace(go.Bar(x=np.arange(1, len(attempts) + 1), y=attempts["points"], name="Points",
+                             marker_color=np.where(attempts["dnf"], '#BBBBBB', '#4B4BFF'),
+                             customdata=attempts["Competition"], hovertemplate="%{customdata}: %{y} pts<extra></extra>"))
+        pph = np.where(ok["seconds"] > 0, ok["points"] * 3600 / ok["seconds"].clip(lower=1), np.nan)
+        fig.add_trace(go.Scatter(x=ok.index + 1, y=pph, mode='lines+markers', name="Points per hour", yaxis="y2",
+                                 line=dict(color='#FF4B4B')))
+        fig.update_layout(
+            xaxis_title="Attempt #",
+            yaxis=dict(title="Points"),
+            yaxis2=dict(title="Points per hour", overlaying="y", side="right"),
+            margin=dict(l=20, r=20, t=20, b=20),
+            height=350
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    if not fmc.empty:
+        st.subheader(f"✍️ {event_dict['333fm']}")
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Best mean of 3", f"{fmc['mean'].min():.2f}")
+        m2.metric("Last mean of 3", f"{fmc['mean'].iloc[-1]:.2f}")
+        m3.metric("Trend (last 5)", f"{fmc['trend'].iloc[-1]:.2f}",
+                  delta=f"{fmc['trend'].iloc[-1] - fmc['mean'].mean():.2f} vs overall", delta_color="inverse")
+
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=fmc["CompDate"], y=fmc["mean"], mode='markers', name="Mean of 3",
+                                 marker=dict(color='#FF4B4B')))
+        fig.add_trace(go.Scatter(x=fmc["CompDate"], y=fmc["trend"], mode='lines', name="Trend (last 5)"))
+        fig.add_trace(go.Scatter(x=fmc["CompDate"], y=fmc["pb"], mode='lines', name="PB", line=dict(shape='hv', dash='dot')))
+        fig.update_layout(
+            yaxis_title="Moves",
+            margin=dict(l=20, r=20, t=20, b=20),
+            height=350
+        )
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,258 @@
+"""Pestaña Summary: cabecera del perfil, medallas, récords y rankings."""
+
+import streamlit as st
+import pandas as pd
+import functions as fn
+from views.common import event_dict, render_pr_card
+
+def render_summary_enhanced(data, wca_id):
+    info = data["info"]
+    df = data["results"]
+    
+    # Preparamos variables de cabecera
+    iso_code = info.country_iso2 or 'N/A'
+    flag = fn.get_flag_emoji(iso_code)
+    
+    local_event_dict = event_dict
+
+    # --- 2. CABECERA ---
+    col_profile, col_empty = st.columns([2, 1])
+    with col_profile:
+        st.markdown(f"## {flag} {info.name or wca_id}")
+        st.caption(f"WCA ID: {wca_id}")
+
+    st.divider()
+
+    # --- 3. TARJETAS GENERALES ---
+    col1, col2, col3 = st.columns(3)
+    
+    # Medallas
+    with col1:
+        with st.container(border=True):
+            st.markdown("### 🏆 Medals")
+            mc1, mc2, mc3 = st.columns(3)
+            mc1.metric("🥇 Gold", info.medals.gold)
+            mc2.metric("🥈 Silver", info.medals.silver)
+            mc3.metric("🥉 Bronze", info.medals.bronze)
+
+    # Volumen
+    with col2:
+        with st.container(border=True):
+            st.markdown("### 📊 Volume")
+            vc1, vc2 = st.columns(2)
+            
+            total_solves = info.total_solves
+            if total_solves == 0 and not df.empty: total_solves = len(df)
+            
+            competition_count = info.competition_count or len(df['Competition'].unique())
+            
+            vc1.metric("Comps", competition_count)
+            vc2.metric("Solves", total_solves)
+
+    # Trayectoria
+    with col3:
+        with st.container(border=True):
+            st.markdown("### 📅 Career")
+            years_active = 0
+            date_range_str = "-"
+            fav_event_name = "-"
+            
+            if not df.empty:
+                min_date = df['CompDate'].min()
+                max_date = df['CompDate'].max()
+                years_active = max_date.year - min_date.year + 1
+                date_range_str = f"{min_date.strftime('%b %Y')} - {max_date.strftime('%b %Y')}"
+                
+                fav_event_code = df['Event'].value_counts().idxmax()
+                # Usamos el diccionario local seguro
+                fav_event_name = local_event_dict.get(fav_event_code, fav_event_code)
+
+            cc1, cc2 = st.columns(2)
+            cc1.metric("Years active", years_active)
+            cc2.metric("Most solved event", fav_event_name)
+            st.caption(f"📅 {date_range_str}")
+
+    # --- 4. TARJETAS DE RÉCORDS (NR/CR/WR) ---
+    nr = info.records.national
+    cr = info.records.continental
+    wr = info.records.world
+    
+    if (nr + cr + wr) > 0:
+        st.markdown("### 🎖️ Current Records Held")
+        r1, r2, r3 = st.columns(3)
+        with r1:
+            with st.container(border=True):
+                st.metric("🇺🇳 National Records", nr)
+        with r2:
+            with st.container(border=True):
+                st.metric("🌍 Continental Records", cr)
+        with r3:
+            with st.container(border=True):
+                st.metric("🪐 World Records", wr)
+
+    st.divider()
+
+    
+    # --- LÓGICA DE PRs ACTIVOS (Basada en tu función de cards) ---
+    if not df.empty:
+        active_prs = []
+        # Iteramos por cada evento que tiene el usuario
+        for event_code in df['Event'].unique():
+
+            # if event is 333ft, magic, mmagic, skip
+            if event_code.startswith('333ft') or event_code.startswith('magic') or event_code.startswith('mmagic'):
+                continue
+
+            ev_df = df[df['Event'] == event_code]
+            
+            # Encontramos el PB de Single para este evento (el más rápido y antiguo en caso de empate)
+            s_df = ev_df[ev_df['best_cs'] > 0]
+            if not s_df.empty:
+                best_s = s_df.sort_values(by=['best_cs', 'CompDate']).iloc[0]
+                active_prs.append({
+                    'date': best_s['CompDate'],
+                    'event': event_code,
+                    'type': 'Single',
+                    'time': fn.format_wca_time(best_s['best_cs'], event_code=event_code),
+                    'comp': best_s['CompName']
+                })
+
+            # Encontramos el PB de Average para este evento
+            a_df = ev_df[ev_df['avg_cs'] > 0]
+            if not a_df.empty:
+                best_a = a_df.sort_values(by=['avg_cs', 'CompDate']).iloc[0]
+                active_prs.append({
+                    'date': best_a['CompDate'],
+                    'event': event_code,
+                    'type': 'Average',
+                    'time': fn.format_wca_time(best_a['avg_cs'], event_code=event_code),
+                    'comp': best_a['CompName']
+                })
+
+        if active_prs:
+            # Ordenamos todos los PBs encontrados por fecha
+            active_prs_sorted = sorted(active_prs, key=lambda x: x['date'])
+            oldest = active_prs_sorted[0]
+            newest = active_prs_sorted[-1]
+
+            # --- 3. RENDERIZADO DE TARJETAS ---
+            st.markdown("### ⏳ Record Milestones")
+            c_old, c_new = st.columns(2)
+
+            with c_old:
+                event_label = f"{event_dict.get(oldest['event'], oldest['event'])} ({oldest['type']})"
+                render_pr_card(
+                    "Oldest active PR", 
+                    oldest['time'], 
+                    f"{event_label} \n\n {oldest['comp']}", 
+                    oldest['date'].strftime('%d %b %Y')
+                )
+
+            with c_new:
+                event_label = f"{event_dict.get(newest['event'], newest['event'])} ({newest['type']})"
+                render_pr_card(
+                    "Most recent PR", 
+                    newest['time'], 
+                    f"{event_label} \n\n {newest['comp']}", 
+                    newest['date'].strftime('%d %b %Y')
+                )
+    st.divider()
+
+    # --- 6. RANKINGS (Tabla) ---
+    st.subheader("🌍 Current Global Rankings")
+    
+    WCA_ORDER = [
+        "333", "222", "444", "555", "666", "777", 
+        "333bf", "333fm", "333oh", "clock", "minx", 
+        "pyram", "skewb", "sq1", "444bf", "555bf", "333mbf"
+    ]
+    
+    if not df.empty:
+        user_events = df['Event'].unique().tolist()
+        # Ordenamos según WCA_ORDER
+        sorted_events = [ev for ev in WCA_ORDER if ev in user_events] + \
+                        [ev for ev in user_events if ev not in WCA_ORDER]
+
+        rank_rows = []
+
+        for ev_code in sorted_events:
+            ev_name = local_event_dict.get(ev_code, ev_code)
+            
+            single = info.pr(ev_code, "single")
+            average = info.pr(ev_code, "average")
+            
+            if single or average:
+                rank_rows.append({
+                    "Event": ev_name,
+                    "NR (Single)": single.country_rank if single else None,
+                    "CR (Single)": single.continent_rank if single else None,
+                    "WR (Single)": single.world_rank if single else None,
+                    "NR (Avg)": average.country_rank if average else None,
+                    "CR (Avg)": average.continent_rank if average else None,
+                    "WR (Avg)": average.world_rank if average else None,
+                })
+            
+        if rank_rows:
+            rdf = pd.DataFrame(rank_rows)
+            st.dataframe(
+                rdf.set_index("Event"), 
+                use_container_width=True,
+                column_config={
+                    "NR (Single)": st.column_config.NumberColumn("NR (Single)", format="%d"),
+                    "CR (Single)": st.column_config.NumberColumn("CR (Single)", format="%d"),
+                    "WR (Single)": st.column_config.NumberColumn("WR (Single)", format="%d"),
+                    "NR (Avg)": st.column_config.NumberColumn("NR (Avg)", format="%d"),
+                    "CR (Avg)": st.column_config.NumberColumn("CR (Avg)", format="%d"),
+                    "WR (Avg)": st.column_config.NumberColumn("WR (Avg)", format="%d"),
+                }
+            )
+        else:
+            st.info("No ranking data available.")
+
+        render_rank_explorer(info, sorted_events, local_event_dict)
+
+def render_rank_explorer(info, events, names):
+    """Percentil, objetivo de puesto y rivales cercanos a partir del snapshot de rankings."""
+    import rankings
+
+    ranked_events = [ev for ev in events if info.pr(ev, "single")]
+    if not ranked_events:
+        return
+
+    with st.expander("🎯 Percentiles & targets"):
+        c1, c2, c3 = st.columns([2, 1, 1])
+        ev_name = c1.selectbox("Event:", [names.get(ev, ev) for ev in ranked_events], key="rank_event")
+        ev_code = ranked_events[[names.get(ev, ev) for ev in ranked_events].index(ev_name)]
+        kind = c2.selectbox("Type:", ["Single", "Average"], key="rank_kind").lower()
+
+        my_pr = info.pr(ev_code, kind)
+        if my_pr is None:
+            st.info(f"No {kind} ranking for this event.")
+            return
+        my_best = my_pr.best
+
+        with st.spinner("Loading world ranking snapshot..."):
+            snapshot = rankings.get_snapshot(ev_code, kind)
+        if len(snapshot) == 0:
+            st.warning("Ranking snapshot not available right now.")
+            return
+
+        my_rank = snapshot.rank_of(my_best)
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Your PR", fn.format_wca_time(my_best, event_code=ev_code))
+        m2.metric("World rank (snapshot)", f"{my_rank:,}")
+        m3.metric("Top", f"{snapshot.top_percent(my_best):.2f}%", f"of {len(snapshot):,} cubers", delta_color="off")
+
+        default_target = max(1, my_rank // 2)
+        # Una clave por evento y tipo: al cambiar de evento el objetivo vuelve a su valor por defecto
+        target = c3.number_input("Target rank:", min_value=1, max_value=len(snapshot),
+                                 value=min(default_target, len(snapshot)), step=1,
+                                 key=f"rank_target_{ev_code}_{kind}")
+        needed = snapshot.value_for_rank(target)
+        st.markdown(f"To reach world rank **#{target:,}** you need "
+                    f"**{fn.format_wca_time(needed, event_code=ev_code)}** or better.")
+
+        st.markdown("##### Nearby rivals")
+        rivals = pd.DataFrame(snapshot.rivals(my_best, k=5), columns=["Rank", "WCA ID", "best"])
+        rivals["Result"] = rivals["best"].apply(lambda v: fn.format_wca_time(v, event_code=ev_code))
+        st.dataframe(rivals[["Rank", "WCA ID", "Result"]], hide_index=True, use_container_width=True)
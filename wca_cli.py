@@ -0,0 +1,244 @@
+"""
+CLI de MyCubing: calcula las analíticas de uno o varios perfiles sin la web.
+
+Usa las mismas funciones (y las mismas cachés) que la app de Streamlit, así
+que sirve para precalcular perfiles en jobs batch.
+
+Ejemplos:
+    python wca_cli.py export 2016LOPE37
+    python wca_cli.py export 2016LOPE37 2019WANY36 --format csv --out exports
+    python wca_cli.py export --ids-file ids.txt --workers 8 --neighbours
+    python wca_cli.py export --ids-file ids.txt --processes 8 --solve-stats
+    python wca_cli.py warm --ids-file popular.txt --country ES --rate 2
+    python wca_cli.py snapshot 2016LOPE37 --out snapshots
+    python wca_cli.py snapshot --show snapshots/2016LOPE37.mcsnap
+    python wca_cli.py store
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import batch
+import functions as fn
+
+FORMATS = ("parquet", "csv", "json")
+
+
+def read_ids(args):
+    """Junta los WCA IDs de la línea de comandos y del fichero (uno por línea)."""
+    ids = list(args.wca_ids)
+    if args.ids_file:
+        with open(args.ids_file, encoding="utf-8") as f:
+            ids.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    # Quitamos duplicados manteniendo el orden
+    return list(dict.fromkeys(i.upper() for i in ids))
+
+
+def write_table(df, path, fmt):
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "csv":
+        df.to_csv(path, index=False)
+    else:
+        df.to_json(path, orient="records", date_format="iso", force_ascii=False)
+
+
+def write_tables(wca_id, tables, out_dir, fmt):
+    """Guarda las tablas de un perfil en out_dir/<WCA_ID>/. Devuelve nº de tablas."""
+    profile_dir = os.path.join(out_dir, wca_id)
+    os.makedirs(profile_dir, exist_ok=True)
+    for name, df in tables.items():
+        write_table(df, os.path.join(profile_dir, f"{name}.{fmt}"), fmt)
+    return len(tables)
+
+
+def export_profile(wca_id, out_dir, fmt, neighbours=False, solve_stats=False):
+    """Calcula y guarda las tablas de un perfil en out_dir/<WCA_ID>/. Devuelve nº de tablas."""
+    tables = batch.build_tables(wca_id, neighbours=neighbours, solve_stats=solve_stats)
+    if tables is None:
+        return 0
+    return write_tables(wca_id, tables, out_dir, fmt)
+
+
+def _export_outcomes(args, ids):
+    """Genera (wca_id, nº de tablas, error) de cada perfil, con hilos o con procesos."""
+    if args.processes:
+        # Procesos: el cálculo (no la red) se reparte entre núcleos; ver batch.py
+        for wca_id, tables, error in batch.run_batch(
+            ids, processes=args.processes, neighbours=args.neighbours, solve_stats=args.solve_stats
+        ):
+            if error is not None or tables is None:
+                yield wca_id, 0, error
+            else:
+                yield wca_id, write_tables(wca_id, tables, args.out, args.format), None
+        return
+
+    # Hilos: el trabajo es casi todo I/O y así comparten COMP_CACHE y demás cachés
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(export_profile, wca_id, args.out, args.format, args.neighbours, args.solve_stats): wca_id
+            for wca_id in ids
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], 0, e
+
+
+def cmd_export(args):
+    ids = read_ids(args)
+    if not ids:
+        print("No WCA IDs given.", file=sys.stderr)
+        return 2
+
+    failed = []
+    for wca_id, n_tables, error in _export_outcomes(args, ids):
+        if error is not None:
+            print(f"❌ {wca_id}: {error}", file=sys.stderr)
+            failed.append(wca_id)
+        elif n_tables:
+            print(f"✅ {wca_id}: {n_tables} tables")
+        else:
+            print(f"⚠️ {wca_id}: no results found", file=sys.stderr)
+            failed.append(wca_id)
+
+    if not args.processes:
+        # Con procesos cada uno tiene su propia COMP_CACHE: solo tiene sentido en modo hilos
+        stats = fn.COMP_CACHE.stats()
+        hit_rate = f"{stats['hit_rate']:.0%}" if stats["hit_rate"] is not None else "-"
+        print(f"Competition cache: {stats['entries']} entries, {stats['bytes'] / 1024:.0f} KB, hit rate {hit_rate}")
+    return 1 if failed else 0
+
+
+def cmd_warm(args):
+    import cache_warmer
+
+    ids = read_ids(args)
+    if not ids and not args.country:
+        print("Give WCA IDs and/or --country.", file=sys.stderr)
+        return 2
+
+    def progress(done, total, label):
+        print(f"[{done}/{total}] {label}")
+
+    summary = cache_warmer.warm(
+        wca_ids=ids,
+        countries=args.country,
+        rate=args.rate,
+        workers=args.workers,
+        scrambles=not args.no_scrambles,
+        days_back=args.days_back,
+        days_ahead=args.days_ahead,
+        progress=progress,
+    )
+    for label, error in summary["errors"]:
+        print(f"❌ {label}: {error}", file=sys.stderr)
+    print(f"Done: {summary['fetched']} responses downloaded into the cache "
+          f"({len(summary['errors'])} of {summary['tasks']} tasks failed).")
+    return 1 if summary["errors"] else 0
+
+
+def cmd_snapshot(args):
+    import snapshot
+
+    if args.show:
+        # Solo la cabecera: no hace falta decodificar las tablas
+        import pyarrow as pa
+
+        with pa.memory_map(args.show, "r") as source:
+            header, _ = snapshot.read_header(source)
+        created = time.strftime("%Y-%m-%d %H:%M", time.localtime(header["created_at"]))
+        print(f"{header['wca_id']} (snapshot v{header['version']}, {created})")
+        for name, entry in header["tables"].items():
+            print(f"  {name}: {len(entry['columns'])} columns, {entry['length'] / 1024:.1f} KB")
+        return 0
+
+    ids = read_ids(args)
+    if not ids:
+        print("Give WCA IDs or --show FILE.", file=sys.stderr)
+        return 2
+
+    failed = []
+    for wca_id in ids:
+        profile = fn.load_profile(wca_id)
+        if profile is None:
+            print(f"⚠️ {wca_id}: no results found", file=sys.stderr)
+            failed.append(wca_id)
+            continue
+        path = snapshot.path_for(wca_id, args.out)
+        size = snapshot.save(profile, path)
+        print(f"✅ {wca_id}: {path} ({size / 1024:.0f} KB)")
+    return 1 if failed else 0
+
+
+def cmd_store(args):
+    import comp_store
+
+    if comp_store.pa is None:
+        print("The shared competition store needs pyarrow.", file=sys.stderr)
+        return 2
+    store = comp_store.build_store()
+    # Si no se pudo escribir el fichero, build_store devuelve un almacén en memoria (sin path)
+    if store.path is None or not os.path.exists(store.path):
+        print(f"❌ {len(store)} competitions loaded, but {comp_store.STORE_PATH} could not be written.",
+              file=sys.stderr)
+        return 1
+    size = os.path.getsize(store.path)
+    print(f"✅ {len(store)} competitions in {store.path} ({size / 1024 / 1024:.1f} MB)")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="wca_cli", description="MyCubing headless analytics.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="Compute profile analytics and write them to disk.")
+    export.add_argument("wca_ids", nargs="*", help="WCA IDs to export")
+    export.add_argument("--ids-file", help="File with one WCA ID per line")
+    export.add_argument("--format", choices=FORMATS, default="parquet")
+    export.add_argument("--out", default="exports", help="Output directory (default: exports)")
+    export.add_argument("--workers", type=int, default=4, help="Profiles processed in parallel")
+    export.add_argument("--processes", type=int, nargs="?", const=os.cpu_count(), default=0,
+                        help="Compute profiles in a process pool (default size: one per CPU) instead of threads")
+    export.add_argument("--neighbours", action="store_true",
+                        help="Also compute WCA neighbours (slow: one request per competition)")
+    export.add_argument("--solve-stats", action="store_true",
+                        help="Also write a per-event solve statistics table (rolling aoN, DNF rate...)")
+    export.set_defaults(func=cmd_export)
+
+    warm = sub.add_parser("warm", help="Prefetch profiles and recent competitions into the disk cache.")
+    warm.add_argument("wca_ids", nargs="*", help="WCA IDs to warm")
+    warm.add_argument("--ids-file", help="File with one WCA ID per line")
+    warm.add_argument("--country", action="append", default=[],
+                      help="ISO2 country code; warms its recent/upcoming competitions (repeatable)")
+    warm.add_argument("--days-back", type=int, default=30, help="Past window for --country (days)")
+    warm.add_argument("--days-ahead", type=int, default=30, help="Upcoming window for --country (days)")
+    warm.add_argument("--rate", type=float, default=2.0, help="Max requests per second (default: 2)")
+    warm.add_argument("--workers", type=int, default=4)
+    warm.add_argument("--no-scrambles", action="store_true", help="Skip scrambles")
+    warm.set_defaults(func=cmd_warm)
+
+    snap = sub.add_parser("snapshot", help="Save loaded profiles as snapshot files (see snapshot.py).")
+    snap.add_argument("wca_ids", nargs="*", help="WCA IDs to snapshot")
+    snap.add_argument("--ids-file", help="File with one WCA ID per line")
+    snap.add_argument("--out", help="Output directory (default: $MYCUBING_SNAPSHOT_DIR or snapshots)")
+    snap.add_argument("--show", metavar="FILE", help="Print the contents of a snapshot file instead")
+    snap.set_defaults(func=cmd_snapshot)
+
+    store = sub.add_parser("store", help="Rebuild the shared memory-mapped competition store (see comp_store.py).")
+    store.set_defaults(func=cmd_store)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())